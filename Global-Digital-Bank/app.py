@@ -11,23 +11,81 @@ from src.services.banking_service import (
     InactiveAccountError,
 )
 from src.services.loan_services import LoanService
-from src.utils.file_manager import read_user_transactions, read_admin_actions, USER_TRANSACTIONS_FILE
+from src.services.bank_client import connect
+from src.utils.file_manager import (
+    user_transactions_page,
+    admin_actions_page,
+)
 
 
 st.set_page_config(page_title="Global Digital Bank", page_icon="💳", layout="centered")
 
 
+@st.cache_resource
+def shared_services():
+    # one BankingService / LoanService for every session of this Streamlit process;
+    # both lock internally, so concurrent sessions cannot overwrite each other's balances
+    return BankingService(), LoanService()
+
+
 def ensure_session_state():
     if "bank" not in st.session_state:
-        st.session_state.bank = BankingService()
-    if "loan" not in st.session_state:
-        st.session_state.loan = LoanService()
+        # clients of the bank server when it is running, the process-wide services otherwise
+        try:
+            st.session_state.bank, st.session_state.loan = connect()
+        except OSError:
+            st.session_state.bank, st.session_state.loan = shared_services()
+    if isinstance(st.session_state.bank, BankingService):
+        # pick up what other processes (CLI, another Streamlit) wrote since the last rerun
+        st.session_state.bank.refresh_if_changed()
+        st.session_state.loan.refresh_if_changed()
     if "role" not in st.session_state:
         st.session_state.role = None  # "user" | "admin"
     if "account_number" not in st.session_state:
         st.session_state.account_number = None
 
 
+def paged(key, fetch, page_size=50):
+    """Render one page of a listing with Previous/Next buttons.
+
+    fetch(cursor, page_size) -> (lines, next_cursor); the cursors of the pages
+    visited so far are kept in session state under `key`.
+    """
+    stack = st.session_state.setdefault(f"{key}_cursors", [None])
+    lines, next_cursor = fetch(stack[-1], page_size)
+    if not lines:
+        return False
+    st.code("\n".join(lines))
+    c1, c2, c3 = st.columns([1, 2, 1])
+    with c1:
+        if len(stack) > 1 and st.button("Previous", key=f"{key}_prev"):
+            stack.pop()
+            st.rerun()
+    with c2:
+        st.caption(f"Page {len(stack)}")
+    with c3:
+        if next_cursor is not None and st.button("Next", key=f"{key}_next"):
+            stack.append(next_cursor)
+            st.rerun()
+    return True
+
+
+def reset_pages(key, value):
+    # start a listing from page 1 whenever its filter changes
+    if st.session_state.get(f"{key}_filter") != value:
+        st.session_state[f"{key}_filter"] = value
+        st.session_state[f"{key}_cursors"] = [None]
+
+
+def list_pages(items):
+    # paging over an in-memory list; the cursor is the start offset
+    def fetch(cursor, page_size):
+        start = cursor or 0
+        end = start + page_size
+        return items[start:end], (end if end < len(items) else None)
+    return fetch
+
+
 def login_view():
     st.title("Global Digital Bank")
     st.subheader("Login")
@@ -218,10 +276,9 @@ def user_dashboard():
         with col2:
             st.subheader("Daily Limits")
             try:
-                dep_used = bank._get_today_total(int(acc_no), "DEPOSIT")
-                wit_used = bank._get_today_total(int(acc_no), "WITHDRAW")
-                st.metric("Deposit remaining today", f"{bank.DAILY_DEPOSIT_LIMIT - dep_used:.2f}")
-                st.metric("Withdraw remaining today", f"{bank.DAILY_WITHDRAW_LIMIT - wit_used:.2f}")
+                remaining = bank.remaining_daily_limits(int(acc_no))
+                st.metric("Deposit remaining today", f"{remaining['deposit']:.2f}")
+                st.metric("Withdraw remaining today", f"{remaining['withdraw']:.2f}")
             except Exception:
                 st.error("Could not compute daily limits.")
 
@@ -230,34 +287,11 @@ def user_dashboard():
         # Build per-day totals for deposits and withdrawals separately
         try:
             now = datetime.now()
-            month_prefix = now.strftime("%Y-%m-")  # e.g., 2025-09-
             days_in_month = calendar.monthrange(now.year, now.month)[1]
-            dep_by_day = {day: 0.0 for day in range(1, days_in_month + 1)}
-            wit_by_day = {day: 0.0 for day in range(1, days_in_month + 1)}
-            try:
-                with open(USER_TRANSACTIONS_FILE, "r") as f:
-                    for line in f:
-                        if not line.startswith(month_prefix):
-                            continue
-                        parts = [p.strip() for p in line.split("|")]
-                        if len(parts) < 4:
-                            continue
-                        try:
-                            log_date = parts[0]  # YYYY-MM-DD ...
-                            log_day = int(log_date.split(" ")[0].split("-")[-1])
-                            log_acc = int(parts[1])
-                            op = parts[2]
-                            amt = float(parts[3]) if parts[3] != "None" else 0.0
-                        except Exception:
-                            continue
-                        if str(log_acc) != str(acc_no):
-                            continue
-                        if op in ("DEPOSIT", "TRANSFER_IN", "LOAN_CREDIT"):
-                            dep_by_day[log_day] += amt
-                        elif op in ("WITHDRAW", "WITHDRAW_FULL", "TRANSFER_OUT"):
-                            wit_by_day[log_day] += amt
-            except FileNotFoundError:
-                pass
+            # served from the materialized daily rollups, not the transaction log
+            rollup = bank.rollups.month(acc_no, now.year, now.month)
+            dep_by_day = {day: totals["inflow"] for day, totals in rollup.items()}
+            wit_by_day = {day: totals["outflow"] for day, totals in rollup.items()}
 
             import pandas as pd
             import altair as alt
@@ -286,14 +320,8 @@ def user_dashboard():
         new_name = st.text_input("New Name")
         if st.button("Rename"):
             try:
-                # account_rename prompts in CLI; here we directly set
-                acc = bank.get_account(acc_no)
-                if not new_name.strip():
-                    st.error("Name cannot be empty")
-                else:
-                    acc.name = new_name.strip()
-                    bank.save_to_disk()
-                    st.success(f"Renamed to {new_name}")
+                ok, msg = bank.account_rename(acc_no, new_name)
+                (st.success if ok else st.error)(msg)
             except Exception as e:
                 st.error(str(e))
 
@@ -375,39 +403,58 @@ def admin_dashboard():
         st.text(st.session_state.bank.save_to_disk() or "")
         st.write("Listing active accounts:")
         q = st.text_input("Search by name or account number")
-        for acc in bank.accounts.values():
-            if acc.status != "Active":
-                continue
-            row = f"{acc.account_number} | {acc.name} | Balance: {acc.balance}"
-            if q and q.strip():
-                if q.strip().lower() not in row.lower():
-                    continue
-            st.code(row)
+        q = q.strip() if q else ""
+        reset_pages("active", q)
+        if not q:
+            fetch = lambda c, n: bank.accounts_page(c, n, status="Active")
+        else:
+            if q.isdigit():
+                acc = bank.get_account(q)
+                matches = [acc] if acc and acc.status == "Active" else []
+            else:
+                # exact, prefix and typo-tolerant matches from the name index
+                matches = bank.find_accounts_by_name(q, status="Active")
+            fetch = list_pages(matches)
+
+        def active_rows(c, n):
+            accounts, next_cursor = fetch(c, n)
+            return [f"{acc.account_number} | {acc.name} | Balance: {acc.balance}" for acc in accounts], next_cursor
+
+        if not paged("active", active_rows):
+            st.info("No active accounts.")
 
     elif choice == "Closed Accounts":
-        for acc in bank.accounts.values():
-            if acc.status != "Active":
-                st.code(f"{acc.account_number} | {acc.name} | Balance: {acc.balance} | {acc.status}")
+        def closed_rows(c, n):
+            accounts, next_cursor = bank.accounts_page(c, n, exclude_status="Active")
+            return [f"{acc.account_number} | {acc.name} | Balance: {acc.balance} | {acc.status}" for acc in accounts], next_cursor
+
+        if not paged("closed", closed_rows):
+            st.info("No closed accounts.")
 
     elif choice == "Logs":
         q = st.text_input("Filter by account number (optional)")
-        logs = read_user_transactions() or ""
-        actions = read_admin_actions() or ""
+        qnum = None
         if q.strip():
             try:
-                qnum = str(int(q.strip()))
+                qnum = int(q.strip())
             except Exception:
                 qnum = None
-            if qnum:
-                logs = "\n".join([line for line in logs.splitlines() if f"| {qnum} |" in line])
-        if logs.strip():
-            st.subheader("User Transactions")
-            st.code(logs)
-        if actions.strip():
-            st.subheader("Admin Actions")
-            st.code(actions)
-        if not (logs.strip() or actions.strip()):
-            st.info("No logs found.")
+        reset_pages("user_logs", qnum)
+        # newest first, one page at a time
+        st.subheader("User Transactions")
+        if qnum is not None:
+            def account_logs(c, n):
+                page = c or 0
+                lines = bank.transaction_history_page(qnum, page, n)
+                return lines, (page + 1 if len(lines) == n else None)
+            found = paged("user_logs", account_logs)
+        else:
+            found = paged("user_logs", user_transactions_page)
+        if not found:
+            st.info("No user transactions.")
+        st.subheader("Admin Actions")
+        if not paged("admin_logs", admin_actions_page):
+            st.info("No admin actions.")
 
     elif choice == "Search by Account":
         acc_no = st.text_input("Account Number")
@@ -430,11 +477,11 @@ def admin_dashboard():
                 st.error(str(e))
 
     elif choice == "Top Age Extremes (Top 3)":
-        if not bank.accounts:
+        if not bank.count_accounts():
             st.info("No accounts.")
         else:
-            youngest = sorted([a for a in bank.accounts.values()], key=lambda x: x.age)[:3]
-            oldest = sorted([a for a in bank.accounts.values()], key=lambda x: x.age, reverse=True)[:3]
+            youngest = bank.youngest_account_holders(3)
+            oldest = bank.oldest_account_holders(3)
             col1, col2 = st.columns(2)
             with col1:
                 st.subheader("Top 3 Youngest")
@@ -463,11 +510,27 @@ def admin_dashboard():
         with col1:
             st.metric("Average Balance", f"{bank.average_balance():.2f}")
         with col2:
-            cnt = sum(1 for a in bank.accounts.values() if a.status == "Active")
+            cnt = bank.count_accounts(status="Active")
             st.metric("Active Accounts", f"{cnt}")
         with col3:
             active = loan.get_active_loans_list()
             st.metric("Active Loans", f"{len(active)}")
+        st.subheader("By Account Type")
+        only_active = st.checkbox("Active accounts only")
+        # no min / max on this page: lazy loading answers it from running totals, without a scan
+        by_type = bank.account_summary(status="Active" if only_active else None, by_type=True, extremes=False)
+        st.table(
+            [
+                {
+                    "Type": t,
+                    "Accounts": s["count"],
+                    "Total Balance": s["total_balance"],
+                    "Average Balance": s["average_balance"],
+                    "Average Age": s["average_age"],
+                }
+                for t, s in by_type.items()
+            ]
+        )
         if active:
             st.subheader("Active Loans (Acc | Name)")
             for acc_no, name in active:
@@ -0,0 +1,77 @@
+# Memory used by N accounts: the old dict of Account objects vs AccountTable.
+#
+#   python -m benchmarks.account_memory            (from the project root)
+#   python -m benchmarks.account_memory 1000000
+import random
+import sys
+import tracemalloc
+
+from src.models.account import Account
+from src.models.account_table import AccountTable
+
+NAMES = ["Harsha", "Ananya", "Rahul", "Priya", "Vikram", "Sneha", "Arjun", "Kavya", "Rohan", "Meera"]
+
+
+class DictAccount:
+    # the previous Account layout: one object with its own __dict__ per account
+    def __init__(self, account_number, name, age, account_type, balance, status, timestamp, pin):
+        self.account_number = account_number
+        self.name = name
+        self.age = age
+        self.account_type = account_type
+        self.balance = balance
+        self.status = status
+        self.timestamp = timestamp
+        self.pin = pin
+
+
+def rows(n):
+    rnd = random.Random(42)
+    for i in range(n):
+        yield Account.normalize(
+            1001 + i,
+            rnd.choice(NAMES),
+            rnd.randint(18, 90),
+            rnd.choice(["Savings", "Current"]),
+            round(rnd.uniform(500, 500000), 2),
+            "Active" if rnd.random() < 0.9 else "Inactive",
+            f"2025-09-{rnd.randint(1, 28):02d} 10:{rnd.randint(0, 59):02d}:00",
+            f"{rnd.randint(0, 9999):04d}",
+        )
+
+
+def build_dict(n):
+    accounts = {}
+    for row in rows(n):
+        accounts[row[0]] = DictAccount(*row)
+    return accounts
+
+
+def build_table(n):
+    table = AccountTable()
+    for row in rows(n):
+        table.append_row(*row)
+    return table
+
+
+def measure(build, n):
+    tracemalloc.start()
+    data = build(n)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del data
+    return current
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    before = measure(build_dict, n)
+    after = measure(build_table, n)
+    print(f"{n} accounts")
+    print(f"  dict of Account objects: {before / 1e6:8.1f} MB  ({before / n:6.0f} B/account)")
+    print(f"  AccountTable:            {after / 1e6:8.1f} MB  ({after / n:6.0f} B/account)")
+    print(f"  saving:                  {(1 - after / before) * 100:8.1f} %")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+# Many threads hammering one shared BankingService: checks for lost updates
+# and reports throughput per thread count. Runs against a scratch data
+# directory, so real accounts and logs are left alone.
+#
+#   python -m benchmarks.concurrency_stress                 (from the project root)
+#   python -m benchmarks.concurrency_stress 500 5000 1 2 4 8 16
+#       accounts, operations per thread, thread counts
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+import src.utils.file_manager as file_manager
+import src.utils.rollups as rollups
+from src.services.banking_service import BankingService
+from src.utils.file_manager import flush_logs
+from src.utils.flush_policy import FlushPolicy
+
+START_BALANCE = 100_000.0
+
+
+def use_data_dir(data_dir):
+    # point every data file at data_dir (the paths are module constants)
+    for name, file in (
+        ("ACCOUNT_FILE", "accounts.csv"),
+        ("USER_TRANSACTIONS_FILE", "user_transactions.log"),
+        ("ADMIN_ACTIONS_FILE", "admin_actions.log"),
+        ("TRANSACTIONS_FILE", "transactions.log"),
+    ):
+        setattr(file_manager, name, os.path.join(data_dir, file))
+    file_manager.load_accounts.__defaults__ = (file_manager.ACCOUNT_FILE,)
+    file_manager.save_accounts.__defaults__ = (file_manager.ACCOUNT_FILE, False)
+    file_manager._segmented_logs.clear()
+    rollups.DailyRollups.__init__.__defaults__ = (os.path.join(data_dir, "rollups.db"),)
+
+
+def worker(bank, accounts, ops, seed, net, counts):
+    # net: this thread's view of money moved in / out of each account by successful operations
+    rnd = random.Random(seed)
+    for _ in range(ops):
+        amount = float(rnd.randint(1, 50))
+        kind = rnd.random()
+        if kind < 0.4:
+            acc_no = rnd.choice(accounts)
+            ok, _ = bank.deposit(acc_no, amount)
+            if ok:
+                net[acc_no] = net.get(acc_no, 0.0) + amount
+        elif kind < 0.8:
+            acc_no = rnd.choice(accounts)
+            ok, _ = bank.withdraw(acc_no, amount)
+            if ok:
+                net[acc_no] = net.get(acc_no, 0.0) - amount
+        else:
+            src, dst = rnd.sample(accounts, 2)
+            ok, _ = bank.transfer_funds(src, dst, amount)
+            if ok:
+                net[src] = net.get(src, 0.0) - amount
+                net[dst] = net.get(dst, 0.0) + amount
+        counts["ok" if ok else "rejected"] += 1
+
+
+def creator(bank, n, created):
+    for i in range(n):
+        acc, _ = bank.create_account(f"Holder {i}", 30, "Savings", START_BALANCE)
+        created.append(acc.account_number)
+
+
+def run(n_accounts, ops, threads):
+    data_dir = tempfile.mkdtemp(prefix="gdb-stress-")
+    try:
+        use_data_dir(data_dir)
+        bank = BankingService(flush_policy=FlushPolicy(FlushPolicy.SHUTDOWN))
+        # the account-number allocator under contention
+        created = []
+        makers = [threading.Thread(target=creator, args=(bank, n_accounts // threads + 1, created)) for _ in range(threads)]
+        for t in makers:
+            t.start()
+        for t in makers:
+            t.join()
+        duplicates = len(created) - len(set(created))
+        accounts = sorted(created)
+
+        nets = [{} for _ in range(threads)]
+        counts = [{"ok": 0, "rejected": 0} for _ in range(threads)]
+        workers = [
+            threading.Thread(target=worker, args=(bank, accounts, ops, seed, nets[seed], counts[seed]))
+            for seed in range(threads)
+        ]
+        started = time.perf_counter()
+        for t in workers:
+            t.start()
+        for t in workers:
+            t.join()
+        elapsed = time.perf_counter() - started
+        flush_logs()
+
+        lost = 0
+        for acc_no in accounts:
+            expected = START_BALANCE + sum(net.get(acc_no, 0.0) for net in nets)
+            if abs(bank.get_account(acc_no).balance - expected) > 1e-6:
+                lost += 1
+        bank.close()
+        # what was persisted matches memory too
+        reloaded = BankingService(flush_policy=FlushPolicy(FlushPolicy.SHUTDOWN))
+        mismatched = sum(
+            1 for acc_no in accounts if abs(reloaded.get_account(acc_no).balance - bank.get_account(acc_no).balance) > 1e-6
+        )
+        reloaded.close()
+        done = sum(c["ok"] + c["rejected"] for c in counts)
+        return {
+            "threads": threads,
+            "ops_per_s": done / elapsed,
+            "rejected": sum(c["rejected"] for c in counts),
+            "duplicate_numbers": duplicates,
+            "lost_updates": lost,
+            "persist_mismatches": mismatched,
+        }
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+def main():
+    args = [int(a) for a in sys.argv[1:]]
+    n_accounts = args[0] if len(args) > 0 else 200
+    ops = args[1] if len(args) > 1 else 2000
+    thread_counts = args[2:] or [1, 2, 4, 8]
+    print(f"{n_accounts} accounts, {ops} operations per thread")
+    failed = False
+    for threads in thread_counts:
+        r = run(n_accounts, ops, threads)
+        print(
+            f"  {r['threads']:3d} threads: {r['ops_per_s']:9.0f} ops/s  rejected {r['rejected']:6d}  "
+            f"duplicate numbers {r['duplicate_numbers']}  lost updates {r['lost_updates']}  "
+            f"persist mismatches {r['persist_mismatches']}"
+        )
+        failed = failed or r["duplicate_numbers"] or r["lost_updates"] or r["persist_mismatches"]
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
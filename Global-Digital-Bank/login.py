@@ -1,13 +1,14 @@
 import main as user_main
 from src.services.admin_services import AdminService
 from src.services.banking_service import BankingService, AccountNotFoundError
-from src.utils.file_manager import read_user_transactions, read_admin_actions
 from src.services.loan_services import LoanService
+from src.services.bank_client import open_services, open_admin
+from src.services import rpc
 
 
 def user_login():
     """Handle user login with account number and PIN verification"""
-    bank = BankingService()
+    bank, loan_service = open_services()
     
     print("\n---- User Login ----")
     print("1. Login")
@@ -17,7 +18,7 @@ def user_login():
         account_number = input("Enter your account number: ")
     elif choice == '2':
         import new_account
-        new_account.user_menu()
+        new_account.user_menu(bank, loan_service)
         return
     else:
         print("Invalid choice. Try again.")
@@ -29,7 +30,7 @@ def user_login():
         print(f"Account {account_number} not found.")
         print("Redirecting to new account creation...")
         import new_account
-        new_account.user_menu()
+        new_account.user_menu(bank, loan_service)
         return
     
     # Account exists, verify PIN
@@ -37,13 +38,30 @@ def user_login():
     try:
         if bank.verify_pin(account_number, pin):
             print("Login successful! Welcome to Global Digital Bank.")
-            user_main.user_menu(account_number)
+            user_main.user_menu(account_number, bank, loan_service)
         else:
             print("Invalid PIN. Access denied.")
     except AccountNotFoundError as e:
         print(str(e))
 
 
+def page_through(fetch, empty_message, page_size=20):
+    # print a listing one page at a time; fetch(cursor, page_size) -> (lines, next_cursor)
+    cursor = None
+    shown = 0
+    while True:
+        lines, cursor = fetch(cursor, page_size)
+        for line in lines:
+            print(line)
+        shown += len(lines)
+        if cursor is None:
+            break
+        if input("-- Enter for next page, q to stop -- ").strip().lower() == "q":
+            break
+    if not shown:
+        print(empty_message)
+
+
 def start():
     print("---- Welcome to Global Digital Bank ----")
     print("\nLogin as:")
@@ -59,12 +77,12 @@ def start():
         user_login()
     elif choice == 2:
         key = input("Enter security key: ")
-        if key != "admin123":
+        if key != rpc.ADMIN_KEY:
             print("Access denied. Wrong key.")
             return
-        bank = BankingService()
-        admin = AdminService(bank)
-        loan_service = LoanService()
+        # clients of the bank server when it is running, in-process services otherwise
+        bank, loan_service = open_services()
+        admin = open_admin(bank, key)
         while True:
             print("\n---- Admin Features ----")
             print("1. List All Active Accounts")
@@ -84,18 +102,15 @@ def start():
             admin_choice = input("Enter your choice: ")
 
             if admin_choice == '1':
-                print(admin.list_active_accounts())
+                page_through(lambda c, n: admin.accounts_page(c, n, status="Active"), "No active accounts.")
             elif admin_choice == '2':
-                print(admin.list_closed_accounts())
+                page_through(lambda c, n: admin.accounts_page(c, n, exclude_status="Active"), "No closed accounts.")
             elif admin_choice == '3':
-                logs = read_user_transactions()
-                actions = read_admin_actions()
-                out = []
-                if logs:
-                    out.append("-- User Transactions --\n" + logs.strip())
-                if actions:
-                    out.append("-- Admin Actions --\n" + actions.strip())
-                print("\n\n".join(out) if out else "No logs found.")
+                # newest first, one page at a time
+                print("-- User Transactions --")
+                page_through(lambda c, n: admin.logs_page("user", c, n), "No user transactions.")
+                print("\n-- Admin Actions --")
+                page_through(lambda c, n: admin.logs_page("admin", c, n), "No admin actions.")
             elif admin_choice == '4':
                 acc_no = input("Enter account number: ")
                 try:
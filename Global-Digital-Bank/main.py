@@ -4,9 +4,12 @@ import time
 from src.services.banking_service import BankingService,AgeRestrictionError,AccountNotFoundError,InsufficientFundsError,InactiveAccountError
 from src.utils.file_manager import read_user_transactions
 from src.services.loan_services import LoanService
-def user_menu(account_number=None):
-    bank=BankingService()
-    loan_service = LoanService()
+from src.services.bank_client import open_services
+def user_menu(account_number=None, bank=None, loan_service=None):
+    # login.py / new_account.py hand over the services they already opened;
+    # otherwise: clients of the bank server when it is running, in-process services if not
+    if bank is None:
+        bank, loan_service = open_services()
     print("Welcome to Global Digital Bank")
     
     # If no account number provided, ask for it (for backward compatibility)
@@ -114,7 +117,9 @@ def user_menu(account_number=None):
             time.sleep(3)
         elif choice == '5':
             try:
-                ok, msg = bank.account_rename(account_number)
+                new_name = input("Enter new name: ")
+                ok, msg = bank.account_rename(account_number, new_name)
+                print(msg)
             except Exception as e:
                 print(f"Error: {str(e)}")
             print("Loading...")
@@ -169,10 +174,9 @@ def user_menu(account_number=None):
             time.sleep(3)
         elif choice == '10':
             try:
-                dep_used = bank._get_today_total(int(account_number), "DEPOSIT")
-                wit_used = bank._get_today_total(int(account_number), "WITHDRAW")
-                print(f"Deposit remaining today: {bank.DAILY_DEPOSIT_LIMIT - dep_used}")
-                print(f"Withdraw remaining today: {bank.DAILY_WITHDRAW_LIMIT - wit_used}")
+                remaining = bank.remaining_daily_limits(int(account_number))
+                print(f"Deposit remaining today: {remaining['deposit']}")
+                print(f"Withdraw remaining today: {remaining['withdraw']}")
             except Exception:
                 print("Could not compute daily limits.")
             print("Loading...")
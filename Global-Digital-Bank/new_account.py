@@ -2,10 +2,12 @@ import sys
 import time
 from src.services.banking_service import BankingService,AgeRestrictionError,AccountNotFoundError,InsufficientFundsError,InactiveAccountError
 from src.utils.file_manager import read_user_transactions
+from src.services.bank_client import open_services
 
-def user_menu():
+def user_menu(bank=None, loan_service=None):
     """Create a new account with PIN setup"""
-    bank = BankingService()
+    if bank is None:
+        bank, loan_service = open_services()
     
     try:
         print("\n---- Create New Account ----")
@@ -34,7 +36,7 @@ def user_menu():
             
             # Redirect to main menu
             import main
-            main.user_menu(acc.account_number)
+            main.user_menu(acc.account_number, bank, loan_service)
         else:
             print(f"Failed to create account: {msg}")
             
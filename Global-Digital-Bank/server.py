@@ -0,0 +1,12 @@
+# Runs the bank server: one process owns the accounts and loans, and main.py,
+# login.py and app.py connect to it instead of loading the data themselves.
+#
+#   python server.py
+#   python server.py 127.0.0.1:8765        (TCP instead of the default Unix socket)
+import sys
+
+from src.services import rpc
+from src.services.bank_server import serve
+
+if __name__ == "__main__":
+    serve(sys.argv[1] if len(sys.argv) > 1 else rpc.DEFAULT_ADDRESS)
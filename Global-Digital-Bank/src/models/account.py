@@ -1,6 +1,14 @@
+from src.models.account_table import AccountTable
+
+
 class Account:
     MIN_BALANCE = {"Savings": 500, "Current": 1000}
     MAX_SINGLE_DEPOSIT = 100000.0
+    # fields written to storage; changing any of them marks the account dirty
+    PERSISTED_FIELDS = ("name", "age", "account_type", "balance", "status", "timestamp", "pin")
+    # an Account is a view over one row of an AccountTable; a new Account
+    # gets a one-row table of its own until it is stored in the bank's table
+    __slots__ = ("_table", "_row")
 
     def __init__(self, 
                  account_number, 
@@ -11,19 +19,93 @@ class Account:
                  status = "Active",
                  timestamp=None,pin=None):
         
-        self.account_number = int(account_number)
-        self.name = name.strip()
-        self.age = int(age)
-        self.account_type = account_type.title()
-        if self.account_type not in Account.MIN_BALANCE:
-            raise ValueError(f"Invalid account type: {self.account_type}")
-        self.balance = float(balance)
-        self.status = status
-        self.timestamp = timestamp if timestamp else None
-         # account creation time
-         # can be used for interest calculation later
-            # or account age verification
-        self.pin = pin
+        self._table = AccountTable()
+        self._row = self._table.append_row(
+            *Account.normalize(account_number, name, age, account_type, balance, status, timestamp, pin)
+        )
+
+    @staticmethod
+    def normalize(account_number, name, age, account_type, balance=0.0, status="Active", timestamp=None, pin=None):
+        """Validated field values in AccountTable.FIELDS order."""
+        account_type = account_type.title()
+        if account_type not in Account.MIN_BALANCE:
+            raise ValueError(f"Invalid account type: {account_type}")
+        # timestamp: account creation time
+        # can be used for interest calculation later
+        # or account age verification
+        return (
+            int(account_number),
+            name.strip(),
+            int(age),
+            account_type,
+            float(balance),
+            status,
+            timestamp if timestamp else None,
+            pin,
+        )
+
+    # -------- Column-backed fields --------
+    @property
+    def account_number(self):
+        return self._table.account_number[self._row]
+
+    @property
+    def name(self):
+        return self._table.name[self._row]
+
+    @name.setter
+    def name(self, value):
+        self._table.set_value(self._row, "name", value)
+
+    @property
+    def age(self):
+        return self._table.age[self._row]
+
+    @age.setter
+    def age(self, value):
+        self._table.set_value(self._row, "age", int(value))
+
+    @property
+    def account_type(self):
+        table = self._table
+        return table.type_values[table.type_code[self._row]]
+
+    @account_type.setter
+    def account_type(self, value):
+        self._table.set_value(self._row, "account_type", value)
+
+    @property
+    def balance(self):
+        return self._table.balance[self._row]
+
+    @balance.setter
+    def balance(self, value):
+        self._table.set_value(self._row, "balance", float(value))
+
+    @property
+    def status(self):
+        table = self._table
+        return table.status_values[table.status_code[self._row]]
+
+    @status.setter
+    def status(self, value):
+        self._table.set_value(self._row, "status", value)
+
+    @property
+    def timestamp(self):
+        return self._table.timestamp[self._row]
+
+    @timestamp.setter
+    def timestamp(self, value):
+        self._table.set_value(self._row, "timestamp", value)
+
+    @property
+    def pin(self):
+        return self._table.pin[self._row]
+
+    @pin.setter
+    def pin(self, value):
+        self._table.set_value(self._row, "pin", value)
 
     def deposit(self, amount):
         try:
@@ -77,4 +159,7 @@ class Account:
         }
     
     def __str__(self):
-        return f"[{self.account_number}] {self.name} ({self.account_type}) - Balance: {self.balance} - {self.status}"
\ No newline at end of file
+        return f"[{self.account_number}] {self.name} ({self.account_type}) - Balance: {self.balance} - {self.status}"
+
+
+AccountTable.view_class = Account
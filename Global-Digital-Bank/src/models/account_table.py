@@ -0,0 +1,299 @@
+import sys
+import threading
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional
+
+
+class AccountTable:
+    """Columnar, array-backed storage for accounts.
+
+    - Numbers live in typed arrays (account_number, age, balance) and
+      status / account type as one-byte codes, so an account costs a few
+      dozen bytes instead of a full Python object with its own __dict__.
+    - Names are interned, so repeated names are stored once.
+    - The table behaves like the old `Dict[int, Account]`: get(), [],
+      `in`, len(), keys(), values(), items(), pop(), clear(). Values are
+      lightweight Account views over one row; assigning to a view writes
+      straight into the columns.
+    - Assigning `table[no] = account` copies a stand-alone Account into a
+      row and re-points that Account at the row, so the caller's reference
+      stays live.
+    - Writes are reported to `tracker` (a set of dirty account numbers)
+      when one is attached, and to listeners (secondary indexes), which get
+      on_add(row), on_change(row, field, old_value) and on_remove(row).
+    - Writes and their listener callbacks run under `lock`; readers of the
+      secondary indexes or of numpy views over the columns hold it too.
+    """
+
+    FIELDS = ("account_number", "name", "age", "account_type", "balance", "status", "timestamp", "pin")
+    # the Account class used for row views; registered by src.models.account
+    view_class = None
+
+    def __init__(self) -> None:
+        self.account_number = array("q")
+        self.age = array("i")
+        self.balance = array("d")
+        self.status_code = array("b")
+        self.type_code = array("b")
+        # 0 once a row has been deleted; rows are never reused so views stay valid
+        self.alive = array("b")
+        self.name: List[str] = []
+        self.timestamp: List[Optional[str]] = []
+        self.pin: List[Optional[str]] = []
+        self.status_values: List[str] = ["Active", "Inactive"]
+        self.type_values: List[str] = ["Savings", "Current"]
+        self._status_codes = {v: i for i, v in enumerate(self.status_values)}
+        self._type_codes = {v: i for i, v in enumerate(self.type_values)}
+        self._index: Dict[int, int] = {}
+        self.tracker = None
+        self.listeners: List = []
+        self.lock = threading.RLock()
+
+    # tables travel back from bulk-import workers; the lock does not pickle
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        del state["lock"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self.lock = threading.RLock()
+
+    # -------- Codes --------
+    def _code(self, value, values: List[str], codes: Dict[str, int]) -> int:
+        code = codes.get(value)
+        if code is None:
+            code = len(values)
+            values.append(value)
+            codes[value] = code
+        return code
+
+    def status_code_of(self, status: str) -> int:
+        return self._code(status, self.status_values, self._status_codes)
+
+    def type_code_of(self, account_type: str) -> int:
+        return self._code(account_type, self.type_values, self._type_codes)
+
+    # -------- Rows --------
+    def append_row(self, account_number, name, age, account_type, balance, status, timestamp, pin) -> int:
+        """Add an already validated row (see Account.normalize) and return its index."""
+        with self.lock:
+            row = len(self.account_number)
+            old = self._index.pop(account_number, None)
+            if old is not None:
+                self._kill(old)
+            self.account_number.append(account_number)
+            self.name.append(sys.intern(name))
+            self.age.append(age)
+            self.type_code.append(self.type_code_of(account_type))
+            self.balance.append(balance)
+            self.status_code.append(self.status_code_of(status))
+            self.timestamp.append(timestamp)
+            self.pin.append(pin)
+            self.alive.append(1)
+            self._index[account_number] = row
+            if self.tracker is not None:
+                self.tracker.add(account_number)
+            for listener in self.listeners:
+                listener.on_add(row)
+            return row
+
+    def _kill(self, row: int) -> None:
+        for listener in self.listeners:
+            listener.on_remove(row)
+        self.alive[row] = 0
+
+    def value(self, row: int, field: str):
+        """Decoded value of one field of a row."""
+        if field == "status":
+            return self.status_values[self.status_code[row]]
+        if field == "account_type":
+            return self.type_values[self.type_code[row]]
+        return getattr(self, field)[row]
+
+    def add_listener(self, listener) -> None:
+        self.listeners.append(listener)
+
+    def row_of(self, account_number) -> Optional[int]:
+        return self._index.get(account_number)
+
+    def view(self, row: int):
+        acc = object.__new__(self.view_class)
+        acc._table = self
+        acc._row = row
+        return acc
+
+    def set_value(self, row: int, field: str, value) -> None:
+        with self.lock:
+            old = self.value(row, field) if self.listeners else None
+            if field == "balance":
+                self.balance[row] = value
+            elif field == "status":
+                self.status_code[row] = self.status_code_of(value)
+            elif field == "name":
+                self.name[row] = sys.intern(value)
+            elif field == "account_type":
+                self.type_code[row] = self.type_code_of(value)
+            elif field == "age":
+                self.age[row] = value
+            elif field == "timestamp":
+                self.timestamp[row] = value
+            elif field == "pin":
+                self.pin[row] = value
+            else:
+                raise AttributeError(f"Account field {field} is read-only")
+            if self.tracker is not None:
+                self.tracker.add(self.account_number[row])
+            if self.listeners and self.alive[row]:
+                for listener in self.listeners:
+                    listener.on_change(row, field, old)
+
+    def adopt(self, acc) -> None:
+        """Copy a (usually stand-alone) Account into this table and re-point it here."""
+        src, r = acc._table, acc._row
+        row = self.append_row(
+            src.account_number[r],
+            src.name[r],
+            src.age[r],
+            src.type_values[src.type_code[r]],
+            src.balance[r],
+            src.status_values[src.status_code[r]],
+            src.timestamp[r],
+            src.pin[r],
+        )
+        acc._table = self
+        acc._row = row
+
+    def extend(self, other: "AccountTable") -> List[int]:
+        """Append every account of another table, column by column.
+
+        Account numbers already present are replaced; they are returned.
+        """
+        with self.lock:
+            return self._extend(other)
+
+    def _extend(self, other: "AccountTable") -> List[int]:
+        replaced = [no for no in other._index if no in self._index]
+        for no in replaced:
+            self._kill(self._index.pop(no))
+        dense = len(other._index) == len(other.account_number)
+        same_codes = (
+            self.status_values[:len(other.status_values)] == other.status_values
+            and self.type_values[:len(other.type_values)] == other.type_values
+        )
+        if not dense or not same_codes or self.listeners or self.tracker is not None:
+            for row in other._index.values():
+                self.adopt(other.view(row))
+            return replaced
+        base = len(self.account_number)
+        self.account_number.extend(other.account_number)
+        self.age.extend(other.age)
+        self.balance.extend(other.balance)
+        self.status_code.extend(other.status_code)
+        self.type_code.extend(other.type_code)
+        self.alive.extend(other.alive)
+        self.name.extend(sys.intern(n) for n in other.name)
+        self.timestamp.extend(other.timestamp)
+        self.pin.extend(other.pin)
+        self._index.update((no, base + row) for no, row in other._index.items())
+        return replaced
+
+    # -------- Snapshots --------
+    def columns(self) -> Dict[str, tuple]:
+        """Live rows column by column, as {name: (array typecode or "s", values)}."""
+        with self.lock:
+            if len(self._index) == len(self.account_number):
+                # no deleted rows: plain copies of the columns
+                numbers = lambda col: col[:]
+                objects = lambda col: list(col)
+            else:
+                rows = sorted(self._index.values())
+                numbers = lambda col: array(col.typecode, [col[r] for r in rows])
+                objects = lambda col: [col[r] for r in rows]
+            return {
+                "account_number": ("q", numbers(self.account_number)),
+                "name": ("s", objects(self.name)),
+                "age": ("i", numbers(self.age)),
+                "type_code": ("b", numbers(self.type_code)),
+                "balance": ("d", numbers(self.balance)),
+                "status_code": ("b", numbers(self.status_code)),
+                "timestamp": ("s", objects(self.timestamp)),
+                "pin": ("s", objects(self.pin)),
+            }
+
+    @classmethod
+    def from_columns(cls, columns: Dict[str, object], status_values: List[str], type_values: List[str]) -> "AccountTable":
+        """Table over the arrays of columns(), taken as they are (no per-row parsing)."""
+        table = cls()
+        n = len(columns["account_number"])
+        table.account_number = columns["account_number"]
+        table.age = columns["age"]
+        table.balance = columns["balance"]
+        table.status_code = columns["status_code"]
+        table.type_code = columns["type_code"]
+        table.alive = array("b", [1]) * n
+        # snapshots store repeated names once, so rows already share their name strings
+        table.name = columns["name"]
+        table.timestamp = columns["timestamp"]
+        table.pin = columns["pin"]
+        table.status_values = list(status_values)
+        table.type_values = list(type_values)
+        table._status_codes = {v: i for i, v in enumerate(table.status_values)}
+        table._type_codes = {v: i for i, v in enumerate(table.type_values)}
+        table._index = dict(zip(table.account_number, range(n)))
+        return table
+
+    @classmethod
+    def from_accounts(cls, accounts: Iterable) -> "AccountTable":
+        table = cls()
+        for acc in accounts:
+            table.adopt(acc)
+        return table
+
+    # -------- Dict-like interface --------
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, account_number) -> bool:
+        return account_number in self._index
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._index)
+
+    def __getitem__(self, account_number):
+        return self.view(self._index[account_number])
+
+    def __setitem__(self, account_number, acc) -> None:
+        if acc._table is self and self._index.get(account_number) == acc._row:
+            return
+        self.adopt(acc)
+
+    def __delitem__(self, account_number) -> None:
+        with self.lock:
+            row = self._index.pop(account_number)
+            self._kill(row)
+
+    def get(self, account_number, default=None):
+        row = self._index.get(account_number)
+        return default if row is None else self.view(row)
+
+    def pop(self, account_number, default=None):
+        with self.lock:
+            row = self._index.pop(account_number, None)
+            if row is None:
+                return default
+            self._kill(row)
+        return self.view(row)
+
+    def keys(self):
+        return self._index.keys()
+
+    def values(self) -> Iterator:
+        return (self.view(row) for row in self._index.values())
+
+    def items(self) -> Iterator:
+        return ((no, self.view(row)) for no, row in self._index.items())
+
+    def clear(self) -> None:
+        for account_number in list(self._index):
+            del self[account_number]
@@ -0,0 +1,493 @@
+import csv
+import json
+import os
+import threading
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from src.models.account import Account
+from src.models.account_table import AccountTable
+
+# Location of an account's latest row, as kept in LazyAccountTable.locations:
+# a byte offset >= 0 into the CSV snapshot, -(offset + 3) for a journal line,
+# or one of these
+REMOVED = -1
+UNSAVED = -2   # created since the last save; only the cache has it
+
+# bytes read per pread() while scanning a file
+BLOCK = 1 << 20
+
+# fields that feed LazyAccountTable.totals(), as positions in AccountTable.FIELDS
+AGE, TYPE, BALANCE, STATUS = (AccountTable.FIELDS.index(f) for f in ("age", "account_type", "balance", "status"))
+
+
+def _lines(f, start: int = 0, stop: Optional[int] = None) -> Iterator[Tuple[int, bytes]]:
+    """(offset, line) of every complete line of an open file from `start` (up to `stop`).
+
+    Reads with os.pread, so it does not move the file position other readers use.
+    """
+    fd = f.fileno()
+    offset = read_at = start
+    buffer = b""
+    while stop is None or read_at < stop:
+        size = BLOCK if stop is None else min(BLOCK, stop - read_at)
+        block = os.pread(fd, size, read_at)
+        if not block:
+            break
+        read_at += len(block)
+        buffer += block
+        lines = buffer.split(b"\n")
+        # a torn last line (no newline yet) is left out
+        buffer = lines.pop()
+        for line in lines:
+            yield offset, line
+            offset += len(line) + 1
+
+
+def _line_at(f, offset: int) -> bytes:
+    fd = f.fileno()
+    data = b""
+    while True:
+        block = os.pread(fd, 4096, offset + len(data))
+        end = block.find(b"\n")
+        if end >= 0:
+            return data + block[:end]
+        if not block:
+            return data
+        data += block
+
+
+def _csv_fields(header, line: bytes) -> tuple:
+    row = dict(zip(header, next(csv.reader([line.decode("utf-8")]))))
+    return Account.normalize(
+        account_number=row["account_number"],
+        name=row["name"],
+        age=row["age"],
+        account_type=row["account_type"],
+        balance=row["balance"],
+        status=row["status"],
+        timestamp=row["time"] or None,
+        pin=row["pin"] or None,
+    )
+
+
+def _fields(acc) -> tuple:
+    return tuple(getattr(acc, field) for field in AccountTable.FIELDS)
+
+
+def _journal_fields(row: dict) -> tuple:
+    return Account.normalize(
+        account_number=row["account_number"],
+        name=row["name"],
+        age=row["age"],
+        account_type=row["account_type"],
+        balance=row["balance"],
+        status=row["status"],
+        timestamp=row["timestamp"] or None,
+        pin=row["pin"] or None,
+    )
+
+
+class LazyAccountTable:
+    """The accounts of an AccountJournal, read from its files on demand.
+
+    - Startup only builds a compact index: the account numbers in a sorted
+      array plus the byte offset of each account's latest row in the CSV
+      snapshot or the journal, about 16 bytes an account.
+    - get() materializes an account into `cache`, an AccountTable whose
+      dict keeps access order, so it doubles as an LRU list. Accounts are
+      views over that table, as with a fully loaded bank.
+    - trim() drops least recently used accounts once the cache holds more
+      than `capacity`. Accounts in `tracker` (changed but not saved yet)
+      are never dropped: the bank saves them first (write-back).
+    - scan(), values() and chunks() stream every account without caching
+      it, for aggregates, listings, exports and checkpoints. view() reads
+      an uncached account the same way, so listing results do not push the
+      working set out of the cache.
+    - sync() follows the journal records appended since the last call (our
+      own saves included) and rebuilds the index after a checkpoint.
+    - totals() keeps count, balance total and age total per (status, type)
+      current on every write, so counts and averages need no scan after
+      the first one.
+    - Offers the dict-like interface of AccountTable that BankingService
+      uses; the secondary indexes are replaced by scans (see scan_index).
+    """
+
+    DEFAULT_CAPACITY = 100_000
+
+    def __init__(self, snapshot_path: str, journal_path: str, capacity: int = DEFAULT_CAPACITY) -> None:
+        self.snapshot_path = snapshot_path
+        self.journal_path = journal_path
+        self.capacity = max(1, int(capacity))
+        self.cache = AccountTable()
+        self.listeners = []
+        self.lock = threading.RLock()
+        self._snapshot = None
+        self._journal = None
+        # saves we still owe the files, kept across a rebuild of the index
+        self._unsaved: Set[int] = set()
+        self._unsaved_removed: Set[int] = set()
+        # see totals(); None until first asked for
+        self._totals: Optional[Dict[Tuple[str, str], List]] = None
+        self.cache.add_listener(self)
+        self._reindex()
+
+    # -------- Index --------
+    def _reindex(self) -> None:
+        with self.lock:
+            for f in (self._snapshot, self._journal):
+                if f is not None:
+                    f.close()
+            numbers, locations = array("q"), array("q")
+            self._header = []
+            self._snapshot = self._open(self.snapshot_path)
+            self._snapshot_id = None
+            if self._snapshot is not None:
+                st = os.fstat(self._snapshot.fileno())
+                self._snapshot_id = (st.st_ino, st.st_mtime_ns, st.st_size)
+                for offset, line in _lines(self._snapshot):
+                    if offset == 0:
+                        self._header = line.decode("utf-8").strip().split(",")
+                        continue
+                    comma = line.find(b",")
+                    if comma <= 0:
+                        continue
+                    numbers.append(int(line[:comma]))
+                    locations.append(offset)
+            if any(a >= b for a, b in zip(numbers, numbers[1:])):
+                # unsorted or repeated numbers: the last row of an account wins, as in load_accounts
+                latest = dict(zip(numbers, locations))
+                numbers = array("q", sorted(latest))
+                locations = array("q", map(latest.__getitem__, numbers))
+            self.numbers = numbers
+            self.locations = locations
+            self.extra: Dict[int, int] = {}
+            self._count = len(numbers)
+            self._journal = self._open(self.journal_path)
+            self._journal_pos = 0
+            self.journal_records = 0
+            self._follow_journal()
+            for no in self._unsaved:
+                self._place(no, UNSAVED)
+            for no in self._unsaved_removed:
+                self._place(no, REMOVED)
+
+    @staticmethod
+    def _open(path: str):
+        try:
+            return open(path, "rb")
+        except FileNotFoundError:
+            return None
+
+    def _follow_journal(self) -> None:
+        if self._journal is None:
+            self._journal = self._open(self.journal_path)
+            if self._journal is None:
+                return
+        end = self._journal_pos
+        for offset, line in _lines(self._journal, self._journal_pos):
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # torn write at the tail; nothing valid follows it
+                break
+            if record.get("op") == "put":
+                no = int(record["row"]["account_number"])
+                self._unsaved.discard(no)
+                self._place(no, -(offset + 3))
+            elif record.get("op") == "del":
+                no = int(record["account_number"])
+                self._unsaved_removed.discard(no)
+                self._place(no, REMOVED)
+            end = offset + len(line) + 1
+            self.journal_records += 1
+        self._journal_pos = end
+
+    def sync(self) -> None:
+        """Pick up journal records written since the last call; rebuild after a checkpoint."""
+        with self.lock:
+            try:
+                st = os.stat(self.snapshot_path)
+                snapshot_id = (st.st_ino, st.st_mtime_ns, st.st_size)
+            except OSError:
+                snapshot_id = None
+            try:
+                journal_size = os.path.getsize(self.journal_path)
+            except OSError:
+                journal_size = 0
+            if snapshot_id != self._snapshot_id or journal_size < self._journal_pos:
+                self._reindex()
+            else:
+                self._follow_journal()
+
+    def _location(self, account_number) -> Optional[int]:
+        i = bisect_left(self.numbers, account_number)
+        if i < len(self.numbers) and self.numbers[i] == account_number:
+            location = self.locations[i]
+        else:
+            location = self.extra.get(account_number, REMOVED)
+        return None if location == REMOVED else location
+
+    def _place(self, account_number, location: int) -> None:
+        known = self._location(account_number) is not None
+        if location == REMOVED:
+            self._count -= known
+        elif not known:
+            self._count += 1
+        i = bisect_left(self.numbers, account_number)
+        if i < len(self.numbers) and self.numbers[i] == account_number:
+            self.locations[i] = location
+        elif location == REMOVED:
+            self.extra.pop(account_number, None)
+        else:
+            self.extra[account_number] = location
+
+    def _read(self, location: int) -> tuple:
+        if location >= 0:
+            return _csv_fields(self._header, _line_at(self._snapshot, location).rstrip(b"\r"))
+        return _journal_fields(json.loads(_line_at(self._journal, -location - 3))["row"])
+
+    # -------- Cache --------
+    @property
+    def tracker(self):
+        return self.cache.tracker
+
+    @tracker.setter
+    def tracker(self, value) -> None:
+        self.cache.tracker = value
+
+    @property
+    def status_values(self):
+        return self.cache.status_values
+
+    @property
+    def type_values(self):
+        return self.cache.type_values
+
+    def get(self, account_number, default=None):
+        with self.lock:
+            cache = self.cache
+            row = cache._index.pop(account_number, None)
+            if row is not None:
+                # re-inserted last: the most recently used end
+                cache._index[account_number] = row
+                return cache.view(row)
+            location = self._location(account_number)
+            if location is None or location == UNSAVED:
+                return default
+            fields = self._read(location)
+            # loading is not a change: keep it out of the dirty set
+            tracker, cache.tracker = cache.tracker, None
+            try:
+                row = cache.append_row(*fields)
+            finally:
+                cache.tracker = tracker
+            return cache.view(row)
+
+    def trim(self) -> int:
+        """Drop least recently used, unchanged accounts down to 90% of capacity; returns how many.
+
+        Call it while no operation holds an account (BankingService takes its
+        exclusive lock): the dropped rows and the old cache table stay readable
+        for views already handed out, but writes to them would be lost.
+        """
+        with self.lock:
+            cache = self.cache
+            if len(cache) <= self.capacity:
+                return 0
+            keep = self.capacity - self.capacity // 10
+            pinned = cache.tracker or ()
+            evict = []
+            excess = len(cache) - keep
+            for account_number in cache._index:
+                if len(evict) >= excess:
+                    break
+                if account_number not in pinned:
+                    evict.append(account_number)
+            for account_number in evict:
+                cache.pop(account_number)
+            if len(cache.account_number) > 2 * len(cache):
+                # rows are never reused; copy the live ones (in LRU order) into a fresh table
+                fresh = AccountTable()
+                fresh.extend(cache)
+                fresh.tracker = cache.tracker
+                fresh.add_listener(self)
+                self.cache = fresh
+            return len(evict)
+
+    # -------- Dict-like interface --------
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, account_number) -> bool:
+        return account_number in self.cache._index or self._location(account_number) is not None
+
+    def __iter__(self) -> Iterator[int]:
+        return self.keys()
+
+    def keys(self) -> Iterator[int]:
+        for account_number, location in zip(self.numbers, self.locations):
+            if location != REMOVED:
+                yield account_number
+        yield from list(self.extra)
+
+    def __getitem__(self, account_number):
+        acc = self.get(account_number)
+        if acc is None:
+            raise KeyError(account_number)
+        return acc
+
+    def __setitem__(self, account_number, acc) -> None:
+        self.adopt(acc)
+
+    def adopt(self, acc) -> None:
+        with self.lock:
+            account_number = acc.account_number
+            if acc._table is self.cache and self.cache._index.get(account_number) == acc._row:
+                return
+            if self._location(account_number) is None:
+                self._unsaved.add(account_number)
+                self._unsaved_removed.discard(account_number)
+                self._place(account_number, UNSAVED)
+            elif self._totals is not None:
+                # replaces the stored account
+                self._tally(_fields(self.view(account_number)), -1)
+            # stored in the cache, which marks it dirty; it stays there until saved
+            self.cache.adopt(acc)
+            if self._totals is not None:
+                self._tally(_fields(acc), 1)
+
+    def pop(self, account_number, default=None):
+        with self.lock:
+            acc = self.get(account_number)
+            if acc is None:
+                return default
+            if self._totals is not None:
+                self._tally(_fields(acc), -1)
+            self.cache.pop(account_number)
+            self._unsaved.discard(account_number)
+            self._unsaved_removed.add(account_number)
+            self._place(account_number, REMOVED)
+            return acc
+
+    def __delitem__(self, account_number) -> None:
+        if self.pop(account_number) is None:
+            raise KeyError(account_number)
+
+    def clear(self) -> None:
+        for account_number in list(self.keys()):
+            self.pop(account_number)
+
+    def values(self) -> Iterator:
+        for fields, row in self._scan():
+            yield self.cache.view(row) if row is not None else Account(*fields)
+
+    def items(self) -> Iterator:
+        return ((acc.account_number, acc) for acc in self.values())
+
+    # the secondary-index stand-ins (scan_index) hand out account numbers as rows
+    def view(self, account_number):
+        with self.lock:
+            row = self.cache._index.get(account_number)
+            if row is not None:
+                return self.cache.view(row)
+            location = self._location(account_number)
+            if location is None or location == UNSAVED:
+                raise KeyError(account_number)
+            return Account(*self._read(location))
+
+    # used by BankingService.merge_accounts; rows are rows of the cache
+    def row_of(self, account_number) -> Optional[int]:
+        acc = self.get(account_number)
+        return None if acc is None else acc._row
+
+    def value(self, row: int, field: str):
+        return self.cache.value(row, field)
+
+    def set_value(self, row: int, field: str, value) -> None:
+        self.cache.set_value(row, field, value)
+
+    # -------- Totals --------
+    def totals(self) -> Dict[Tuple[str, str], List]:
+        """{(status, account type): [accounts, balance total, age total]} of every account.
+
+        The first call scans once; adopt(), pop() and changes to cached
+        accounts (on_change) keep the totals current from then on. A rebuild
+        of the index (checkpoint) keeps them, as the accounts are the same;
+        after another process writes, the bank loads a new table.
+        """
+        # writes to cached accounts hold only the cache lock, so the totals are read
+        # and changed under it too
+        with self.lock, self.cache.lock:
+            if self._totals is None:
+                self._totals = {}
+                for fields in self.scan():
+                    self._tally(fields, 1)
+            return {key: list(entry) for key, entry in self._totals.items()}
+
+    def _tally(self, fields: tuple, sign: int) -> None:
+        with self.cache.lock:
+            entry = self._totals.setdefault((fields[STATUS], fields[TYPE]), [0, 0.0, 0])
+            entry[0] += sign
+            entry[1] += sign * fields[BALANCE]
+            entry[2] += sign * fields[AGE]
+
+    # the cache reports writes to its accounts; loading and evicting them are not changes
+    def on_add(self, row: int) -> None:
+        pass
+
+    def on_remove(self, row: int) -> None:
+        pass
+
+    def on_change(self, row: int, field: str, old) -> None:
+        if self._totals is None or field not in ("age", "account_type", "balance", "status"):
+            return
+        fields = tuple(self.cache.value(row, f) for f in AccountTable.FIELDS)
+        before = list(fields)
+        before[AccountTable.FIELDS.index(field)] = old
+        self._tally(tuple(before), -1)
+        self._tally(fields, 1)
+
+    # -------- Scans --------
+    def _scan(self) -> Iterator[Tuple[tuple, Optional[int]]]:
+        # (fields in AccountTable.FIELDS order, cache row or None) of every account:
+        # cached ones first, then the rows of the snapshot and journal that are current
+        cache = self.cache
+        cached = dict(cache._index)
+        for row in cached.values():
+            yield tuple(cache.value(row, field) for field in AccountTable.FIELDS), row
+        if self._snapshot is not None:
+            header = self._header
+            for offset, line in _lines(self._snapshot):
+                comma = line.find(b",")
+                if offset == 0 or comma <= 0:
+                    continue
+                account_number = int(line[:comma])
+                if account_number in cached or self._location(account_number) != offset:
+                    continue
+                yield _csv_fields(header, line.rstrip(b"\r")), None
+        if self._journal is not None:
+            for offset, line in _lines(self._journal, 0, self._journal_pos):
+                record = json.loads(line)
+                if record.get("op") != "put":
+                    continue
+                account_number = int(record["row"]["account_number"])
+                if account_number in cached or self._location(account_number) != -(offset + 3):
+                    continue
+                yield _journal_fields(record["row"]), None
+
+    def scan(self) -> Iterator[tuple]:
+        """Field tuples (AccountTable.FIELDS order) of every account, nothing cached."""
+        return (fields for fields, _ in self._scan())
+
+    def chunks(self, size: int = 100_000) -> Iterator[AccountTable]:
+        """Every account, as stand-alone AccountTables of up to `size` rows."""
+        table = AccountTable()
+        for fields in self.scan():
+            table.append_row(*fields)
+            if len(table) >= size:
+                yield table
+                table = AccountTable()
+        if len(table):
+            yield table
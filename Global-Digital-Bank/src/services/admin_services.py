@@ -3,24 +3,35 @@ from src.services.banking_service import BankingService,AgeRestrictionError,Acco
 from src.utils.file_manager import (
     read_user_transactions,
     read_admin_actions,
+    user_transactions_page,
+    admin_actions_page,
     export_accounts,
-    import_accounts,
     log_admin_action,
 )
+from src.utils.bulk_import import parse_accounts_file
 
 class AdminService:
     def __init__(self, bank: BankingService):
         self.bank = bank
+        # (line number, message) for rows skipped by the last import
+        self.last_import_errors = []
+    def save_to_disk(self):
+        # lets @BankingService.autosave wrap admin methods; flushes the bank's dirty accounts
+        return self.bank.save_to_disk()
     def get_account(self, account_number):
         return self.bank.get_account(account_number)
-    def view_all_accounts(self):
-        if not self.bank.accounts:
+    def view_all_accounts(self, include_cold=True):
+        cold = self.bank.cold if include_cold else None
+        if not self.bank.accounts and not (cold is not None and len(cold)):
             raise AccountNotFoundError(f"Account {self.bank.accounts} not found.")
         accounts_list = []
         for acc in self.bank.accounts.values():
             accounts_list.append(
                 f"{acc.account_number} | {acc.name} | {acc.account_type} | Balance: {acc.balance} | Status: {acc.status}"
             )
+        if cold is not None:
+            # archived accounts are listed as they are, not rehydrated
+            accounts_list.extend(self.format_account(acc) for acc in cold.accounts())
         return "\n".join(accounts_list)
         
     def search_account(self, account_number):
@@ -29,11 +40,11 @@ class AdminService:
             return f"{acc.account_number} | {acc.name} | {acc.account_type} | Balance: {acc.balance} | Status: {acc.status}"
         else:
             raise AccountNotFoundError(f"Account {account_number} not found.")
-    def search_by_name(self, name):
-        results = []
-        for acc in self.bank.accounts.values():
-            if acc.name.lower() == name.lower():
-                results.append(f"{acc.account_number} | {acc.name} | {acc.account_type} | Balance: {acc.balance} | Status: {acc.status}")
+    def search_by_name(self, name, match="exact"):
+        results = [
+            f"{acc.account_number} | {acc.name} | {acc.account_type} | Balance: {acc.balance} | Status: {acc.status}"
+            for acc in self.bank.find_accounts_by_name(name, match)
+        ]
         if not results:
             raise AccountNotFoundError(f"No accounts found for name: {name}")
         return "\n".join(results)   
@@ -45,29 +56,32 @@ class AdminService:
             raise AccountNotFoundError(f"Account {account_number} not found.")
     @BankingService.autosave
     def reactivate_account(self, account_number):
-        acc = self.bank.get_account(account_number)
-        if not acc:
-            raise AccountNotFoundError(f"Account {account_number} not found.")
-        if acc.status == "Active":
-            return f"Account {account_number} is already active."
-        acc.status = "Active"
+        with self.bank.locks.hold(account_number):
+            acc = self.bank.get_account(account_number)
+            if not acc:
+                raise AccountNotFoundError(f"Account {account_number} not found.")
+            if acc.status == "Active":
+                return f"Account {account_number} is already active."
+            acc.status = "Active"
         return f"Account {account_number} has been reactivated."
-    def count_accounts(self):
-        return len(self.bank.accounts or {})
+    def count_accounts(self, include_cold=True):
+        return self.bank.count_accounts(include_cold=include_cold)
         
 
     @BankingService.autosave
     def force_close_account(self, account_number):
-        acc = self.bank.get_account(account_number)
-        if not acc:
-            raise AccountNotFoundError(f"Account {account_number} not found.")
-        acc.status = "Inactive"
+        with self.bank.locks.hold(account_number):
+            acc = self.bank.get_account(account_number)
+            if not acc:
+                raise AccountNotFoundError(f"Account {account_number} not found.")
+            acc.status = "Inactive"
+            self.bank._archive_later(account_number)
         log_admin_action(f"FORCE_CLOSE | {account_number}")
         return f"Account {account_number} has been force-closed by Admin."
 
     # ---- Additional Admin Features ----
-    def list_active_accounts(self):
-        active = [acc for acc in self.bank.accounts.values() if acc.status == "Active"]
+    def list_active_accounts(self, include_cold=True):
+        active = self.bank.accounts_with_status("Active", include_cold=include_cold)
         if not active:
             return "No active accounts."
         return "\n".join(
@@ -75,8 +89,8 @@ class AdminService:
             for acc in active
         )
 
-    def list_closed_accounts(self):
-        closed = [acc for acc in self.bank.accounts.values() if acc.status != "Active"]
+    def list_closed_accounts(self, include_cold=True):
+        closed = self.bank.accounts_with_status(exclude_status="Active", include_cold=include_cold)
         if not closed:
             return "No closed accounts."
         return "\n".join(
@@ -84,6 +98,27 @@ class AdminService:
             for acc in closed
         )
 
+    # ---- Paginated listings ----
+    @staticmethod
+    def format_account(acc):
+        return f"{acc.account_number} | {acc.name} | {acc.account_type} | Balance: {acc.balance} | Status: {acc.status}"
+
+    def accounts_page(self, cursor=None, page_size=50, status=None, exclude_status=None,
+                      order_by="account_number", descending=False, include_cold=True):
+        # (rows, next_cursor); pass next_cursor back for the following page, None means last page
+        accounts, next_cursor = self.bank.accounts_page(
+            cursor, page_size, order_by, descending, status, exclude_status, include_cold
+        )
+        return [self.format_account(acc) for acc in accounts], next_cursor
+
+    def logs_page(self, kind="user", cursor=None, page_size=100, newest_first=True):
+        # kind: "user" (transaction log) or "admin" (admin actions)
+        if kind == "user":
+            return user_transactions_page(cursor, page_size, newest_first)
+        if kind == "admin":
+            return admin_actions_page(cursor, page_size, newest_first)
+        raise ValueError(f"Invalid log kind: {kind}. Choose from ['user', 'admin']")
+
     def view_transaction_logs(self):
         user_logs = read_user_transactions()
         admin_logs = read_admin_actions()
@@ -96,35 +131,78 @@ class AdminService:
             out.append("-- Admin Actions --\n" + admin_logs.strip())
         return "\n\n".join(out)
 
-    def export_accounts_to_file(self, export_path):
-        export_accounts(self.bank.accounts, export_path)
-        log_admin_action(f"EXPORT | {export_path}")
-        return f"Accounts exported to {export_path}"
+    def export_accounts_to_file(self, export_path, columns=None, status=None, account_type=None, include_pin=False,
+                                include_cold=True):
+        # format from the extension: .csv, .csv.gz, .csv.zst, .parquet, .arrow
+        # include_cold: with tiering on, closed and dormant accounts are written after the hot ones
+        written = export_accounts(
+            self.bank.accounts,
+            export_path,
+            columns=columns,
+            status=status,
+            account_type=account_type,
+            include_pin=include_pin,
+            cold=self.bank.cold if include_cold else None,
+        )
+        log_admin_action(f"EXPORT | {export_path} | rows={written}" + (" | with PINs" if include_pin else ""))
+        return f"{written} accounts exported to {export_path}"
 
-    def count_active_accounts(self):
-        return sum(1 for acc in self.bank.accounts.values() if acc.status == "Active")
+    def count_active_accounts(self, include_cold=True):
+        return self.bank.count_accounts(status="Active", include_cold=include_cold)
+
+    @BankingService.autosave
+    def archive_dormant_accounts(self, days=None):
+        # move accounts without transactions for `days` days to the cold tier
+        moved = self.bank.archive_dormant(days)
+        log_admin_action(f"ARCHIVE_DORMANT | days={days or BankingService.DORMANT_AFTER_DAYS} | accounts={moved}")
+        return f"{moved} dormant accounts moved to the cold store."
 
     def delete_all_accounts(self):
-        self.bank.accounts.clear()
-        self.bank.save_to_disk()   # ✅ call save from BankingService
+        with self.bank.locks.exclusive():
+            self.bank.replace_accounts({})
+            self.bank.save_to_disk()   # ✅ call save from BankingService
         log_admin_action("DELETE_ALL_ACCOUNTS")
         return "All accounts deleted."
 
     def system_exit_with_autosave(self):
         self.bank.save_to_disk()
+        self.bank.checkpoint()
         log_admin_action("SYSTEM_EXIT_WITH_AUTOSAVE")
         return "Changes saved"
 
+    IMPORT_MODES = ("replace", "merge")
+
     @BankingService.autosave
-    def import_accounts_from_file(self, import_path):
-        imported = import_accounts(import_path)
-        self.bank.accounts = imported
-        if self.bank.accounts:
-            self.bank.next_account_number = max(self.bank.accounts.keys()) + 1
-        else:
-            self.bank.next_account_number = BankingService.START_ACCOUNT_NO
-        log_admin_action(f"IMPORT | {import_path}")
-        return f"Imported {len(imported)} accounts from {import_path}"
+    def import_accounts_from_file(self, import_path, mode="replace", workers=None):
+        # mode "replace": the file becomes the whole book
+        # mode "merge": rows upsert into the existing accounts (matched by account number)
+        # Rows failing validation are skipped and listed in self.last_import_errors;
+        # everything is persisted once, by autosave, when the import is done.
+        if mode not in AdminService.IMPORT_MODES:
+            raise ValueError(f"Invalid import mode: {mode}. Choose from {list(AdminService.IMPORT_MODES)}")
+        imported, errors, fields = parse_accounts_file(import_path, workers)
+        self.last_import_errors = errors
+        # parsing runs alongside other operations; swapping the accounts does not
+        with self.bank.locks.exclusive():
+            if mode == "replace":
+                self.bank.replace_accounts(imported)
+            else:
+                # only the columns the file has: an export without PINs must not clear them
+                self.bank.merge_accounts(imported, fields)
+            if self.bank.accounts:
+                next_no = max(self.bank.accounts.keys()) + 1
+                if mode == "merge":
+                    next_no = max(next_no, self.bank.next_account_number)
+                self.bank.next_account_number = next_no
+            else:
+                self.bank.next_account_number = BankingService.START_ACCOUNT_NO
+        log_admin_action(f"IMPORT | {import_path} | {mode} | rows={len(imported)} | errors={len(errors)}")
+        msg = f"Imported {len(imported)} accounts from {import_path}"
+        if errors:
+            shown = "\n".join(f"  line {line}: {error}" for line, error in errors[:10])
+            more = f"\n  ... {len(errors) - 10} more" if len(errors) > 10 else ""
+            msg += f" ({len(errors)} rows with errors)\n{shown}{more}"
+        return msg
 
 
 # CLI/runner intentionally kept out of this service module.
\ No newline at end of file
@@ -0,0 +1,190 @@
+# Thin client for bank_server. BankClient, LoanClient and AdminClient have the
+# method names of BankingService, LoanService and AdminService, so the CLI and
+# Streamlit front-ends use them unchanged; open_services() falls back to
+# in-process services when no server is running.
+import functools
+import json
+import socket
+import threading
+
+from src.models.account import Account
+from src.services import rpc
+from src.services.banking_service import (
+    BankingService,
+    AgeRestrictionError,
+    AccountNotFoundError,
+    InsufficientFundsError,
+    InactiveAccountError,
+)
+from src.services.loan_services import LoanService
+
+
+class RemoteError(RuntimeError):
+    """An error raised by the server that has no local exception class."""
+
+
+# server exception name -> how to rebuild it from (attrs, message)
+ERRORS = {
+    "AccountNotFoundError": lambda a, m: AccountNotFoundError(a.get("account_number"), m),
+    "InactiveAccountError": lambda a, m: InactiveAccountError(a.get("account_number"), m),
+    "AgeRestrictionError": lambda a, m: AgeRestrictionError(a.get("age"), m),
+    "InsufficientFundsError": lambda a, m: InsufficientFundsError(a.get("balance"), a.get("amount"), m),
+    "ValueError": lambda a, m: ValueError(m),
+    "TypeError": lambda a, m: TypeError(m),
+    "KeyError": lambda a, m: KeyError(m),
+    "AttributeError": lambda a, m: AttributeError(m),
+    "FileNotFoundError": lambda a, m: FileNotFoundError(m),
+    "ImportError": lambda a, m: ImportError(m),
+    "PermissionError": lambda a, m: PermissionError(m),
+}
+
+
+class AccountInfo:
+    """Snapshot of an account as sent by the server (everything but the PIN)."""
+
+    MIN_BALANCE = Account.MIN_BALANCE
+    __slots__ = rpc.ACCOUNT_FIELDS
+
+    def __init__(self, **fields):
+        for field in rpc.ACCOUNT_FIELDS:
+            setattr(self, field, fields.get(field))
+
+    def to_dict(self):
+        return {field: getattr(self, field) for field in rpc.ACCOUNT_FIELDS}
+
+    def __str__(self):
+        return f"[{self.account_number}] {self.name} ({self.account_type}) - Balance: {self.balance} - {self.status}"
+
+
+def _to_wire(value):
+    if isinstance(value, (AccountInfo, Account)):
+        return {"__account__": {"account_number": value.account_number}}
+    if isinstance(value, (list, tuple)):
+        return [_to_wire(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _to_wire(v) for k, v in value.items()}
+    return value
+
+
+def _from_wire(value):
+    if isinstance(value, list):
+        return [_from_wire(v) for v in value]
+    if isinstance(value, dict):
+        if "__account__" in value:
+            return AccountInfo(**value["__account__"])
+        if "__items__" in value:
+            return {k: _from_wire(v) for k, v in value["__items__"]}
+        return {k: _from_wire(v) for k, v in value.items()}
+    return value
+
+
+class Connection:
+    """One socket to the server; calls are sent one at a time."""
+
+    def __init__(self, address=rpc.DEFAULT_ADDRESS, timeout=60.0):
+        kind, where = rpc.parse_address(address)
+        family = socket.AF_UNIX if kind == "unix" else socket.AF_INET
+        self.sock = socket.socket(family, socket.SOCK_STREAM)
+        try:
+            # a blocking connect waits for a busy server's accept queue instead of failing with EAGAIN
+            self.sock.connect(where)
+        except OSError:
+            self.sock.close()
+            raise
+        self.sock.settimeout(timeout)
+        self.file = self.sock.makefile("rwb")
+        self._lock = threading.Lock()
+        self._next_id = 0
+
+    def call(self, method, *args, **kwargs):
+        with self._lock:
+            self._next_id += 1
+            request = {"i": self._next_id, "m": method, "a": _to_wire(args)}
+            if kwargs:
+                request["k"] = _to_wire(kwargs)
+            self.file.write(rpc.dumps(request))
+            self.file.flush()
+            while True:
+                line = self.file.readline()
+                if not line:
+                    raise ConnectionError("The bank server closed the connection")
+                response = json.loads(line)
+                if response.get("i") == self._next_id:
+                    break
+        if "e" in response:
+            error = response["e"]
+            build = ERRORS.get(error.get("type"))
+            if build is None:
+                raise RemoteError(f"{error.get('type')}: {error.get('message')}")
+            raise build(error.get("attrs") or {}, error.get("message"))
+        return _from_wire(response.get("r"))
+
+    def close(self):
+        self.file.close()
+        self.sock.close()
+
+
+class ServiceClient:
+    # forwards the allowlisted method names of one namespace to the server
+    def __init__(self, connection, namespace, methods):
+        self._connection = connection
+        self._namespace = namespace
+        self._methods = methods
+
+    def __getattr__(self, name):
+        if name.startswith("_") or name not in self._methods:
+            raise AttributeError(f"{type(self).__name__} has no method {name}")
+        method = f"{self._namespace}.{name}" if self._namespace else name
+        return functools.partial(self._connection.call, method)
+
+
+class BankClient(ServiceClient):
+    DAILY_DEPOSIT_LIMIT = BankingService.DAILY_DEPOSIT_LIMIT
+    DAILY_WITHDRAW_LIMIT = BankingService.DAILY_WITHDRAW_LIMIT
+
+    def __init__(self, connection):
+        super().__init__(connection, "", rpc.BANK_METHODS)
+        self.rollups = ServiceClient(connection, "rollups", rpc.ROLLUP_METHODS)
+
+    def close(self):
+        self._connection.close()
+
+
+class LoanClient(ServiceClient):
+    # the rate / EMI helpers are pure functions and run locally
+    get_rate_for_account_type = staticmethod(LoanService.get_rate_for_account_type)
+    get_max_limit_for_account_type = staticmethod(LoanService.get_max_limit_for_account_type)
+    compute_total_payable = staticmethod(LoanService.compute_total_payable)
+    compute_emi = staticmethod(LoanService.compute_emi)
+
+    def __init__(self, connection):
+        super().__init__(connection, "loan", rpc.LOAN_METHODS)
+
+
+class AdminClient(ServiceClient):
+    def __init__(self, connection, key=rpc.ADMIN_KEY):
+        super().__init__(connection, "admin", rpc.ADMIN_METHODS)
+        # unlocks the admin methods on this connection; PermissionError for a wrong key
+        connection.call(rpc.AUTH_METHOD, key)
+
+
+def connect(address=rpc.DEFAULT_ADDRESS):
+    """(BankClient, LoanClient) over one connection; OSError if no server is listening."""
+    connection = Connection(address)
+    return BankClient(connection), LoanClient(connection)
+
+
+def open_services(address=rpc.DEFAULT_ADDRESS):
+    """Clients of the running server, or in-process services when there is none."""
+    try:
+        return connect(address)
+    except OSError:
+        return BankingService(), LoanService()
+
+
+def open_admin(bank, key=rpc.ADMIN_KEY):
+    # the admin service that goes with a bank from open_services()
+    if isinstance(bank, BankClient):
+        return AdminClient(bank._connection, key)
+    from src.services.admin_services import AdminService
+    return AdminService(bank)
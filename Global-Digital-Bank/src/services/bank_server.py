@@ -0,0 +1,232 @@
+# Long-running front-end: one process owns the BankingService / LoanService and
+# every CLI or Streamlit session talks to it through bank_client.
+#
+#   python server.py                      (listens on rpc.DEFAULT_ADDRESS)
+#   GDB_SERVER_ADDRESS=127.0.0.1:8765 python server.py
+# Other hosts can only connect when GDB_SERVER_ALLOW_REMOTE=1; admin calls need the
+# admin key (GDB_ADMIN_KEY) sent with "auth" on the connection first.
+import asyncio
+import json
+import os
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src.services import rpc
+from src.services.admin_services import AdminService
+from src.services.banking_service import BankingService
+from src.services.loan_services import LoanService, BASE_DATA_DIR
+
+# pending connections the OS queues while the loop is busy (sessions tend to connect in bursts)
+BACKLOG = 1024
+
+
+class BankServer:
+    """Serves one BankingService, LoanService and AdminService over a local socket.
+
+    - Newline-delimited JSON requests (see rpc); requests on a connection are
+      handled concurrently and answered by id.
+    - Calls that only read memory run on the event loop. Everything that can
+      write logs, save files or wait on account locks (lookups included) runs
+      in a thread pool, which is safe because BankingService takes its own
+      per-account locks. Loan calls get their own thread so a slow loan save
+      does not hold up banking calls.
+    - Only the methods listed in rpc can be called. Admin methods also need
+      the admin key ("auth") on the same connection, import/export paths
+      must lie inside the data directory, and verify_pin stops answering
+      for an account after rpc.MAX_PIN_FAILURES wrong PINs in a row.
+    - The Unix socket is private to the server's user; TCP is loopback only
+      unless remote access is enabled explicitly.
+    """
+
+    # admin methods that take a file path (first argument or import_path / export_path)
+    PATH_METHODS = {"admin.import_accounts_from_file": "import_path", "admin.export_accounts_to_file": "export_path"}
+
+    def __init__(self, bank=None, loans=None, workers=8):
+        self.bank = bank or BankingService()
+        self.loans = loans or LoanService()
+        self.admin = AdminService(self.bank)
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bank-rpc")
+        self.loan_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="loan-rpc")
+        self.connections = 0
+        self._server = None
+        # account number -> (wrong PINs in a row, time of the last one)
+        self._pin_failures = {}
+        self._pin_lock = threading.Lock()
+
+    def _target(self, method):
+        namespace, _, name = method.rpartition(".")
+        owners = {"": self.bank, "loan": self.loans, "admin": self.admin, "rollups": self.bank.rollups}
+        return getattr(owners[namespace], name)
+
+    def _argument(self, value):
+        # an account passed by a client arrives as {"__account__": {...}}
+        if isinstance(value, dict) and "__account__" in value:
+            return self.bank.get_account(value["__account__"]["account_number"])
+        return value
+
+    @staticmethod
+    def _data_path(path):
+        # import / export files are confined to the data directory (relative paths start there)
+        if not isinstance(path, str) or not path:
+            raise PermissionError("A file path inside the data directory is required")
+        root = os.path.realpath(BASE_DATA_DIR)
+        full = os.path.realpath(os.path.join(root, path))
+        if os.path.commonpath([root, full]) != root:
+            raise PermissionError(f"Path {path} is outside the data directory")
+        return full
+
+    def _confine_paths(self, method, args, kwargs):
+        name = self.PATH_METHODS[method]
+        if args:
+            args[0] = self._data_path(args[0])
+        elif name in kwargs:
+            kwargs[name] = self._data_path(kwargs[name])
+        else:
+            raise PermissionError("A file path inside the data directory is required")
+
+    def _verify_pin(self, account_number, pin):
+        # bank.verify_pin, refusing accounts with too many wrong PINs in a row
+        key = str(account_number)
+        with self._pin_lock:
+            failures, last = self._pin_failures.get(key, (0, 0.0))
+            if failures >= rpc.MAX_PIN_FAILURES and time.monotonic() - last < rpc.PIN_LOCKOUT_SECONDS:
+                raise PermissionError(f"Too many wrong PINs for account {account_number}; try again later")
+        ok = self.bank.verify_pin(account_number, pin)
+        with self._pin_lock:
+            if ok:
+                self._pin_failures.pop(key, None)
+            else:
+                failures, last = self._pin_failures.get(key, (0, 0.0))
+                if time.monotonic() - last >= rpc.PIN_LOCKOUT_SECONDS:
+                    failures = 0
+                self._pin_failures[key] = (failures + 1, time.monotonic())
+        return ok
+
+    async def call(self, method, args=(), kwargs=None, session=None):
+        # session: per-connection state ({"admin": bool}); None means a trusted in-process caller
+        if not isinstance(method, str) or not rpc.allowed(method):
+            raise AttributeError(f"Unknown method: {method}")
+        if method.startswith("admin.") and session is not None and not session.get("admin"):
+            raise PermissionError("Admin methods need the admin key; call auth first")
+        fn = self._verify_pin if method == "verify_pin" else self._target(method)
+        args = list(args)
+        kwargs = dict(kwargs or {})
+        if method in self.PATH_METHODS and session is not None:
+            self._confine_paths(method, args, kwargs)
+
+        def run():
+            # account arguments are looked up here too, off the event loop
+            return fn(*[self._argument(a) for a in args], **{k: self._argument(v) for k, v in kwargs.items()})
+
+        if method.startswith("loan."):
+            executor = self.loan_executor
+        elif rpc.BANK_METHODS.get(method):
+            return run()
+        else:
+            executor = self.executor
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, run)
+
+    async def _answer(self, line, writer, session):
+        request_id = None
+        try:
+            request = json.loads(line)
+            request_id = request.get("i")
+            if request.get("m") == rpc.AUTH_METHOD:
+                if session["auth_failures"] >= rpc.MAX_AUTH_FAILURES:
+                    raise PermissionError("Too many wrong admin keys on this connection")
+                if not rpc.admin_key_matches((request.get("a") or [None])[0]):
+                    session["auth_failures"] += 1
+                    raise PermissionError("Wrong admin key")
+                session["admin"] = True
+                result = True
+            else:
+                result = await self.call(request.get("m"), request.get("a", ()), request.get("k"), session)
+            response = {"i": request_id, "r": rpc.to_wire(result)}
+        except Exception as e:
+            response = {"i": request_id, "e": rpc.error_to_wire(e)}
+        writer.write(rpc.dumps(response))
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+
+    async def _serve_connection(self, reader, writer):
+        self.connections += 1
+        pending = set()
+        session = {"admin": False, "auth_failures": 0}
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    # request longer than rpc.MAX_LINE
+                    break
+                if not line:
+                    break
+                task = asyncio.ensure_future(self._answer(line, writer, session))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+        except ConnectionError:
+            pass
+        finally:
+            self.connections -= 1
+            writer.close()
+
+    async def start(self, address=rpc.DEFAULT_ADDRESS):
+        kind, where = rpc.parse_address(address)
+        if kind == "unix":
+            if os.path.exists(where):
+                probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                try:
+                    probe.connect(where)
+                except OSError:
+                    # left behind by a server that did not shut down cleanly
+                    os.remove(where)
+                else:
+                    raise RuntimeError(f"A bank server is already listening on {where}")
+                finally:
+                    probe.close()
+            self._server = await asyncio.start_unix_server(
+                self._serve_connection, path=where, limit=rpc.MAX_LINE, backlog=BACKLOG
+            )
+            # only processes of the server's own user can connect
+            os.chmod(where, 0o600)
+        else:
+            if not rpc.is_loopback(where[0]) and not rpc.ALLOW_REMOTE:
+                raise RuntimeError(
+                    f"Refusing to listen on {where[0]}: set GDB_SERVER_ALLOW_REMOTE=1 to accept other hosts"
+                )
+            self._server = await asyncio.start_server(
+                self._serve_connection, host=where[0], port=where[1], limit=rpc.MAX_LINE, backlog=BACKLOG
+            )
+        return self._server
+
+    async def serve_forever(self, address=rpc.DEFAULT_ADDRESS):
+        server = await self.start(address)
+        async with server:
+            await server.serve_forever()
+
+    def close(self):
+        # finish in-flight calls, then flush whatever the FlushPolicy still holds
+        self.executor.shutdown(wait=True)
+        self.loan_executor.shutdown(wait=True)
+        self.bank.close()
+
+
+def serve(address=rpc.DEFAULT_ADDRESS, workers=8):
+    server = BankServer(workers=workers)
+    print(f"Global Digital Bank server listening on {address}")
+    try:
+        asyncio.run(server.serve_forever(address))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+        kind, where = rpc.parse_address(address)
+        if kind == "unix" and os.path.exists(where):
+            os.remove(where)
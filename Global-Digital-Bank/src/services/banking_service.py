@@ -2,33 +2,490 @@
 # It acts as the middle layer between  the Account model (business rules)
 # and file_manager utilities (storage and logging).
 from src.models.account import Account
+from src.models.account_table import AccountTable
+from src.models.lazy_account_table import LazyAccountTable
 import time,datetime
-from  src.utils.file_manager import load_accounts, save_accounts, log_transaction
-from  src.utils.file_manager import USER_TRANSACTIONS_FILE
+import os
+import atexit
+import threading
+from  src.utils.file_manager import load_accounts, save_accounts, log_transaction, log_transactions, flush_logs
+from  src.utils.file_manager import read_account_transactions, iter_user_transactions, load_user_transactions_array
+from  src.utils import file_manager
+from  src.utils import binary_log
+from  src.utils.journal import AccountJournal
+from  src.utils.sqlite_store import SQLiteStore
+from  src.utils.cold_store import ColdStore
+from  src.utils.flush_policy import FlushPolicy
+from  src.utils.daily_totals import DailyTotals
+from  src.utils.rollups import DailyRollups
+from  src.utils import aggregates
+from  src.utils.order_index import OrderIndex
+from  src.utils.name_index import NameIndex
+from  src.utils.status_index import StatusPartitions
+from  src.utils.lazy_index import LazyIndex
+from  src.utils.scan_index import ScanOrderIndex, ScanNameIndex, ScanStatusPartitions
+from  src.utils.account_locks import AccountLocks
 class BankingService:
     START_ACCOUNT_NO = 1001
     DAILY_DEPOSIT_LIMIT = 200000.0
     DAILY_WITHDRAW_LIMIT = 200000.0
-    def __init__(self):
-        # load accounts from file on starup
-        self.accounts = load_accounts()
+    # "csv"     -> rewrite accounts.csv on every save (original behaviour)
+    # "journal" -> append changed rows to accounts.journal, checkpoint the CSV periodically
+    # "sqlite"  -> upsert changed rows into data/bank.db (see sqlite_store.migrate_from_csv)
+    STORAGE_MODES = ("csv", "journal", "sqlite")
+    # lazy=True (journal storage only) keeps just an account number -> file offset index
+    # in memory and reads accounts on first use into an LRU cache of cache_size accounts;
+    # aggregates and listings then scan the files (see LazyAccountTable, scan_index)
+    # tiering=True moves closed accounts (and, via archive_dormant, long-dormant ones) out of
+    # the hot table into a compressed cold store (data/cold_accounts.db); get_account brings
+    # them back. Saves, checkpoints and memory then only grow with the live accounts.
+    DORMANT_AFTER_DAYS = 365
+    def __init__(self, storage="csv", flush_policy=None, lazy=False, cache_size=LazyAccountTable.DEFAULT_CAPACITY,
+                 tiering=False):
+        if storage not in BankingService.STORAGE_MODES:
+            raise ValueError(f"Invalid storage mode: {storage}. Choose from {list(BankingService.STORAGE_MODES)}")
+        if lazy and storage != "journal":
+            raise ValueError("Lazy loading reads accounts from the journal's files; use storage='journal'")
+        self.storage = storage
+        self.lazy = lazy
+        self.cache_size = cache_size
+        if storage == "journal":
+            self.store = AccountJournal()
+        elif storage == "sqlite":
+            self.store = SQLiteStore()
+        else:
+            self.store = None
+        # account numbers modified / deleted since the last flush
+        self._dirty = set()
+        self._removed = set()
+        # cold tier: closed accounts to archive at the next flush, accounts whose cold copy
+        # goes once the hot store has them again, and rehydrated accounts that were still
+        # closed (they go back to the cold tier at the next checkpoint unless reopened)
+        self.cold = ColdStore() if tiering else None
+        self._to_archive = set()
+        self._rehydrated = set()
+        self._rearchive = set()
+        self.flush_stats = {"flushes": 0, "rows_written": 0, "last_flush_rows": 0}
+        # account number -> its stored fields when an operation first looked it up, kept until
+        # the account is saved; refresh_if_changed merges against it (three-way)
+        self._base = {}
+        self.refresh_stats = {"reloads": 0, "merged_rows": 0, "conflicting_fields": 0}
+        # when to flush; see FlushPolicy for what each mode can lose on a crash
+        self.flush_policy = flush_policy or FlushPolicy()
+        self._flush_lock = threading.RLock()
+        self._flush_timer = None
+        # per-account locks for operations, and the gate whole-book operations close
+        self.locks = AccountLocks()
+        self._number_lock = threading.Lock()
+        if self.flush_policy.mode != FlushPolicy.ALWAYS:
+            atexit.register(self.close)
+        # load accounts from file on starup (snapshot + journal tail in journal mode)
+        # and remember the files' state, to notice writes by other processes
+        self._loaded_stamp = self._storage_stamp()
+        self.accounts = self._load_accounts()
+        # column writes on any account land in our dirty set
+        self.accounts.tracker = self._dirty
+        self._attach_indexes()
         if self.accounts:
             # if account exist, continue from the max account number
             self.next_account_number = max(self.accounts.keys()) + 1 # 1001, 1002, 1003 , 1004
         else :
             # otherwise,start fresh from 1001
             self.next_account_number = BankingService.START_ACCOUNT_NO
-    # Decorater to AutoSave after any opertaion modifies the data
+        if self.cold is not None:
+            # archived accounts keep their numbers
+            self.next_account_number = max(self.next_account_number, (self.cold.max_account_number() or 0) + 1)
+            # a crash between an archive's cold write and the hot save (or a rehydration's hot
+            # save and the cold delete) leaves a copy in both tiers; the hot one wins, as on
+            # lookup, and a closed account goes to the cold tier again at the next flush
+            both = [no for no in self.cold.account_numbers() if no in self.accounts]
+            self.cold.delete(both)
+            self._to_archive.update(no for no in both if self.accounts[no].status != "Active")
+        # today's DEPOSIT / WITHDRAW totals per account, for the daily limit checks
+        self.daily_totals = DailyTotals()
+        self._load_daily_totals()
+        # per-(account, day) totals for the Monthly Analytics dashboard
+        self.rollups = DailyRollups()
+        if self.rollups.is_empty():
+            # first run: back-fill from the existing log once
+            self.rollups.rebuild(iter_user_transactions())
+
+    def _load_daily_totals(self):
+        today = datetime.date.today().isoformat()
+        records = load_user_transactions_array(today, today)
+        if records is not None:
+            self.daily_totals.load({op: binary_log.totals_by_account(records, op) for op in DailyTotals.OPERATIONS})
+        else:
+            self.daily_totals.rebuild(iter_user_transactions(today, today))
+    # Decorater to AutoSave after any opertaion modifies the data.
+    # Whether the save happens now or later is up to the bank's FlushPolicy.
+    # Also used on AdminService methods, hence the lookup of `bank`.
+    # Each method takes its own locks (self.locks); the save runs after they are released,
+    # and a call nested inside another operation leaves it to the outer one.
     def autosave(func):
         def wrapper(self, *args, **kwargs):
+            bank = getattr(self, "bank", self)
+            if not bank.locks.busy():
+                # work on what other processes have saved, not on a stale copy
+                bank.refresh_if_changed()
             result = func(self, *args, **kwargs)   # run the actual method
-            self.save_to_disk()                    # always save after success
+            if not bank.locks.busy():
+                bank._operation_done()
+                if bank.lazy:
+                    bank._trim_cache()
             return result
         return wrapper
+
+    def _operation_done(self):
+        # the save runs after _flush_lock is released: it takes the bank-wide gate first
+        with self._flush_lock:
+            if not self._dirty and not self._removed:
+                return
+            flush = self.flush_policy.record()
+            if not flush and self.flush_policy.mode == FlushPolicy.GROUP and self._flush_timer is None:
+                # make sure a quiet period still flushes within every_ms
+                self._flush_timer = threading.Timer(self.flush_policy.every_ms / 1000.0, self._timed_flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+        if flush:
+            self.save_to_disk()
+
+    def _timed_flush(self):
+        with self.locks.exclusive(), self._flush_lock:
+            self._flush_timer = None
+            if self.flush_policy.pending:
+                self.save_to_disk()
+
+    def _trim_cache(self):
+        # lazy mode: keep the account cache near cache_size. Only saved accounts can be
+        # dropped and read back later, so changed ones are written back first.
+        if len(self.accounts.cache) <= self.accounts.capacity:
+            return
+        with self.locks.exclusive():
+            if self._dirty or self._removed:
+                self.save_to_disk()
+            self.accounts.trim()
+
+    def close(self):
+        # flush everything still pending (registered with atexit for deferred policies)
+        with self.locks.exclusive(), self._flush_lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            self.save_to_disk()
+            self._save_snapshot()
     
+    def replace_accounts(self, accounts):
+        # swap in a whole new set of accounts (import / delete all) and mark the difference dirty
+        with self.locks.exclusive(), self._flush_lock:
+            self._removed.update(no for no in self.accounts if no not in accounts)
+            self._removed.difference_update(accounts.keys())
+            if self.cold is not None:
+                # the new set replaces the cold tier too; its rows go with the save below
+                self._to_archive.clear()
+                self._rearchive.clear()
+                self._rehydrated.update(self.cold.account_numbers())
+            if self.lazy:
+                # the lazy table stays; the accounts move in as changes and are written back
+                for no in list(self._removed):
+                    self.accounts.pop(no, None)
+                for acc in accounts.values():
+                    self.accounts[acc.account_number] = acc
+                self._dirty.update(accounts.keys())
+            else:
+                if not isinstance(accounts, AccountTable):
+                    accounts = AccountTable.from_accounts(accounts.values())
+                accounts.tracker = self._dirty
+                self.accounts = accounts
+                self._attach_indexes()
+                self._dirty.update(accounts.keys())
+            if self._rehydrated:
+                # old cold rows must not be counted next to the new accounts until a later save
+                self.save_to_disk()
+
+    def merge_accounts(self, accounts, fields=None):
+        # upsert another table's accounts into ours: changed fields are written in place,
+        # new account numbers are appended; indexes and the dirty set follow as usual.
+        # fields: the ones to update on existing accounts (default all); new accounts
+        # are taken whole.
+        fields = AccountTable.FIELDS[1:] if fields is None else [f for f in fields if f != "account_number"]
+        with self.locks.exclusive(), self._flush_lock:
+            table = self.accounts
+            cold = set(self.cold.account_numbers()) if self.cold is not None else ()
+            for acc in accounts.values():
+                no = acc.account_number
+                row = table.row_of(no)
+                if row is None and no in cold:
+                    # rehydrate first, so the columns the file lacks keep their cold values;
+                    # the cold row goes with the save below
+                    cold_acc = self.cold.get(no)
+                    table.adopt(cold_acc)
+                    self._rehydrated.add(no)
+                    if cold_acc.status != "Active":
+                        # archived again at the next checkpoint unless the merge reopens it
+                        self._rearchive.add(no)
+                    row = table.row_of(no)
+                if row is None:
+                    table.adopt(acc)
+                    continue
+                for field in fields:
+                    value = getattr(acc, field)
+                    if table.value(row, field) != value:
+                        table.set_value(row, field, value)
+                self._removed.discard(no)
+            if self._rehydrated:
+                # saved now: an account must not sit in both tiers where the counts see it
+                self.save_to_disk()
+
+    def _storage_stamp(self):
+        # (mtime, size) of every file load() reads
+        paths = self.store.paths() if self.store else (file_manager.ACCOUNT_FILE,)
+        stamp = []
+        for path in paths:
+            try:
+                st = os.stat(path)
+                stamp.append((st.st_mtime_ns, st.st_size))
+            except OSError:
+                stamp.append(None)
+        return tuple(stamp)
+
+    def refresh_if_changed(self):
+        # Reload the accounts when another process (the CLI, another app instance) has
+        # written storage since our last load or save. Our own unsaved changes are
+        # merged on top (see _merge_row), so neither side's changes are lost. Returns True on reload.
+        if self._storage_stamp() == self._loaded_stamp:
+            return False
+        with self.locks.exclusive(), self._flush_lock:
+            stamp = self._storage_stamp()
+            if stamp == self._loaded_stamp:
+                return False
+            fresh = self._load_accounts()
+            for no in self._dirty:
+                acc = self.accounts.get(no)
+                if acc is not None:
+                    fresh[no] = self._merge_row(acc, fresh.get(no))
+            # bases of accounts we have not changed describe the old files
+            self._base = {no: base for no, base in self._base.items() if no in self._dirty}
+            self.refresh_stats["reloads"] += 1
+            for no in self._removed:
+                fresh.pop(no, None)
+            fresh.tracker = self._dirty
+            self.accounts = fresh
+            self._attach_indexes()
+            if fresh:
+                self.next_account_number = max(self.next_account_number, max(fresh.keys()) + 1)
+            self._loaded_stamp = stamp
+            # their transactions count towards today's limits too
+            self._load_daily_totals()
+        return True
+
+    @staticmethod
+    def _fields(acc):
+        return tuple(getattr(acc, field) for field in AccountTable.FIELDS)
+
+    def _remember_base(self, acc):
+        # the stored state an operation starts from, recorded before its first change
+        no = acc.account_number
+        if no not in self._dirty and no not in self._base:
+            self._base[no] = self._fields(acc)
+
+    def _merge_row(self, ours, theirs):
+        # Three-way merge of one of our unsaved accounts with the row another process saved,
+        # against the row our change started from. Fields only one side changed take that
+        # side's value; when both moved the balance, both deltas apply (deposits and
+        # withdrawals commute). Any other field both changed keeps the saved value, which
+        # is counted in refresh_stats["conflicting_fields"].
+        base = self._base.get(ours.account_number)
+        if theirs is None or base is None:
+            return ours
+        theirs = self._fields(theirs)
+        if theirs == base:
+            return ours
+        mine = self._fields(ours)
+        merged = list(theirs)
+        for i, field in enumerate(AccountTable.FIELDS):
+            if mine[i] == base[i] or mine[i] == theirs[i]:
+                continue
+            if theirs[i] == base[i]:
+                merged[i] = mine[i]
+            elif field == "balance":
+                merged[i] = round(theirs[i] + (mine[i] - base[i]), 2)
+            else:
+                self.refresh_stats["conflicting_fields"] += 1
+        self.refresh_stats["merged_rows"] += 1
+        # the saved row is what later changes of this account build on
+        self._base[ours.account_number] = theirs
+        return Account(*merged)
+
+    def _load_accounts(self):
+        if self.lazy:
+            return self.store.load_lazy(self.cache_size)
+        return self.store.load() if self.store else load_accounts()
+
+    def _attach_indexes(self):
+        if self.lazy:
+            # no account columns in memory to index: the same queries, answered by scans
+            self.order_indexes = {
+                column: ScanOrderIndex(self.accounts, column) for column in ("balance", "age", "account_number")
+            }
+            self.name_index = ScanNameIndex(self.accounts)
+            self.status_index = ScanStatusPartitions(self.accounts)
+            return
+        # secondary indexes follow every change to self.accounts through table listeners;
+        # each is built on its first query, so startup (and a reload) only loads the accounts
+        self.order_indexes = {
+            column: LazyIndex(self.accounts, lambda table, column=column: OrderIndex(table, column))
+            for column in ("balance", "age", "account_number")
+        }
+        self.name_index = LazyIndex(self.accounts, NameIndex)
+        self.status_index = LazyIndex(self.accounts, StatusPartitions)
+
     def save_to_disk(self):
-        #save all accounts to persistent storage(CSV files)
-        save_accounts(self.accounts)
+        # persist only the accounts modified since the last flush. The bank-wide gate
+        # (locks.quiesced) lets in-flight operations finish and holds new ones back, so no
+        # transfer or batch is saved half applied; lock order is gate, _flush_lock, table
+        # lock. A save from inside an operation (a lookup rehydrating a cold account) runs
+        # under that operation's locks; transfers write both legs under the table lock.
+        if not self.locks.busy():
+            # a full CSV rewrite must not drop rows another process saved meanwhile
+            self.refresh_if_changed()
+        with self.locks.quiesced():
+            return self._save()
+
+    def _save(self):
+        # the rollup totals buffered since the last save go with it
+        self.rollups.flush()
+        with self._flush_lock, self.accounts.lock:
+            self.flush_policy.flushed()
+            if self._to_archive:
+                self._archive(
+                    no for no in self._to_archive
+                    if no in self.accounts and self.accounts[no].status != "Active"
+                )
+                self._to_archive.clear()
+            if not self._dirty and not self._removed:
+                if self._rehydrated:
+                    # the hot store is current; their cold copies (or a replaced cold tier) can go
+                    self.cold.delete(self._rehydrated)
+                    self._rehydrated.clear()
+                self.flush_stats["last_flush_rows"] = 0
+                return 0
+            changed = list(self._dirty)
+            removed = list(self._removed)
+            self._dirty.difference_update(changed)
+            self._removed.difference_update(removed)
+            for no in changed + removed:
+                # stored now: the next change starts from this state
+                self._base.pop(no, None)
+            if self.store:
+                rows = self.store.save(self.accounts, changed, removed)
+                if self.lazy:
+                    # point the index at the rows just written
+                    self.accounts.sync()
+            else:
+                # a CSV file cannot be patched in place, so it is still rewritten in full
+                save_accounts(self.accounts)
+                rows = len(self.accounts)
+            if self._rehydrated:
+                # the hot store has them now; the cold copies can go
+                self.cold.delete(self._rehydrated)
+                self._rehydrated.clear()
+            self._loaded_stamp = self._storage_stamp()
+            self.flush_stats["flushes"] += 1
+            self.flush_stats["rows_written"] += rows
+            self.flush_stats["last_flush_rows"] = rows
+            return rows
+
+    def checkpoint(self):
+        # fold the journal into a fresh accounts.csv snapshot (plain save in csv mode)
+        if not self.locks.busy():
+            self.refresh_if_changed()
+        with self.locks.quiesced():
+            if self._rearchive:
+                with self._flush_lock:
+                    # only looked up since they were rehydrated: back to the cold tier
+                    self._to_archive.update(self._rearchive)
+                    self._rearchive.clear()
+            self.save_to_disk()
+            if self.store:
+                with self._flush_lock, self.accounts.lock:
+                    self.store.checkpoint(self.accounts)
+                    if self.lazy:
+                        self.accounts.sync()
+                    self._loaded_stamp = self._storage_stamp()
+            else:
+                self._save_snapshot()
+
+    def _save_snapshot(self):
+        # csv mode: the binary copy of accounts.csv is written here (checkpoint, close), not
+        # on every save, and only while the CSV on disk is the one this process last wrote
+        if self.store or not file_manager.ACCOUNT_SNAPSHOT_ENABLED:
+            return
+        with self._flush_lock, self.accounts.lock:
+            if not self._dirty and not self._removed and self._storage_stamp() == self._loaded_stamp:
+                file_manager.save_account_snapshot(self.accounts, file_manager.ACCOUNT_FILE)
+
+    # -------- Cold tier --------
+    def _archive(self, account_numbers):
+        # Copy accounts into the cold store, then drop them from the hot table. The cold
+        # write commits first: a crash in between leaves a copy in both tiers, never none,
+        # and the hot copy wins on lookup. Caller holds _flush_lock (or the whole bank).
+        accounts = [self.accounts[no] for no in account_numbers]
+        if not accounts:
+            return 0
+        self.cold.put(accounts)
+        for acc in accounts:
+            no = acc.account_number
+            self.accounts.pop(no)
+            self._dirty.discard(no)
+            self._rehydrated.discard(no)
+            self._rearchive.discard(no)
+            self._removed.add(no)
+        return len(accounts)
+
+    def _archive_later(self, account_number):
+        # closed accounts leave the hot table at the next flush (if still closed then)
+        if self.cold is not None:
+            self._to_archive.add(int(account_number))
+
+    def _rehydrate(self, account_number):
+        # Move a cold account back into the hot table. It is saved to the hot store at once,
+        # and that save drops the cold row, so the account is never in both tiers as far
+        # as the counts (which read both under the table lock) can see.
+        with self.locks.hold(account_number), self._flush_lock, self.accounts.lock:
+            acc = self.accounts.get(account_number)
+            if acc is not None:
+                return acc
+            acc = self.cold.get(account_number)
+            if acc is None:
+                return None
+            self.accounts[account_number] = acc
+            self._removed.discard(account_number)
+            self._rehydrated.add(account_number)
+            if acc.status != "Active":
+                self._rearchive.add(account_number)
+            self.save_to_disk()
+            return self.accounts.get(account_number)
+
+    def archive_dormant(self, days=None):
+        # Archive every account without a transaction in `days` days (default DORMANT_AFTER_DAYS),
+        # judged by the daily rollups, or by the opening date for accounts that never had one.
+        # Returns how many accounts moved to the cold tier.
+        if self.cold is None:
+            raise ValueError("Tiering is off; create the BankingService with tiering=True")
+        days = BankingService.DORMANT_AFTER_DAYS if days is None else int(days)
+        cutoff = (datetime.date.today() - datetime.timedelta(days=days)).isoformat()
+        last_active = self.rollups.last_active()
+        with self.locks.exclusive(), self._flush_lock:
+            dormant = []
+            for no, acc in self.accounts.items():
+                day = last_active.get(no) or (acc.timestamp or "")[:10]
+                if day and day < cutoff:
+                    dormant.append(no)
+            with self.accounts.lock:
+                moved = self._archive(dormant)
+            self.save_to_disk()
+        return moved
     
     @autosave
     def create_account(self, name,age, account_type, intial_deposit=0,timestamp=None):
@@ -48,42 +505,57 @@ class BankingService:
         if float(intial_deposit) < min_req:
             return None, f"Intial deposit must be at least {min_req}"
        
-        acc_no = self.next_account_number
+        acc_no = self._allocate_account_number()
         acc = Account(acc_no, name,age, account_type, balance=float(intial_deposit),timestamp=timestamp)
-        self.accounts[acc_no] = acc
-        
-        self.next_account_number += 1
-
-
-        log_transaction(acc_no, "CREATE", intial_deposit, acc.balance)
+        with self.locks.hold(acc_no):
+            # storing it in the table marks it dirty
+            self.accounts[acc_no] = acc
+            self._log(acc_no, "CREATE", intial_deposit, acc.balance)
         
         return acc, "Account created succesfully"
+
+    def _allocate_account_number(self):
+        # atomic: concurrent create_account calls never share a number
+        with self._number_lock:
+            acc_no = self.next_account_number
+            self.next_account_number += 1
+            return acc_no
    
 
     def get_account(self, account_number):
-        return self.accounts.get(int(account_number))
+        acc = self.accounts.get(int(account_number))
+        if acc is None and self.cold is not None:
+            # transparent for every caller: reopen, admin lookups, operations
+            acc = self._rehydrate(int(account_number))
+        if acc is not None and self.locks.busy():
+            # looked up by an operation that may change it
+            self._remember_base(acc)
+        if self.lazy and not self.locks.busy():
+            # a lookup outside any operation (balance enquiry, PIN check) can trim the cache too
+            self._trim_cache()
+        return acc
    
     @autosave
     def deposit(self, account_number, amount):
-        acc = self.get_account(account_number)
-        if not acc:
-            raise AccountNotFoundError(f"Account {account_number} not found.")
-        if acc.status != "Active":
-            raise InactiveAccountError(f"Account {account_number} is not active.")
-        # Daily limit check for deposits
-        today_total = self._get_today_total(acc.account_number, "DEPOSIT")
-        try:
-            amt_f = float(amount)
-        except (TypeError, ValueError):
-            amt_f = 0.0
-        if today_total + amt_f > BankingService.DAILY_DEPOSIT_LIMIT:
-            return False, f"Daily deposit limit exceeded. Limit: {BankingService.DAILY_DEPOSIT_LIMIT}"
-        ok, msg = acc.deposit(amount)
-        if ok:
-            log_transaction(acc.account_number, "DEPOSIT", amount, acc.balance)
-            self.save_to_disk()
+        with self.locks.hold(account_number):
+            acc = self.get_account(account_number)
+            if not acc:
+                raise AccountNotFoundError(f"Account {account_number} not found.")
+            if acc.status != "Active":
+                raise InactiveAccountError(f"Account {account_number} is not active.")
+            # Daily limit check for deposits
+            today_total = self._get_today_total(acc.account_number, "DEPOSIT")
+            try:
+                amt_f = float(amount)
+            except (TypeError, ValueError):
+                amt_f = 0.0
+            if today_total + amt_f > BankingService.DAILY_DEPOSIT_LIMIT:
+                return False, f"Daily deposit limit exceeded. Limit: {BankingService.DAILY_DEPOSIT_LIMIT}"
+            ok, msg = acc.deposit(amount)
+            if ok:
+                self._log(acc.account_number, "DEPOSIT", amount, acc.balance)
     
-        return ok, msg
+            return ok, msg
 
     @autosave
     def credit_loan_disbursal(self, account_number, amount):
@@ -91,61 +563,62 @@ class BankingService:
 
         Logs as LOAN_CREDIT.
         """
-        acc = self.get_account(account_number)
-        if not acc:
-            raise AccountNotFoundError(f"Account {account_number} not found.")
-        if acc.status != "Active":
-            raise InactiveAccountError(f"Account {account_number} is not active.")
-        try:
-            amt_f = float(amount)
-        except (TypeError, ValueError):
-            amt_f = 0.0
-        if amt_f <= 0:
-            return False, "Invalid amount."
-        acc.balance += amt_f
-        log_transaction(acc.account_number, "LOAN_CREDIT", amt_f, acc.balance)
-        self.save_to_disk()
-        return True, f"Loan amount credited. New Balance: {acc.balance:.2f}"
+        with self.locks.hold(account_number):
+            acc = self.get_account(account_number)
+            if not acc:
+                raise AccountNotFoundError(f"Account {account_number} not found.")
+            if acc.status != "Active":
+                raise InactiveAccountError(f"Account {account_number} is not active.")
+            try:
+                amt_f = float(amount)
+            except (TypeError, ValueError):
+                amt_f = 0.0
+            if amt_f <= 0:
+                return False, "Invalid amount."
+            acc.balance += amt_f
+            self._log(acc.account_number, "LOAN_CREDIT", amt_f, acc.balance)
+            return True, f"Loan amount credited. New Balance: {acc.balance:.2f}"
     @autosave
     def withdraw(self, account_number, amount):
-        acc = self.get_account(account_number)
-        if not acc:
-            raise AccountNotFoundError(f"Account {account_number} not found.")
-        if acc.status != "Active":
-            raise InactiveAccountError(f"Account {account_number} is not active.")
-        # Daily limit check for withdrawals
-        today_total = self._get_today_total(acc.account_number, "WITHDRAW")
-        try:
-            amt_f = float(amount)
-        except (TypeError, ValueError):
-            amt_f = 0.0
-        if today_total + amt_f > BankingService.DAILY_WITHDRAW_LIMIT:
-            return False, f"Daily withdrawal limit exceeded. Limit: {BankingService.DAILY_WITHDRAW_LIMIT}"
+        with self.locks.hold(account_number):
+            acc = self.get_account(account_number)
+            if not acc:
+                raise AccountNotFoundError(f"Account {account_number} not found.")
+            if acc.status != "Active":
+                raise InactiveAccountError(f"Account {account_number} is not active.")
+            # Daily limit check for withdrawals
+            today_total = self._get_today_total(acc.account_number, "WITHDRAW")
+            try:
+                amt_f = float(amount)
+            except (TypeError, ValueError):
+                amt_f = 0.0
+            if today_total + amt_f > BankingService.DAILY_WITHDRAW_LIMIT:
+                return False, f"Daily withdrawal limit exceeded. Limit: {BankingService.DAILY_WITHDRAW_LIMIT}"
        
-        ok, msg = acc.withdraw(amount)
-        if ok:
-            log_transaction(acc.account_number, "WITHDRAW", amount, acc.balance)
-            self.save_to_disk()
-        return ok, msg
+            ok, msg = acc.withdraw(amount)
+            if ok:
+                self._log(acc.account_number, "WITHDRAW", amount, acc.balance)
+            return ok, msg
     @autosave
     def terminate_account(self, account_number):
-        acc = self.get_account(account_number)
-        if not acc:
-            raise AccountNotFoundError(f"Account {account_number} not found.")
-        if acc.status != "Active":
-            raise InactiveAccountError(account_number)
+        with self.locks.hold(account_number):
+            acc = self.get_account(account_number)
+            if not acc:
+                raise AccountNotFoundError(f"Account {account_number} not found.")
+            if acc.status != "Active":
+                raise InactiveAccountError(account_number)
 
-        # Force withdraw everything without min balance check so no need to have min balance check
-        if acc.balance > 0:
-            withdrawn_amount = acc.balance
-            acc.balance = 0
-            log_transaction(acc.account_number, "WITHDRAW_FULL", None, withdrawn_amount)
+            # Force withdraw everything without min balance check so no need to have min balance check
+            if acc.balance > 0:
+                withdrawn_amount = acc.balance
+                acc.balance = 0
+                self._log(acc.account_number, "WITHDRAW_FULL", None, withdrawn_amount)
 
-        # close account
-        acc.status = "Inactive"
-        log_transaction(acc.account_number, "CLOSE", None, 0)
-        self.save_to_disk()
-        return True, "Account closed successfully"
+            # close account
+            acc.status = "Inactive"
+            self._log(acc.account_number, "CLOSE", None, 0)
+            self._archive_later(acc.account_number)
+            return True, "Account closed successfully"
 
         
     
@@ -158,36 +631,39 @@ class BankingService:
     
     @autosave
     def close_account(self, account_number):
-         acc = self.get_account(account_number)
-         if not acc:
-            raise AccountNotFoundError(f"Account {account_number} not found.")
+        with self.locks.hold(account_number):
+             acc = self.get_account(account_number)
+             if not acc:
+                raise AccountNotFoundError(f"Account {account_number} not found.")
          
-         acc.status = "Inactive"
-         log_transaction(acc.account_number, "CLOSE" , None, acc.balance)
-         self.save_to_disk()
-         return True , "Account closed succesfully"
+             acc.status = "Inactive"
+             self._log(acc.account_number, "CLOSE" , None, acc.balance)
+             self._archive_later(acc.account_number)
+             return True , "Account closed succesfully"
 
     # ----- Additional Features -----
+    @autosave
     def upgrade_account_type(self, account_number, new_account_type):
-        acc = self.get_account(account_number)
-        if not acc:
-            raise AccountNotFoundError(f"Account {account_number} not found.")
-        new_type = new_account_type.title()
-        if new_type not in Account.MIN_BALANCE:
-            return False, f"Invalid Account type. Choose from {list(Account.MIN_BALANCE.keys())}"
-        acc.account_type = new_type
-        self.save_to_disk()
-        return True, f"Account {account_number} upgraded to {new_type}"
+        with self.locks.hold(account_number):
+            acc = self.get_account(account_number)
+            if not acc:
+                raise AccountNotFoundError(f"Account {account_number} not found.")
+            new_type = new_account_type.title()
+            if new_type not in Account.MIN_BALANCE:
+                return False, f"Invalid Account type. Choose from {list(Account.MIN_BALANCE.keys())}"
+            acc.account_type = new_type
+            return True, f"Account {account_number} upgraded to {new_type}"
 
     @autosave
     def reopen_account(self, account_number):
-        acc = self.get_account(account_number)
-        if not acc:
-            raise AccountNotFoundError(f"Account {account_number} not found.")
-        if acc.status == "Active":
-            return False, f"Account {account_number} is already active."
-        acc.status = "Active"
-        return True, f"Account {account_number} reopened."
+        with self.locks.hold(account_number):
+            acc = self.get_account(account_number)
+            if not acc:
+                raise AccountNotFoundError(f"Account {account_number} not found.")
+            if acc.status == "Active":
+                return False, f"Account {account_number} is already active."
+            acc.status = "Active"
+            return True, f"Account {account_number} reopened."
 
     def calculate_simple_interest(self, account_number, rate_percent, years):
         acc = self.get_account(account_number)
@@ -203,83 +679,388 @@ class BankingService:
 
     @autosave
     def transfer_funds(self, from_account, to_account, amount):
-        from_acc = self.get_account(from_account)
-        to_acc = self.get_account(to_account)
-        if not from_acc:
-            raise AccountNotFoundError(f"Account {from_account} not found.")
-        if not to_acc:
-            raise AccountNotFoundError(f"Account {to_account} not found.")
-        if from_acc.status != "Active" or to_acc.status != "Active":
-            return False, "Both accounts must be active"
-        # Enforce daily limit on withdrawals from source
-        today_total = self._get_today_total(from_acc.account_number, "WITHDRAW")
-        try:
-            amt_f = float(amount)
-        except (TypeError, ValueError):
-            amt_f = 0.0
-        if today_total + amt_f > BankingService.DAILY_WITHDRAW_LIMIT:
-            return False, f"Daily withdrawal limit exceeded. Limit: {BankingService.DAILY_WITHDRAW_LIMIT}"
-        # Perform withdrawal from source
-        ok, msg = from_acc.withdraw(amount)
-        if not ok:
-            return False, msg
-        # Deposit to destination
-        ok, msg = to_acc.deposit(amount)
-        if not ok:
-            # rollback source if destination deposit fails
-            from_acc.balance += amt_f
-            return False, msg
-        # Log both legs
-        log_transaction(from_acc.account_number, "TRANSFER_OUT", amount, from_acc.balance)
-        log_transaction(to_acc.account_number, "TRANSFER_IN", amount, to_acc.balance)
-        self.save_to_disk()
-        return True, f"Transferred {amount} from {from_acc.account_number} to {to_acc.account_number}"
+        with self.locks.hold(from_account, to_account):
+            from_acc = self.get_account(from_account)
+            to_acc = self.get_account(to_account)
+            if not from_acc:
+                raise AccountNotFoundError(f"Account {from_account} not found.")
+            if not to_acc:
+                raise AccountNotFoundError(f"Account {to_account} not found.")
+            if from_acc.status != "Active" or to_acc.status != "Active":
+                return False, "Both accounts must be active"
+            # Enforce daily limit on withdrawals from source
+            today_total = self._get_today_total(from_acc.account_number, "WITHDRAW")
+            try:
+                amt_f = float(amount)
+            except (TypeError, ValueError):
+                amt_f = 0.0
+            if today_total + amt_f > BankingService.DAILY_WITHDRAW_LIMIT:
+                return False, f"Daily withdrawal limit exceeded. Limit: {BankingService.DAILY_WITHDRAW_LIMIT}"
+            # both legs under the table lock: a save or export never sees just one of them
+            with self.accounts.lock:
+                # Perform withdrawal from source
+                ok, msg = from_acc.withdraw(amount)
+                if not ok:
+                    return False, msg
+                # Deposit to destination
+                ok, msg = to_acc.deposit(amount)
+                if not ok:
+                    # rollback source if destination deposit fails
+                    from_acc.balance += amt_f
+                    return False, msg
+            # Log both legs
+            self._log(from_acc.account_number, "TRANSFER_OUT", amount, from_acc.balance)
+            self._log(to_acc.account_number, "TRANSFER_IN", amount, to_acc.balance)
+            # both legs must be durable before the transfer is reported as done
+            flush_logs()
+            return True, f"Transferred {amount} from {from_acc.account_number} to {to_acc.account_number}"
+
+    BATCH_OPERATIONS = ("deposit", "withdraw", "transfer")
+
+    @autosave
+    def apply_batch(self, operations, atomic=True):
+        # Validate and apply many deposits / withdrawals / transfers in one pass.
+        # Each operation is a dict {"op", "account", "amount"[, "to"]} (csv.DictReader rows work)
+        # or a tuple (op, account, amount[, to]). The same rules as deposit/withdraw/transfer_funds
+        # are checked against running balances and daily totals, so later lines see earlier ones.
+        # atomic=True applies nothing unless every operation is valid; atomic=False applies the
+        # valid ones and reports the rest. Balances are written once per account, the log records
+        # go out as one batch and the accounts are persisted once (by autosave).
+        # Returns (all_applied, results) with one {"index", "ok", "message"} per operation.
+        with self.locks.exclusive():
+            balances = {}      # account number -> running balance
+            pending = {}       # (account number, DEPOSIT/WITHDRAW) -> amount added by this batch
+            records = []       # (account number, operation, amount, balance_after)
+            results = []
+
+            def balance(acc):
+                return balances.get(acc.account_number, acc.balance)
+
+            def daily_total(acc, operation):
+                key = (acc.account_number, operation)
+                return self._get_today_total(acc.account_number, operation) + pending.get(key, 0.0)
+
+            def check_deposit(acc, amount):
+                if amount <= 0:
+                    return "Deposit must be positive"
+                if amount > Account.MAX_SINGLE_DEPOSIT:
+                    return f"Deposit exceeds single-deposit limit {Account.MAX_SINGLE_DEPOSIT}"
+                return None
+
+            def check_withdraw(acc, amount):
+                if amount <= 0:
+                    return "Withdrawal must be positive"
+                if daily_total(acc, "WITHDRAW") + amount > BankingService.DAILY_WITHDRAW_LIMIT:
+                    return f"Daily withdrawal limit exceeded. Limit: {BankingService.DAILY_WITHDRAW_LIMIT}"
+                min_required = Account.MIN_BALANCE[acc.account_type]
+                if round(balance(acc) - amount, 2) < min_required:
+                    return f"Insufficient funds. Minimum required balance for {acc.account_type}: {min_required}"
+                return None
+
+            def apply(op, account, amount, to):
+                # returns an error message, or None after updating the running state
+                if op not in BankingService.BATCH_OPERATIONS:
+                    return f"Unknown operation {op!r}. Use one of {list(BankingService.BATCH_OPERATIONS)}"
+                try:
+                    amount = float(amount)
+                except (TypeError, ValueError):
+                    return "Invalid Amount"
+                try:
+                    acc = self.get_account(account)
+                except (TypeError, ValueError):
+                    acc = None
+                if not acc:
+                    return f"Account {account} not found."
+                if op == "transfer":
+                    try:
+                        to_acc = self.get_account(to)
+                    except (TypeError, ValueError):
+                        to_acc = None
+                    if not to_acc:
+                        return f"Account {to} not found."
+                    if acc.status != "Active" or to_acc.status != "Active":
+                        return "Both accounts must be active"
+                    error = check_withdraw(acc, amount) or check_deposit(to_acc, amount)
+                    if error:
+                        return error
+                    balances[acc.account_number] = balance(acc) - amount
+                    records.append((acc.account_number, "TRANSFER_OUT", amount, balances[acc.account_number]))
+                    balances[to_acc.account_number] = balance(to_acc) + amount
+                    records.append((to_acc.account_number, "TRANSFER_IN", amount, balances[to_acc.account_number]))
+                    return None
+                if acc.status != "Active":
+                    return f"Account {account} is not active."
+                if op == "deposit":
+                    operation, limit = "DEPOSIT", BankingService.DAILY_DEPOSIT_LIMIT
+                    if daily_total(acc, operation) + amount > limit:
+                        return f"Daily deposit limit exceeded. Limit: {limit}"
+                    error = check_deposit(acc, amount)
+                    new_balance = balance(acc) + amount
+                else:
+                    operation = "WITHDRAW"
+                    error = check_withdraw(acc, amount)
+                    new_balance = balance(acc) - amount
+                if error:
+                    return error
+                balances[acc.account_number] = new_balance
+                key = (acc.account_number, operation)
+                pending[key] = pending.get(key, 0.0) + amount
+                records.append((acc.account_number, operation, amount, new_balance))
+                return None
+
+            for index, item in enumerate(operations):
+                if isinstance(item, dict):
+                    op, account, amount, to = item.get("op"), item.get("account"), item.get("amount"), item.get("to")
+                else:
+                    op, account, amount, to = (tuple(item) + (None,))[:4]
+                op = str(op).strip().lower()
+                error = apply(op, account, amount, to)
+                if error:
+                    results.append({"index": index, "ok": False, "message": error})
+                else:
+                    results.append({"index": index, "ok": True, "message": f"{op.title()} applied"})
+
+            failed = sum(1 for r in results if not r["ok"])
+            if atomic and failed:
+                for r in results:
+                    if r["ok"]:
+                        r["ok"] = False
+                        r["message"] = f"Not applied: {failed} operation(s) in the batch failed"
+                return False, results
+
+            for acc_no, new_balance in balances.items():
+                self.accounts[acc_no].balance = new_balance
+            log_transactions(records)
+            for acc_no, operation, amount, _ in records:
+                self.daily_totals.add(acc_no, operation, amount)
+            self.rollups.add_many((acc_no, operation, amount) for acc_no, operation, amount, _ in records)
+            # every record must be durable before the batch is reported as done
+            flush_logs()
+            return failed == 0, results
 
     def transaction_history(self, account_number):
         try:
             acc_no_int = int(account_number)
         except ValueError:
             raise AccountNotFoundError(account_number)
-        try:
-            with open(USER_TRANSACTIONS_FILE, "r") as f:
-                lines = f.readlines()
-        except FileNotFoundError:
-            return "No transactions found."
-        history = [line.strip() for line in lines if f"| {acc_no_int} |" in line]
+        history = read_account_transactions(acc_no_int)
         if not history:
             return "No transactions found."
         return "\n".join(history)
 
-    def average_balance(self):
-        if not self.accounts:
-            return 0.0
-        total = sum(acc.balance for acc in self.accounts.values())
-        return round(total / len(self.accounts), 2)
+    def transaction_history_page(self, account_number, page=0, page_size=20):
+        # newest-first page of an account's log lines, read through the offset index
+        try:
+            acc_no_int = int(account_number)
+        except ValueError:
+            raise AccountNotFoundError(account_number)
+        return read_account_transactions(acc_no_int, newest_first=True, offset=int(page) * int(page_size), limit=int(page_size))
+
+    # -------- Admin statistics (vectorized over the account columns) --------
+    # include_cold=False leaves out the cold tier (see tiering); accounts_page merges it in,
+    # while rankings, top-N and name search only ever cover the hot accounts
+    def average_balance(self, status=None, account_type=None, include_cold=True):
+        return self.account_summary(status, account_type, include_cold=include_cold, extremes=False)["average_balance"]
+
+    def account_summary(self, status=None, account_type=None, by_type=False, include_cold=True, extremes=True):
+        # e.g. account_summary(status="Active", account_type="Savings")
+        # extremes=False leaves out min / max balance and age: in lazy mode the rest comes
+        # from running totals, while the extremes cost a scan of every account
+        cold = self.cold if include_cold else None
+        # both tiers under the table lock, so a rehydration cannot be counted twice
+        with self.accounts.lock:
+            if by_type:
+                found = aggregates.summary_by_type(self.accounts, status, extremes)
+            else:
+                found = aggregates.summary(self.accounts, status, account_type, extremes)
+            if cold is None:
+                return found
+            if not by_type:
+                return aggregates.merge_summaries(found, cold.summary(status, account_type))
+            for t in cold.account_types():
+                cold_summary = cold.summary(status, t)
+                found[t] = aggregates.merge_summaries(found[t], cold_summary) if t in found else cold_summary
+            return found
+
+    def count_accounts(self, status=None, account_type=None, exclude_status=None, include_cold=True):
+        # O(1): read from the status partitions (plus one SQL count for the cold tier)
+        with self.accounts.lock:
+            found = self.status_index.count(status, account_type, exclude_status)
+            if include_cold and self.cold is not None:
+                found += self.cold.count(status, account_type, exclude_status)
+            return found
+
+    def accounts_with_status(self, status=None, exclude_status=None, include_cold=True):
+        # e.g. accounts_with_status("Active"), or accounts_with_status(exclude_status="Active") for closed ones
+        # cold accounts are listed after the hot ones and are not rehydrated
+        with self.accounts.lock:
+            found = [self.accounts.view(row) for row in self.status_index.rows(status, exclude_status)]
+            if include_cold and self.cold is not None:
+                found.extend(self.cold.accounts(status, exclude_status))
+            return found
+
+    def _extremes(self, column, n, largest, status=None, account_type=None):
+        with self.accounts.lock:
+            if status is None and account_type is None:
+                # unfiltered: read the ends of the sorted index
+                index = self.order_indexes[column]
+                rows = index.largest(n) if largest else index.smallest(n)
+            else:
+                rows = aggregates.extreme_rows(self.accounts, column, n, largest, status, account_type)
+            return [self.accounts.view(row) for row in rows]
+
+    def find_accounts_by_name(self, query, match="any", status=None, limit=None):
+        # match: "exact", "prefix", "fuzzy" (typo tolerant) or "any" (all three, best first)
+        with self.accounts.lock:
+            lookups = {
+                "exact": self.name_index.exact,
+                "prefix": self.name_index.prefix,
+                "fuzzy": self.name_index.fuzzy,
+                "any": self.name_index.search,
+            }
+            if match not in lookups:
+                raise ValueError(f"Invalid match: {match}. Choose from {list(lookups)}")
+            found = []
+            for row in lookups[match](query):
+                acc = self.accounts.view(row)
+                if status is None or acc.status == status:
+                    found.append(acc)
+                    if limit is not None and len(found) >= limit:
+                        break
+            return found
+
+    def accounts_page(self, cursor=None, page_size=50, order_by="account_number", descending=False,
+                      status=None, exclude_status=None, include_cold=True):
+        # one page of accounts in index order; pass the returned cursor back for the next page
+        # (next_cursor is None once the listing is exhausted)
+        if order_by not in self.order_indexes:
+            raise ValueError(f"Invalid order: {order_by}. Choose from {list(self.order_indexes)}")
+        page_size = int(page_size)
+        if not include_cold or self.cold is None:
+            found, cursor = self._hot_page(cursor, page_size, order_by, descending, status, exclude_status)
+            return [acc for _, acc in found], cursor
+        # tiered: merge a hot page and a cold page by the ordering value (hot first on ties).
+        # The cursor keeps a position per tier, "end" once a tier is used up.
+        cursor = cursor or {"hot": None, "cold": None}
+        hot, cold = [], []
+        hot_next = cold_next = "end"
+        if cursor["hot"] != "end":
+            hot, hot_next = self._hot_page(cursor["hot"], page_size, order_by, descending, status, exclude_status)
+            hot_next = "end" if hot_next is None else list(hot_next)
+        if cursor["cold"] != "end":
+            with self.accounts.lock:
+                cold = self.cold.page(order_by, cursor["cold"], page_size, descending, status, exclude_status)
+            if len(cold) == page_size:
+                cold_next = cold[-1][0]
+        sign = -1 if descending else 1
+        merged = sorted(
+            [(sign * key[0], 0, i) for i, (key, _) in enumerate(hot)]
+            + [(sign * key[0], 1, i) for i, (key, _) in enumerate(cold)]
+        )[:page_size]
+        used = {0: -1, 1: -1}
+        for _, tier, i in merged:
+            used[tier] = i
+        next_cursor = {
+            "hot": self._tier_cursor(hot, used[0], cursor["hot"], hot_next),
+            "cold": self._tier_cursor(cold, used[1], cursor["cold"], cold_next),
+        }
+        found = [(hot if tier == 0 else cold)[i][1] for _, tier, i in merged]
+        if next_cursor["hot"] == "end" and next_cursor["cold"] == "end":
+            return found, None
+        return found, next_cursor
+
+    @staticmethod
+    def _tier_cursor(page, last_used, cursor, page_end):
+        # position after the last account of `page` that went out; `page_end` if all did
+        if last_used == len(page) - 1:
+            return page_end
+        if last_used < 0:
+            return cursor
+        return list(page[last_used][0])
+
+    def _hot_page(self, cursor, page_size, order_by, descending, status, exclude_status):
+        # ([(index key, account)], next_cursor) of the hot table
+        index = self.order_indexes[order_by]
+        if cursor is not None:
+            # cursors that went through JSON come back as lists
+            cursor = tuple(cursor)
+        found = []
+        while len(found) < page_size:
+            with self.accounts.lock:
+                keys = index.page(cursor, page_size, descending)
+            if not keys:
+                return found, None
+            for key in keys:
+                cursor = key
+                acc = self.accounts.view(key[1])
+                if status is not None and acc.status != status:
+                    continue
+                if exclude_status is not None and acc.status == exclude_status:
+                    continue
+                found.append((key, acc))
+                if len(found) == page_size:
+                    break
+        return found, cursor
+
+    def iter_accounts(self, order_by="account_number", descending=False, status=None, exclude_status=None,
+                      page_size=500, include_cold=True):
+        # lazily yield every matching account, a page at a time
+        cursor = None
+        while True:
+            page, cursor = self.accounts_page(
+                cursor, page_size, order_by, descending, status, exclude_status, include_cold
+            )
+            yield from page
+            if cursor is None:
+                return
+
+    def balance_rank(self, account_number):
+        # where an account's balance stands among all accounts
+        acc = self.get_account(account_number)
+        if not acc:
+            raise AccountNotFoundError(f"Account {account_number} not found.")
+        with self.accounts.lock:
+            index = self.order_indexes["balance"]
+            return {
+                "rank": index.rank(acc.balance),
+                "of": len(index),
+                "percentile": index.percentile(acc.balance),
+            }
+
+    def accounts_with_balance_between(self, low, high, limit=None):
+        with self.accounts.lock:
+            rows = self.order_indexes["balance"].between(float(low), float(high), limit)
+            return [self.accounts.view(row) for row in rows]
 
     def youngest_account_holder(self):
-        if not self.accounts:
-            return None
-        return min(self.accounts.values(), key=lambda a: a.age)
+        found = self._extremes("age", 1, False)
+        return found[0] if found else None
 
     def oldest_account_holder(self):
-        if not self.accounts:
-            return None
-        return max(self.accounts.values(), key=lambda a: a.age)
+        found = self._extremes("age", 1, True)
+        return found[0] if found else None
 
-    def top_n_accounts_by_balance(self, n):
+    def youngest_account_holders(self, n, status=None, account_type=None):
+        return self._extremes("age", n, False, status, account_type)
+
+    def oldest_account_holders(self, n, status=None, account_type=None):
+        return self._extremes("age", n, True, status, account_type)
+
+    def top_n_accounts_by_balance(self, n, status=None, account_type=None):
         try:
             n_int = int(n)
         except (TypeError, ValueError):
             return []
-        return sorted(self.accounts.values(), key=lambda a: a.balance, reverse=True)[:n_int]
+        return self._extremes("balance", n_int, True, status, account_type)
 
+    @autosave
     def set_pin(self, account_number, pin):
-        acc = self.get_account(account_number)
-        if not acc:
-            raise AccountNotFoundError(f"Account {account_number} not found.")
-        acc.pin = str(pin)
-        self.save_to_disk()
-        return True, "PIN set successfully"
+        with self.locks.hold(account_number):
+            acc = self.get_account(account_number)
+            if not acc:
+                raise AccountNotFoundError(f"Account {account_number} not found.")
+            acc.pin = str(pin)
+            return True, "PIN set successfully"
 
     def verify_pin(self, account_number, pin):
         acc = self.get_account(account_number)
@@ -288,44 +1069,34 @@ class BankingService:
         return str(acc.pin) == str(pin)
 
     # ----- Helpers -----
+    def _log(self, account_number, operation, amount, balance_after):
+        log_transaction(account_number, operation, amount, balance_after)
+        self.daily_totals.add(account_number, operation, amount)
+        self.rollups.add(account_number, operation, amount)
+
     def _get_today_total(self, account_number, operation):
-        from datetime import datetime as dt
-        today_prefix = dt.now().strftime("%Y-%m-%d")
-        try:
-            with open(USER_TRANSACTIONS_FILE, "r") as f:
-                lines = f.readlines()
-        except FileNotFoundError:
-            return 0.0
-        total = 0.0
-        for line in lines:
-            if not line.startswith(today_prefix):
-                continue
-            parts = [p.strip() for p in line.split("|")]
-            if len(parts) < 5:
-                continue
-            try:
-                acc_no = int(parts[1])
-            except ValueError:
-                continue
-            op = parts[2]
-            amt_str = parts[3]
-            if acc_no == int(account_number) and op == operation:
-                try:
-                    amt = float(amt_str) if amt_str != "None" else 0.0
-                except ValueError:
-                    amt = 0.0
-                total += amt
-        return total
+        return self.daily_totals.get(account_number, operation)
+
+    def remaining_daily_limits(self, account_number):
+        # what the account can still deposit / withdraw today
+        return {
+            "deposit": BankingService.DAILY_DEPOSIT_LIMIT - self._get_today_total(account_number, "DEPOSIT"),
+            "withdraw": BankingService.DAILY_WITHDRAW_LIMIT - self._get_today_total(account_number, "WITHDRAW"),
+        }
     @autosave
-    def account_rename(self, account_number):
+    def account_rename(self, account_number, new_name=None):
          acc = self.get_account(account_number)
          if not acc:
             raise AccountNotFoundError(f"Account {account_number} not found.")
-         new_name = input("Enter new name: ").strip()
+         if new_name is None:
+            # prompt before taking the account's lock
+            new_name = input("Enter new name: ")
+         new_name = new_name.strip()
          if not new_name:
             return False, "Name cannot be empty"
-         acc.name = new_name
-         self.save_to_disk()
+         with self.locks.hold(account_number):
+            self._remember_base(acc)
+            acc.name = new_name
          return True , f"Account renamed successfully to {new_name}"
 class AgeRestrictionError(Exception):
     def __init__(self, age, message="Age must be 18 or above to create an account"):
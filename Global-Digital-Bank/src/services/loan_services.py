@@ -1,11 +1,47 @@
 import csv
+import functools
 import os
+import threading
 from typing import Dict, Optional, Tuple
 
+from src.utils import snapshot
 
 BASE_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "data")
 LOANS_FILE = os.path.join(BASE_DATA_DIR, "loans.csv")
 APPLICATIONS_FILE = os.path.join(BASE_DATA_DIR, "loan_applications.csv")
+# field -> array typecode ("s" for text) in the binary snapshots next to the CSVs
+LOAN_COLUMNS = {"account_number": "q", "name": "s", "principal": "d", "pending": "d", "years": "q", "rate": "d", "status": "s"}
+APPLICATION_COLUMNS = {"account_number": "q", "name": "s", "principal": "d", "years": "q", "requested_at": "s"}
+
+
+def _read_snapshot(path: str, kind: str, fields: Dict[str, str]) -> Optional[Dict[int, Dict]]:
+    loaded = snapshot.read(snapshot.snapshot_path(path), kind, source=path)
+    if loaded is None:
+        return None
+    columns, _ = loaded
+    names = list(fields)
+    rows = (dict(zip(names, values)) for values in zip(*(columns[name] for name in names)))
+    return {row["account_number"]: row for row in rows}
+
+
+def _write_snapshot(path: str, kind: str, fields: Dict[str, str], records) -> None:
+    # records are the rows just written to `path`, in the types of `fields`
+    records = list(records)
+    columns = {name: (typecode, [r[name] for r in records]) for name, typecode in fields.items()}
+    try:
+        snapshot.write(snapshot.snapshot_path(path), kind, columns, source=path)
+    except OSError:
+        pass
+
+
+def _shared(func):
+    # LoanService methods run one at a time, on data that is current with the files
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            self.refresh_if_changed()
+            return func(self, *args, **kwargs)
+    return wrapper
 
 
 class LoanService:
@@ -14,14 +50,50 @@ class LoanService:
     - One active loan per account.
     - Total payable = principal + principal * rate * years
     - EMI = total_payable / (years * 12)
+
+    Pass a SQLiteStore as `store` to keep loans and applications in SQLite;
+    saves then write only the affected row instead of rewriting the CSV.
+
+    One instance can be shared between threads (Streamlit sessions); it
+    reloads by itself when another process has written the loan files.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, store=None) -> None:
+        self.store = store
+        self._lock = threading.RLock()
+        self._loaded_stamp = self._storage_stamp()
         self.loans: Dict[int, Dict] = self._load_loans()
         self.applications: Dict[int, Dict] = self._load_applications()
 
+    def _storage_stamp(self) -> tuple:
+        paths = self.store.paths() if self.store else (LOANS_FILE, APPLICATIONS_FILE)
+        stamp = []
+        for path in paths:
+            try:
+                st = os.stat(path)
+                stamp.append((st.st_mtime_ns, st.st_size))
+            except OSError:
+                stamp.append(None)
+        return tuple(stamp)
+
+    def refresh_if_changed(self) -> bool:
+        """Reload loans and applications if their files changed since our last load or save."""
+        with self._lock:
+            stamp = self._storage_stamp()
+            if stamp == self._loaded_stamp:
+                return False
+            self.loans = self._load_loans()
+            self.applications = self._load_applications()
+            self._loaded_stamp = stamp
+            return True
+
     def _load_loans(self) -> Dict[int, Dict]:
-        loans: Dict[int, Dict] = {}
+        if self.store:
+            return self.store.load_loans()
+        loans = _read_snapshot(LOANS_FILE, "loans", LOAN_COLUMNS)
+        if loans is not None:
+            return loans
+        loans = {}
         try:
             with open(LOANS_FILE, mode="r", newline="") as f:
                 reader = csv.DictReader(f)
@@ -42,11 +114,34 @@ class LoanService:
         except FileNotFoundError:
             # create directory if needed
             os.makedirs(os.path.dirname(LOANS_FILE), exist_ok=True)
+            return loans
+        _write_snapshot(LOANS_FILE, "loans", LOAN_COLUMNS, loans.values())
         return loans
 
-    def _save_loans(self) -> None:
+    def _save_loans(self, account_number: Optional[int] = None) -> None:
+        if self.store:
+            if account_number is None:
+                self.store.save_loans(self.loans.values())
+            else:
+                self.store.save_loans([self.loans[account_number]])
+            self._loaded_stamp = self._storage_stamp()
+            return
+        # rows as _load_loans() would read them back, for the CSV and the snapshot
+        rows = [
+            {
+                "account_number": int(loan["account_number"]),
+                "name": str(loan.get("name", "")).strip(),
+                "principal": float(loan.get("principal", 0.0)),
+                "pending": float(loan.get("pending", 0.0)),
+                "years": int(loan.get("years", 0)),
+                "rate": float(loan.get("rate", 0.0)),
+                "status": str(loan.get("status", "None")).strip() or "None",
+            }
+            for loan in self.loans.values()
+        ]
         os.makedirs(os.path.dirname(LOANS_FILE), exist_ok=True)
-        with open(LOANS_FILE, mode="w", newline="") as f:
+        # temporary file + rename, so readers in other processes never see a partial file
+        with open(LOANS_FILE + ".tmp", mode="w", newline="") as f:
             writer = csv.DictWriter(
                 f,
                 fieldnames=[
@@ -60,21 +155,18 @@ class LoanService:
                 ],
             )
             writer.writeheader()
-            for loan in self.loans.values():
-                writer.writerow(
-                    {
-                        "account_number": loan["account_number"],
-                        "name": loan.get("name", ""),
-                        "principal": loan.get("principal", 0.0),
-                        "pending": loan.get("pending", 0.0),
-                        "years": loan.get("years", 0),
-                        "rate": loan.get("rate", 0.0),
-                        "status": loan.get("status", "None"),
-                    }
-                )
+            writer.writerows(rows)
+        os.replace(LOANS_FILE + ".tmp", LOANS_FILE)
+        _write_snapshot(LOANS_FILE, "loans", LOAN_COLUMNS, rows)
+        self._loaded_stamp = self._storage_stamp()
 
     def _load_applications(self) -> Dict[int, Dict]:
-        apps: Dict[int, Dict] = {}
+        if self.store:
+            return self.store.load_applications()
+        apps = _read_snapshot(APPLICATIONS_FILE, "loan_applications", APPLICATION_COLUMNS)
+        if apps is not None:
+            return apps
+        apps = {}
         try:
             with open(APPLICATIONS_FILE, mode="r", newline="") as f:
                 reader = csv.DictReader(f)
@@ -92,11 +184,32 @@ class LoanService:
                     }
         except FileNotFoundError:
             os.makedirs(os.path.dirname(APPLICATIONS_FILE), exist_ok=True)
+            return apps
+        _write_snapshot(APPLICATIONS_FILE, "loan_applications", APPLICATION_COLUMNS, apps.values())
         return apps
 
-    def _save_applications(self) -> None:
+    def _save_applications(self, account_number: Optional[int] = None) -> None:
+        if self.store:
+            if account_number is None:
+                self.store.save_applications(self.applications.values())
+            elif account_number in self.applications:
+                self.store.save_applications([self.applications[account_number]])
+            else:
+                self.store.delete_application(account_number)
+            self._loaded_stamp = self._storage_stamp()
+            return
+        rows = [
+            {
+                "account_number": int(app["account_number"]),
+                "name": str(app.get("name", "")).strip(),
+                "principal": float(app.get("principal", 0.0)),
+                "years": int(app.get("years", 0)),
+                "requested_at": app.get("requested_at", "") or "",
+            }
+            for app in self.applications.values()
+        ]
         os.makedirs(os.path.dirname(APPLICATIONS_FILE), exist_ok=True)
-        with open(APPLICATIONS_FILE, mode="w", newline="") as f:
+        with open(APPLICATIONS_FILE + ".tmp", mode="w", newline="") as f:
             writer = csv.DictWriter(
                 f,
                 fieldnames=[
@@ -108,16 +221,10 @@ class LoanService:
                 ],
             )
             writer.writeheader()
-            for app in self.applications.values():
-                writer.writerow(
-                    {
-                        "account_number": app["account_number"],
-                        "name": app.get("name", ""),
-                        "principal": app.get("principal", 0.0),
-                        "years": app.get("years", 0),
-                        "requested_at": app.get("requested_at", ""),
-                    }
-                )
+            writer.writerows(rows)
+        os.replace(APPLICATIONS_FILE + ".tmp", APPLICATIONS_FILE)
+        _write_snapshot(APPLICATIONS_FILE, "loan_applications", APPLICATION_COLUMNS, rows)
+        self._loaded_stamp = self._storage_stamp()
 
     @staticmethod
     def get_rate_for_account_type(account_type: str) -> float:
@@ -149,12 +256,14 @@ class LoanService:
             return 0.0
         return round(float(total_payable) / months, 2)
 
+    @_shared
     def get(self, account_number: int) -> Optional[Dict]:
         try:
             return self.loans.get(int(account_number))
         except Exception:
             return None
 
+    @_shared
     def get_active_loans_list(self):
         return [
             (acc, loan.get("name", ""))
@@ -163,6 +272,7 @@ class LoanService:
         ]
 
     # -------- Applications Flow --------
+    @_shared
     def submit_application(self, account, amount: float, years: int) -> tuple:
         try:
             acc_no = int(account.account_number)
@@ -186,13 +296,15 @@ class LoanService:
             "years": int(years),
             "requested_at": dt.now().strftime("%Y-%m-%d %H:%M:%S"),
         }
-        self._save_applications()
+        self._save_applications(acc_no)
         return True, "Loan application submitted.", self.applications[acc_no]
 
+    @_shared
     def list_applications(self):
         # returns list of dicts
         return list(self.applications.values())
 
+    @_shared
     def reject_application(self, account_number: int) -> tuple:
         try:
             acc_no = int(account_number)
@@ -202,9 +314,10 @@ class LoanService:
         if not app:
             return False, "No application found for this account.", None
         del self.applications[acc_no]
-        self._save_applications()
+        self._save_applications(acc_no)
         return True, "Application rejected and removed.", None
 
+    @_shared
     def approve_application(self, account, custom_rate: float) -> tuple:
         try:
             acc_no = int(account.account_number)
@@ -236,13 +349,14 @@ class LoanService:
         # delete application
         if acc_no in self.applications:
             del self.applications[acc_no]
-            self._save_applications()
-        self._save_loans()
+            self._save_applications(acc_no)
+        self._save_loans(acc_no)
         return True, (
             f"Application approved. Loan: ₹{amount_f:,.0f} for {years} years at {rate*100:.1f}%. "
             f"Total payable: ₹{total_payable:,.0f}."
         ), record
 
+    @_shared
     def take_loan(self, account, amount: float, years: int) -> Tuple[bool, str, Optional[Dict]]:
         """Sanction a loan and record it. Does NOT credit funds; caller should deposit principal.
 
@@ -280,13 +394,14 @@ class LoanService:
             "status": "Active",
         }
         self.loans[acc_no] = record
-        self._save_loans()
+        self._save_loans(acc_no)
 
         return True, (
             f"Loan sanctioned: ₹{amount_f:,.0f} for {years} years at {int(rate*100)}%. "
             f"Total payable: ₹{total_payable:,.0f}."
         ), record
 
+    @_shared
     def repay(self, account_number: int, amount: float) -> Tuple[bool, str, float]:
         """Apply repayment to loan. Returns (ok, msg, applied_amount)."""
         loan = self.get(account_number)
@@ -303,12 +418,13 @@ class LoanService:
         if new_pending <= 0:
             loan["pending"] = 0.0
             loan["status"] = "Cleared"
-        self._save_loans()
+        self._save_loans(loan["account_number"])
 
         if loan["status"] == "Cleared":
             return True, "Loan Cleared Successfully.", applied
         return True, f"Repayment applied. Pending: ₹{loan['pending']:,.0f}", applied
 
+    @_shared
     def details(self, account_number: int) -> str:
         loan = self.get(account_number)
         if not loan:
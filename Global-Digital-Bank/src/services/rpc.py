@@ -0,0 +1,156 @@
+# Wire protocol shared by bank_server and bank_client.
+#
+# One JSON object per line over a local socket:
+#   request  {"i": 7, "m": "deposit", "a": [1001, 500.0]}            ("k" holds keyword arguments)
+#   response {"i": 7, "r": [true, "Deposit Successful. ..."]}
+#   error    {"i": 7, "e": {"type": "AccountNotFoundError", "message": "...", "attrs": {...}}}
+# Method names are "<method>" for BankingService, "loan.<method>", "admin.<method>"
+# and "rollups.<method>"; only the names listed below are served.
+# "auth" (argument: the admin key) unlocks the admin methods for the rest of a connection.
+import hmac
+import ipaddress
+import json
+import os
+
+from src.models.account import Account
+from src.services.loan_services import BASE_DATA_DIR
+
+# where the server listens: a Unix socket path, or "host:port" for TCP
+DEFAULT_ADDRESS = os.environ.get("GDB_SERVER_ADDRESS", os.path.join(BASE_DATA_DIR, "bank.sock"))
+# the key the CLI and Streamlit admin logins ask for; admin calls over the socket need it too
+ADMIN_KEY = os.environ.get("GDB_ADMIN_KEY", "admin123")
+AUTH_METHOD = "auth"
+# wrong admin keys a connection may send before auth stops being answered
+MAX_AUTH_FAILURES = 3
+# a TCP address other than loopback is refused unless this is set to 1
+ALLOW_REMOTE = os.environ.get("GDB_SERVER_ALLOW_REMOTE") == "1"
+# wrong PINs per account before verify_pin refuses for PIN_LOCKOUT_SECONDS
+MAX_PIN_FAILURES = 5
+PIN_LOCKOUT_SECONDS = 300
+# longest request / response line (apply_batch payloads can be large)
+MAX_LINE = 64 << 20
+
+# name -> True when the call only reads memory and can run on the event loop;
+# everything else may touch files (logs, saves) or wait on locks and goes to an executor
+BANK_METHODS = {
+    # account lookups take stripe locks and, with lazy loading or tiering, read files
+    # and SQLite (and may save); a save in progress would stall the whole loop
+    "get_account": False,
+    "balance_inquiry": False,
+    "verify_pin": False,
+    "calculate_simple_interest": False,
+    "remaining_daily_limits": True,
+    # index and aggregate reads wait on the table lock, which a save can hold for a while
+    "average_balance": False,
+    "account_summary": False,
+    "count_accounts": False,
+    "accounts_page": False,
+    "find_accounts_by_name": False,
+    "balance_rank": False,
+    "youngest_account_holder": False,
+    "oldest_account_holder": False,
+    "youngest_account_holders": False,
+    "oldest_account_holders": False,
+    "top_n_accounts_by_balance": False,
+    "create_account": False,
+    "deposit": False,
+    "withdraw": False,
+    "transfer_funds": False,
+    "apply_batch": False,
+    "credit_loan_disbursal": False,
+    "terminate_account": False,
+    "close_account": False,
+    "reopen_account": False,
+    "upgrade_account_type": False,
+    "account_rename": False,
+    "set_pin": False,
+    "transaction_history": False,
+    "transaction_history_page": False,
+    "save_to_disk": False,
+}
+LOAN_METHODS = (
+    "get",
+    "get_active_loans_list",
+    "submit_application",
+    "list_applications",
+    "reject_application",
+    "approve_application",
+    "take_loan",
+    "repay",
+    "details",
+)
+ADMIN_METHODS = (
+    "search_account",
+    "search_by_name",
+    "search_by_account_number",
+    "reactivate_account",
+    "force_close_account",
+    "count_active_accounts",
+    "archive_dormant_accounts",
+    "accounts_page",
+    "logs_page",
+    "export_accounts_to_file",
+    "import_accounts_from_file",
+    "delete_all_accounts",
+    "system_exit_with_autosave",
+)
+ROLLUP_METHODS = ("month",)
+NAMESPACES = {"loan": LOAN_METHODS, "admin": ADMIN_METHODS, "rollups": ROLLUP_METHODS}
+
+# fields of an account sent to clients; the PIN stays on the server
+ACCOUNT_FIELDS = ("account_number", "name", "age", "balance", "account_type", "status", "timestamp")
+
+
+def parse_address(address):
+    # ("unix", path) or ("tcp", (host, port))
+    host, sep, port = address.rpartition(":")
+    if sep and port.isdigit() and os.sep not in address:
+        return "tcp", (host or "127.0.0.1", int(port))
+    return "unix", address
+
+
+def is_loopback(host):
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def admin_key_matches(key):
+    return isinstance(key, str) and hmac.compare_digest(key.encode("utf-8"), ADMIN_KEY.encode("utf-8"))
+
+
+def allowed(method):
+    namespace, _, name = method.rpartition(".")
+    if not namespace:
+        return name in BANK_METHODS
+    return name in NAMESPACES.get(namespace, ())
+
+
+def to_wire(value):
+    # Accounts go out as {"__account__": {...}}; tuples become lists;
+    # dicts with non-string keys (e.g. rollups by day) as {"__items__": [[key, value], ...]}
+    if isinstance(value, Account):
+        return {"__account__": {field: getattr(value, field) for field in ACCOUNT_FIELDS}}
+    if isinstance(value, (list, tuple)):
+        return [to_wire(v) for v in value]
+    if isinstance(value, dict):
+        if all(isinstance(k, str) for k in value):
+            return {k: to_wire(v) for k, v in value.items()}
+        return {"__items__": [[k, to_wire(v)] for k, v in value.items()]}
+    return value
+
+
+def error_to_wire(error):
+    attrs = {
+        name: getattr(error, name)
+        for name in ("account_number", "age", "balance", "amount")
+        if isinstance(getattr(error, name, None), (int, float, str))
+    }
+    return {"type": type(error).__name__, "message": str(error), "attrs": attrs}
+
+
+def dumps(obj):
+    return (json.dumps(obj, separators=(",", ":"), default=str) + "\n").encode("utf-8")
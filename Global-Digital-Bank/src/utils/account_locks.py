@@ -0,0 +1,124 @@
+import threading
+from contextlib import contextmanager, nullcontext
+from typing import Iterator
+
+
+class AccountLocks:
+    """Per-account locks with ordered acquisition, plus a bank-wide gate.
+
+    - hold(*account_numbers) locks the given accounts for one operation.
+      Account numbers map onto a fixed pool of re-entrant locks (stripes),
+      which are always taken in ascending order, so two transfers between
+      the same accounts in opposite directions cannot deadlock.
+    - Account operations pass the gate in shared mode and run side by side;
+      whole-book operations (import, delete all, batches) take it with
+      exclusive() and wait for in-flight account operations to drain.
+    - Everything is re-entrant for the thread that holds it, so a locked
+      operation may call another locked operation.
+    - busy() tells whether the calling thread is inside an operation, so
+      nested calls can leave persistence to the outermost one.
+    - quiesced() is exclusive() for callers outside any operation; a save
+      or snapshot taken there never sees an operation half applied.
+    """
+
+    STRIPES = 1024
+
+    def __init__(self, stripes: int = STRIPES) -> None:
+        self._stripes = [threading.RLock() for _ in range(int(stripes))]
+        self._gate = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writers_waiting = 0
+        self._writer = None
+        # per-thread nesting depth of shared() / exclusive()
+        self._local = threading.local()
+
+    def _depth(self) -> int:
+        return getattr(self._local, "depth", 0)
+
+    def busy(self) -> bool:
+        return self._depth() > 0
+
+    def stripe(self, account_number) -> int:
+        return int(account_number) % len(self._stripes)
+
+    @contextmanager
+    def shared(self) -> Iterator[None]:
+        depth = self._depth()
+        if depth == 0:
+            with self._gate:
+                # new operations queue behind a waiting exclusive() so it cannot starve
+                while self._writer is not None or self._writers_waiting:
+                    self._gate.wait()
+                self._readers += 1
+        self._local.depth = depth + 1
+        try:
+            yield
+        finally:
+            self._local.depth = depth
+            if depth == 0:
+                with self._gate:
+                    self._readers -= 1
+                    if not self._readers:
+                        self._gate.notify_all()
+
+    @contextmanager
+    def exclusive(self) -> Iterator[None]:
+        me = threading.get_ident()
+        depth = self._depth()
+        if self._writer == me:
+            self._local.depth = depth + 1
+            try:
+                yield
+            finally:
+                self._local.depth = depth
+            return
+        if depth:
+            raise RuntimeError("Cannot lock the whole bank from inside an account operation")
+        with self._gate:
+            self._writers_waiting += 1
+            while self._writer is not None or self._readers:
+                self._gate.wait()
+            self._writers_waiting -= 1
+            self._writer = me
+        self._local.depth = 1
+        try:
+            yield
+        finally:
+            self._local.depth = 0
+            with self._gate:
+                self._writer = None
+                self._gate.notify_all()
+
+    def quiesced(self):
+        """exclusive(), unless the calling thread is inside a shared operation.
+
+        Such a caller (a lookup that saves as it rehydrates an account)
+        cannot wait for the other operations to drain, so it runs as is.
+        """
+        if self.busy() and self._writer != threading.get_ident():
+            return nullcontext()
+        return self.exclusive()
+
+    @contextmanager
+    def hold(self, *account_numbers) -> Iterator[None]:
+        """Lock these accounts (in stripe order) for the duration of the block.
+
+        Values that are not account numbers are ignored; the operation
+        reports them as unknown accounts itself.
+        """
+        stripes = set()
+        for account_number in account_numbers:
+            try:
+                stripes.add(self.stripe(account_number))
+            except (TypeError, ValueError):
+                continue
+        with self.shared():
+            taken = []
+            try:
+                for i in sorted(stripes):
+                    self._stripes[i].acquire()
+                    taken.append(i)
+                yield
+            finally:
+                for i in reversed(taken):
+                    self._stripes[i].release()
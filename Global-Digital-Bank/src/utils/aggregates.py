@@ -0,0 +1,252 @@
+import heapq
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # plain-Python loops are used without numpy
+    np = None
+
+from src.models.account_table import AccountTable
+from src.models.lazy_account_table import LazyAccountTable
+
+# Aggregates over the columns of an AccountTable, for the admin dashboards.
+#
+# With numpy the balance / age / status / type arrays are wrapped without
+# copying (np.frombuffer) and every statistic is one vectorized pass.
+# The wrappers never outlive a call: an array.array cannot grow while a
+# buffer on it is exported.
+#
+# A LazyAccountTable (lazy loading) has no full columns; its accounts are
+# streamed instead and "rows" are account numbers. Counts, totals and
+# averages come from its running totals (LazyAccountTable.totals) without a
+# scan; only the min / max of summary() and extreme_rows() stream the files.
+
+
+def _code(values: List[str], value: str) -> int:
+    # -1 (matches nothing) for a value the table has never seen
+    try:
+        return values.index(value)
+    except ValueError:
+        return -1
+
+
+def _mask(table: AccountTable, status: Optional[str], account_type: Optional[str]):
+    """Boolean array of live rows matching the filters."""
+    mask = np.frombuffer(table.alive, dtype=np.int8).astype(bool)
+    if status is not None:
+        mask &= np.frombuffer(table.status_code, dtype=np.int8) == _code(table.status_values, status)
+    if account_type is not None:
+        mask &= np.frombuffer(table.type_code, dtype=np.int8) == _code(table.type_values, account_type.title())
+    return mask
+
+
+def _rows(table: AccountTable, status: Optional[str], account_type: Optional[str]) -> List[int]:
+    """Matching live rows, for the pure-Python path."""
+    s = None if status is None else _code(table.status_values, status)
+    t = None if account_type is None else _code(table.type_values, account_type.title())
+    return [
+        row for row in table._index.values()
+        if (s is None or table.status_code[row] == s) and (t is None or table.type_code[row] == t)
+    ]
+
+
+def _scan(table: LazyAccountTable, status: Optional[str], account_type: Optional[str]):
+    """(account_number, age, balance) of the matching accounts of a lazily loaded table."""
+    account_type = account_type.title() if account_type else None
+    for no, _, age, acc_type, balance, acc_status, _, _ in table.scan():
+        if (status is None or acc_status == status) and (account_type is None or acc_type == account_type):
+            yield no, age, balance
+
+
+def lazy_totals(
+    table: LazyAccountTable,
+    status: Optional[str] = None,
+    account_type: Optional[str] = None,
+    exclude: Optional[str] = None,
+) -> Tuple[int, float, int]:
+    """(accounts, balance total, age total) of the matching accounts, from the running totals."""
+    account_type = account_type.title() if account_type else None
+    n, total, age_total = 0, 0.0, 0
+    for (acc_status, acc_type), (k, balance, age) in table.totals().items():
+        if (
+            (status is None or acc_status == status)
+            and (exclude is None or acc_status != exclude)
+            and (account_type is None or acc_type == account_type)
+        ):
+            n, total, age_total = n + k, total + balance, age_total + age
+    return n, total, age_total
+
+
+def count(table: AccountTable, status: Optional[str] = None, account_type: Optional[str] = None) -> int:
+    if status is None and account_type is None:
+        return len(table)
+    if isinstance(table, LazyAccountTable):
+        return lazy_totals(table, status, account_type)[0]
+    if np is not None:
+        return int(np.count_nonzero(_mask(table, status, account_type)))
+    return len(_rows(table, status, account_type))
+
+
+def summary(
+    table: AccountTable,
+    status: Optional[str] = None,
+    account_type: Optional[str] = None,
+    extremes: bool = True,
+) -> Dict[str, float]:
+    """Count, balance and age statistics of the matching accounts.
+
+    extremes=False leaves min / max balance and age out (None); a lazily
+    loaded table then answers from its running totals instead of a scan.
+    """
+    if isinstance(table, LazyAccountTable) and not extremes:
+        n, total, age_total = lazy_totals(table, status, account_type)
+        if n == 0:
+            return _empty_summary()
+        return {
+            **_empty_summary(),
+            "count": n,
+            "total_balance": round(total, 2),
+            "average_balance": round(total / n, 2),
+            "average_age": round(age_total / n, 2),
+        }
+    if isinstance(table, LazyAccountTable):
+        n, total, age_total = 0, 0.0, 0
+        min_balance = max_balance = min_age = max_age = None
+        for _, age, balance in _scan(table, status, account_type):
+            n += 1
+            total += balance
+            age_total += age
+            min_balance = balance if min_balance is None else min(min_balance, balance)
+            max_balance = balance if max_balance is None else max(max_balance, balance)
+            min_age = age if min_age is None else min(min_age, age)
+            max_age = age if max_age is None else max(max_age, age)
+        if n == 0:
+            return _empty_summary()
+        return {
+            "count": n,
+            "total_balance": round(total, 2),
+            "average_balance": round(total / n, 2),
+            "min_balance": min_balance,
+            "max_balance": max_balance,
+            "min_age": min_age,
+            "max_age": max_age,
+            "average_age": round(age_total / n, 2),
+        }
+    if np is not None:
+        mask = _mask(table, status, account_type)
+        balance = np.frombuffer(table.balance, dtype=np.float64)[mask]
+        age = np.frombuffer(table.age, dtype=np.int32)[mask]
+        n = len(balance)
+        if n == 0:
+            return _empty_summary()
+        total = float(balance.sum())
+        return {
+            "count": n,
+            "total_balance": round(total, 2),
+            "average_balance": round(total / n, 2),
+            "min_balance": float(balance.min()),
+            "max_balance": float(balance.max()),
+            "min_age": int(age.min()),
+            "max_age": int(age.max()),
+            "average_age": round(float(age.mean()), 2),
+        }
+    rows = _rows(table, status, account_type)
+    if not rows:
+        return _empty_summary()
+    balances = [table.balance[r] for r in rows]
+    ages = [table.age[r] for r in rows]
+    total = sum(balances)
+    return {
+        "count": len(rows),
+        "total_balance": round(total, 2),
+        "average_balance": round(total / len(rows), 2),
+        "min_balance": min(balances),
+        "max_balance": max(balances),
+        "min_age": min(ages),
+        "max_age": max(ages),
+        "average_age": round(sum(ages) / len(ages), 2),
+    }
+
+
+def _empty_summary() -> Dict[str, float]:
+    return {
+        "count": 0,
+        "total_balance": 0.0,
+        "average_balance": 0.0,
+        "min_balance": None,
+        "max_balance": None,
+        "min_age": None,
+        "max_age": None,
+        "average_age": None,
+    }
+
+
+def merge_summaries(first: Dict[str, float], second: Dict[str, float]) -> Dict[str, float]:
+    """One summary() for the accounts of two disjoint summaries (hot and cold tier)."""
+    if not second["count"]:
+        return first
+    if not first["count"]:
+        return second
+    n = first["count"] + second["count"]
+    total = first["total_balance"] + second["total_balance"]
+    ages = first["average_age"] * first["count"] + second["average_age"] * second["count"]
+    # a summary without extremes (extremes=False) leaves them out of the merge too
+    pick = lambda f, key: None if first[key] is None or second[key] is None else f(first[key], second[key])
+    return {
+        "count": n,
+        "total_balance": round(total, 2),
+        "average_balance": round(total / n, 2),
+        "min_balance": pick(min, "min_balance"),
+        "max_balance": pick(max, "max_balance"),
+        "min_age": pick(min, "min_age"),
+        "max_age": pick(max, "max_age"),
+        "average_age": round(ages / n, 2),
+    }
+
+
+def summary_by_type(table: AccountTable, status: Optional[str] = None, extremes: bool = True) -> Dict[str, Dict[str, float]]:
+    """summary() for each account type, e.g. {"Savings": {...}, "Current": {...}}."""
+    return {t: summary(table, status, t, extremes) for t in list(table.type_values)}
+
+
+def extreme_rows(
+    table: AccountTable,
+    column: str,
+    k: int,
+    largest: bool = False,
+    status: Optional[str] = None,
+    account_type: Optional[str] = None,
+) -> List[int]:
+    """Rows of the k smallest (or largest) values of "balance" or "age".
+
+    Ties keep table order, like sorted() over the old dict did.
+    """
+    if column not in ("balance", "age"):
+        raise ValueError(f"Cannot rank by {column}")
+    k = int(k)
+    if k <= 0:
+        return []
+    if isinstance(table, LazyAccountTable):
+        pick = (lambda no, age, balance: age) if column == "age" else (lambda no, age, balance: balance)
+        keys = ((-pick(*a) if largest else pick(*a), a[0]) for a in _scan(table, status, account_type))
+        return [no for _, no in heapq.nsmallest(k, keys)]
+    col = getattr(table, column)
+    if np is not None:
+        mask = _mask(table, status, account_type)
+        rows = np.flatnonzero(mask)
+        values = np.frombuffer(col, dtype=np.float64 if column == "balance" else np.int32)[rows]
+        if largest:
+            values = -values.astype(np.float64)
+        if k < len(rows):
+            # only the k best candidates need a full sort
+            part = np.argpartition(values, k - 1)[:k]
+            cutoff = values[part].max()
+            # keep every row tied with the cutoff so table order decides between them
+            part = np.flatnonzero(values <= cutoff)
+        else:
+            part = np.arange(len(rows))
+        order = np.lexsort((rows[part], values[part]))[:k]
+        return [int(r) for r in rows[part][order]]
+    rows = _rows(table, status, account_type)
+    rows.sort(key=lambda r: col[r], reverse=largest)
+    return rows[:k]
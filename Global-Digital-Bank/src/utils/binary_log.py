@@ -0,0 +1,136 @@
+import gzip
+import os
+import struct
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+
+try:
+    import numpy as np
+except ImportError:  # the text log keeps working without numpy
+    np = None
+
+# Fixed-width record, little endian, no padding (29 bytes):
+#   timestamp      int64  wall-clock seconds since 1970-01-01 00:00:00 (the text
+#                         log's local time, no timezone applied)
+#   account        int32
+#   op             uint8  see OP_CODES
+#   amount         int64  minor units (paise); 0 when the text log has "None"
+#   balance_after  int64  minor units
+RECORD = struct.Struct("<qiBqq")
+
+OP_CODES = {
+    "CREATE": 1,
+    "DEPOSIT": 2,
+    "WITHDRAW": 3,
+    "WITHDRAW_FULL": 4,
+    "CLOSE": 5,
+    "LOAN_CREDIT": 6,
+    "TRANSFER_OUT": 7,
+    "TRANSFER_IN": 8,
+}
+OP_NAMES = {code: name for name, code in OP_CODES.items()}
+
+if np is not None:
+    RECORD_DTYPE = np.dtype(
+        [("timestamp", "<i8"), ("account", "<i4"), ("op", "u1"), ("amount", "<i8"), ("balance_after", "<i8")]
+    )
+else:
+    RECORD_DTYPE = None
+
+
+def _minor(value) -> int:
+    try:
+        return int(round(float(value) * 100)) if value not in (None, "None") else 0
+    except (TypeError, ValueError):
+        return 0
+
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _epoch(timestamp: str) -> int:
+    return int((datetime.strptime(timestamp, "%Y-%m-%d %H:%M:%S") - _EPOCH).total_seconds())
+
+
+def encode_record(timestamp: str, account_number, operation: str, amount, balance_after) -> bytes:
+    return RECORD.pack(
+        _epoch(timestamp),
+        int(account_number),
+        OP_CODES.get(operation, 0),
+        _minor(amount),
+        _minor(balance_after),
+    )
+
+
+def binary_path(text_path: str) -> str:
+    """Binary sidecar of a text log segment: 2025-09.log -> 2025-09.bin"""
+    return os.path.splitext(text_path)[0] + ".bin"
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError("numpy is required to read binary transaction logs (pip install numpy)")
+
+
+def load_records(path: str):
+    """Memory-map a binary log as a NumPy structured array (no per-row parsing)."""
+    _require_numpy()
+    try:
+        count = os.path.getsize(path) // RECORD.size
+    except OSError:
+        count = 0
+    if count == 0:
+        return np.zeros(0, dtype=RECORD_DTYPE)
+    # a torn trailing record is simply left out
+    return np.memmap(path, dtype=RECORD_DTYPE, mode="r", shape=(count,))
+
+
+def concat_records(paths: Iterable[str]):
+    _require_numpy()
+    arrays = [load_records(p) for p in paths]
+    if not arrays:
+        return np.zeros(0, dtype=RECORD_DTYPE)
+    return arrays[0] if len(arrays) == 1 else np.concatenate(arrays)
+
+
+def select(records, account_number=None, operations: Optional[Iterable[str]] = None, start: Optional[str] = None, end: Optional[str] = None):
+    """Vectorized filter by account, operation names and date range ("YYYY-MM-DD", inclusive)."""
+    mask = np.ones(len(records), dtype=bool)
+    if account_number is not None:
+        mask &= records["account"] == int(account_number)
+    if operations is not None:
+        mask &= np.isin(records["op"], [OP_CODES[o] for o in operations])
+    if start is not None:
+        mask &= records["timestamp"] >= _epoch(f"{start} 00:00:00")
+    if end is not None:
+        mask &= records["timestamp"] <= _epoch(f"{end} 23:59:59")
+    return records[mask]
+
+
+def totals_by_account(records, operation: str) -> Dict[int, float]:
+    """Sum of `amount` per account for one operation, in rupees."""
+    sel = records[records["op"] == OP_CODES[operation]]
+    if len(sel) == 0:
+        return {}
+    accounts, inverse = np.unique(sel["account"], return_inverse=True)
+    sums = np.bincount(inverse, weights=sel["amount"])
+    return {int(a): float(s) / 100.0 for a, s in zip(accounts, sums)}
+
+
+def convert_text_log(text_path: str, bin_path: Optional[str] = None) -> int:
+    """Write the binary equivalent of a text log. Returns records converted."""
+    bin_path = bin_path or binary_path(text_path[:-3] if text_path.endswith(".gz") else text_path)
+    opener = gzip.open if text_path.endswith(".gz") else open
+    converted = 0
+    with opener(text_path, "rt") as src, open(bin_path + ".tmp", "wb") as dst:
+        for line in src:
+            parts = [p.strip() for p in line.split("|")]
+            if len(parts) < 5:
+                continue
+            try:
+                dst.write(encode_record(parts[0], parts[1], parts[2], parts[3], parts[4]))
+            except ValueError:
+                continue
+            converted += 1
+    os.replace(bin_path + ".tmp", bin_path)
+    return converted
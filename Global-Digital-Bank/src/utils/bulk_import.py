@@ -0,0 +1,178 @@
+import csv
+import io
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+from src.models.account import Account
+from src.models.account_table import AccountTable
+
+# bytes of CSV handed to one worker
+CHUNK_BYTES = 8 << 20
+
+# columns every import file must have (the schema of export_accounts)
+REQUIRED = ("account_number", "name", "age", "account_type", "balance")
+
+
+def split_chunks(path: str, chunk_bytes: int = CHUNK_BYTES) -> Tuple[List[str], List[Tuple[int, int]]]:
+    """The header fields and (start, end) byte ranges of roughly chunk_bytes,
+    each ending on a line boundary.
+
+    A line boundary can fall inside a quoted field that spans lines;
+    parse_chunk() reports that and the file is then parsed as one chunk.
+    """
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        header_line = f.readline()
+        header = next(csv.reader([header_line.decode("utf-8-sig")]), [])
+        ranges = []
+        start = f.tell()
+        while start < size:
+            f.seek(min(start + chunk_bytes, size))
+            if f.tell() < size:
+                f.readline()
+            end = f.tell()
+            ranges.append((start, end))
+            start = end
+    return [h.strip() for h in header], ranges
+
+
+# CSV column for each Account.normalize argument, in order
+COLUMNS = ("account_number", "name", "age", "account_type", "balance", "status", "time", "pin")
+# defaults for the optional columns, used when a file has no such column
+DEFAULTS = {"status": "Active", "time": None, "pin": None}
+# marks an optional value whose column the file does not have
+ABSENT = object()
+
+
+def present_fields(header: List[str]) -> Tuple[str, ...]:
+    """The AccountTable fields a file with this header has columns for."""
+    return tuple(field for field, column in zip(AccountTable.FIELDS, COLUMNS) if column in header)
+
+
+def parse_chunk(path: str, start: int, end: int, header: List[str]):
+    """Parse and validate one byte range. Runs in a worker process.
+
+    Returns (table, row_lines, errors, lines, multiline): the valid rows as
+    an AccountTable (arrays pickle cheaply back to the parent), the line
+    within the chunk each row starts on, (line within the chunk, message)
+    errors, the chunk's line count, and whether a quoted field spans lines
+    (or runs past the end of the chunk).
+    """
+    with open(path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start).decode("utf-8")
+    columns = [header.index(c) if c in header else None for c in COLUMNS]
+    width = len(header)
+    table = AccountTable()
+    row_lines = array("I")
+    errors = []
+    lines = 0
+    multiline = False
+    fields = None
+    reader = csv.reader(io.StringIO(data))
+    for fields in reader:
+        line = lines + 1
+        lines = reader.line_num
+        if lines != line:
+            multiline = True
+        if not fields or not any(v.strip() for v in fields):
+            continue
+        try:
+            row = _validate(fields, columns, width)
+        except (ValueError, AttributeError) as e:
+            errors.append((line, str(e)))
+            continue
+        # absent columns get their defaults here; merges only copy the file's columns
+        row = tuple(
+            DEFAULTS[name] if value is ABSENT else value for name, value in zip(COLUMNS, row)
+        )
+        if row[0] in table:
+            errors.append((line, f"duplicate account_number {row[0]}; this later row is kept"))
+        table.append_row(*row)
+        row_lines.append(line)
+    if fields and fields[-1].endswith(("\n", "\r")):
+        # the chunk ended inside a quoted field
+        multiline = True
+    return table, row_lines, errors, lines, multiline
+
+
+def _validate(fields: List[str], columns: List[Optional[int]], width: int) -> Tuple:
+    """Normalized row in COLUMNS order; ABSENT for optional columns missing from the file."""
+    if len(fields) < width:
+        raise ValueError(f"expected {width} fields, got {len(fields)}")
+    values = [fields[i].strip() if i is not None else "" for i in columns]
+    for name, value in zip(COLUMNS, values):
+        if not value and name in REQUIRED:
+            raise ValueError(f"missing {name}")
+    status, time, pin = (
+        ABSENT if columns[i] is None else values[i] or DEFAULTS[COLUMNS[i]] for i in (5, 6, 7)
+    )
+    row = Account.normalize(
+        account_number=values[0],
+        name=values[1],
+        age=values[2],
+        account_type=values[3],
+        balance=values[4],
+        status=status,
+        timestamp=time,
+        pin=pin,
+    )
+    if row[0] <= 0:
+        raise ValueError(f"invalid account_number {row[0]}")
+    if row[2] < 0:
+        raise ValueError(f"invalid age {row[2]}")
+    if row[4] < 0:
+        raise ValueError(f"negative balance {row[4]}")
+    return row
+
+
+def parse_accounts_file(
+    path: str, workers: Optional[int] = None, chunk_bytes: int = CHUNK_BYTES
+) -> Tuple[AccountTable, List[Tuple[int, str]], Tuple[str, ...]]:
+    """Parse an accounts CSV in parallel chunks.
+
+    Returns the accounts, the errors and the AccountTable fields the file
+    has columns for (see present_fields).
+
+    - Each chunk is parsed and validated in a process pool (inline when the
+      file is a single chunk or workers == 1).
+    - Chunks end on line boundaries, so a file with quoted fields spanning
+      lines (e.g. a name with a line break) is parsed again as one chunk.
+    - Bad rows are reported as (line number, message) and skipped; the rest
+      of the file is still imported.
+    - Optional columns the file lacks (status, time, pin) get their
+      defaults in the table; merge imports leave them alone.
+    - A repeated account number keeps the later row and is reported too.
+    """
+    header, ranges = split_chunks(path, chunk_bytes)
+    missing = [c for c in REQUIRED if c not in header]
+    if missing:
+        raise ValueError(f"{path}: missing columns {missing}")
+    if len(ranges) <= 1 or workers == 1:
+        results = [parse_chunk(path, start, end, header) for start, end in ranges]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = pool.map(
+                parse_chunk,
+                [path] * len(ranges),
+                [r[0] for r in ranges],
+                [r[1] for r in ranges],
+                [header] * len(ranges),
+            )
+            results = list(results)
+    if len(results) > 1 and any(multiline for *_, multiline in results):
+        # some chunk boundary may cut a record in two
+        results = [parse_chunk(path, ranges[0][0], ranges[-1][1], header)]
+    table = AccountTable()
+    errors: List[Tuple[int, str]] = []
+    line_base = 1  # the header is line 1
+    for chunk, row_lines, chunk_errors, lines, _ in results:
+        errors.extend((line_base + n, msg) for n, msg in chunk_errors)
+        for acc_no in table.extend(chunk):
+            n = row_lines[chunk.row_of(acc_no)]
+            errors.append((line_base + n, f"duplicate account_number {acc_no}; this later row is kept"))
+        line_base += lines
+    errors.sort()
+    return table, errors, present_fields(header)
@@ -0,0 +1,217 @@
+import json
+import os
+import sqlite3
+import threading
+import zlib
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src.models.account import Account
+from src.utils.file_manager import ACCOUNT_FILE
+
+COLD_DB = os.path.join(os.path.dirname(ACCOUNT_FILE), "cold_accounts.db")
+
+# Columns the aggregates filter and sum on are kept as plain SQL values; the
+# rest of the row (name, timestamp, PIN) is one zlib-compressed JSON blob.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cold_accounts (
+    account_number INTEGER PRIMARY KEY,
+    age INTEGER NOT NULL,
+    account_type TEXT NOT NULL,
+    balance REAL NOT NULL,
+    status TEXT NOT NULL,
+    archived_at TEXT NOT NULL,
+    data BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_cold_status ON cold_accounts(status);
+"""
+
+UPSERT = (
+    "INSERT OR REPLACE INTO cold_accounts (account_number, age, account_type, balance, status, archived_at, data) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+
+# rows are a few dozen bytes each, too short for zlib to find repeats on its
+# own; a preset dictionary of typical content gives it some to refer back to
+ZDICT = b'["2025-01-01 00:00:00", "1234"]["Kumar", "Rao", "Shah", "Singh", "Sharma", "Lee"]'
+
+
+def _compress(name: str, timestamp: Optional[str], pin: Optional[str]) -> bytes:
+    packer = zlib.compressobj(9, zdict=ZDICT)
+    return packer.compress(json.dumps([name, timestamp, pin]).encode("utf-8")) + packer.flush()
+
+
+def _decompress(data: bytes) -> list:
+    unpacker = zlib.decompressobj(zdict=ZDICT)
+    return json.loads(unpacker.decompress(data) + unpacker.flush())
+
+
+def _where(status: Optional[str], account_type: Optional[str], exclude: Optional[str]) -> Tuple[str, list]:
+    clauses, params = [], []
+    if status is not None:
+        clauses.append("status = ?")
+        params.append(status)
+    if exclude is not None:
+        clauses.append("status != ?")
+        params.append(exclude)
+    if account_type is not None:
+        clauses.append("account_type = ?")
+        params.append(account_type.title())
+    return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+
+class ColdStore:
+    """Closed and dormant accounts, kept out of the bank's hot table.
+
+    - put() archives accounts (replacing older copies); BankingService
+      then drops them from the hot table and its storage, so saves,
+      checkpoints and memory only deal with live accounts.
+    - get() reads one account back as a stand-alone Account; the bank
+      moves it into the hot table again (rehydration) and delete()s the
+      cold copy once the hot store has it.
+    - count(), summary() and accounts() answer the admin aggregates and
+      listings for the cold tier with SQL, without decompressing rows
+      unless accounts are listed.
+    """
+
+    def __init__(self, db_path: str = COLD_DB) -> None:
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def paths(self) -> Tuple[str, ...]:
+        return (self.db_path, self.db_path + "-wal")
+
+    # -------- Accounts --------
+    def put(self, accounts: Iterable[Account]) -> int:
+        """Archive accounts, replacing cold copies with the same number. Returns rows written."""
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        rows = [
+            (
+                acc.account_number,
+                acc.age,
+                acc.account_type,
+                acc.balance,
+                acc.status,
+                now,
+                _compress(acc.name, acc.timestamp, acc.pin),
+            )
+            for acc in accounts
+        ]
+        if rows:
+            with self._lock, self.conn:
+                self.conn.executemany(UPSERT, rows)
+        return len(rows)
+
+    def get(self, account_number) -> Optional[Account]:
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT account_number, age, account_type, balance, status, data FROM cold_accounts "
+                "WHERE account_number = ?",
+                (int(account_number),),
+            ).fetchone()
+        return None if row is None else self._account(row)
+
+    def delete(self, account_numbers: Iterable[int]) -> int:
+        gone = [(int(no),) for no in account_numbers]
+        if gone:
+            with self._lock, self.conn:
+                self.conn.executemany("DELETE FROM cold_accounts WHERE account_number = ?", gone)
+        return len(gone)
+
+    def __contains__(self, account_number) -> bool:
+        with self._lock:
+            return self.conn.execute(
+                "SELECT 1 FROM cold_accounts WHERE account_number = ?", (int(account_number),)
+            ).fetchone() is not None
+
+    def __len__(self) -> int:
+        return self.count()
+
+    def account_numbers(self) -> List[int]:
+        with self._lock:
+            return [no for (no,) in self.conn.execute("SELECT account_number FROM cold_accounts")]
+
+    def max_account_number(self) -> Optional[int]:
+        with self._lock:
+            return self.conn.execute("SELECT MAX(account_number) FROM cold_accounts").fetchone()[0]
+
+    @staticmethod
+    def _account(row) -> Account:
+        account_number, age, account_type, balance, status, data = row
+        name, timestamp, pin = _decompress(data)
+        return Account(account_number, name, age, account_type, balance, status, timestamp, pin)
+
+    # -------- Aggregates and listings --------
+    def count(self, status: Optional[str] = None, account_type: Optional[str] = None, exclude: Optional[str] = None) -> int:
+        where, params = _where(status, account_type, exclude)
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM cold_accounts" + where, params).fetchone()[0]
+
+    def summary(self, status: Optional[str] = None, account_type: Optional[str] = None) -> Dict[str, float]:
+        """Same keys as aggregates.summary(), over the cold accounts."""
+        where, params = _where(status, account_type, None)
+        with self._lock:
+            n, total, min_balance, max_balance, min_age, max_age, age_total = self.conn.execute(
+                "SELECT COUNT(*), SUM(balance), MIN(balance), MAX(balance), MIN(age), MAX(age), SUM(age) "
+                "FROM cold_accounts" + where,
+                params,
+            ).fetchone()
+        return {
+            "count": n,
+            "total_balance": round(total or 0.0, 2),
+            "average_balance": round(total / n, 2) if n else 0.0,
+            "min_balance": min_balance,
+            "max_balance": max_balance,
+            "min_age": min_age,
+            "max_age": max_age,
+            "average_age": round(age_total / n, 2) if n else None,
+        }
+
+    def account_types(self) -> List[str]:
+        with self._lock:
+            return [t for (t,) in self.conn.execute("SELECT DISTINCT account_type FROM cold_accounts")]
+
+    def page(
+        self,
+        column: str,
+        after: Optional[Tuple] = None,
+        limit: int = 50,
+        descending: bool = False,
+        status: Optional[str] = None,
+        exclude: Optional[str] = None,
+        account_type: Optional[str] = None,
+    ) -> List[Tuple[Tuple, Account]]:
+        """Up to `limit` ((value, account number), account) after the key `after`, ordered by `column`."""
+        if column not in ("balance", "age", "account_number"):
+            raise ValueError(f"Cannot order by {column}")
+        where, params = _where(status, account_type, exclude)
+        if after is not None:
+            where += (" AND " if where else " WHERE ") + f"({column}, account_number) {'<' if descending else '>'} (?, ?)"
+            params += list(after)
+        order = "DESC" if descending else "ASC"
+        with self._lock:
+            rows = self.conn.execute(
+                f"SELECT {column}, account_number, age, account_type, balance, status, data FROM cold_accounts"
+                f"{where} ORDER BY {column} {order}, account_number {order} LIMIT ?",
+                params + [int(limit)],
+            ).fetchall()
+        return [((row[0], row[1]), self._account(row[1:])) for row in rows]
+
+    def accounts(self, status: Optional[str] = None, exclude: Optional[str] = None) -> Iterator[Account]:
+        """Matching cold accounts in account number order, without rehydrating them."""
+        where, params = _where(status, None, exclude)
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT account_number, age, account_type, balance, status, data FROM cold_accounts"
+                + where + " ORDER BY account_number",
+                params,
+            ).fetchall()
+        return (self._account(row) for row in rows)
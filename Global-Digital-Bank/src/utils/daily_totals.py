@@ -0,0 +1,83 @@
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Tuple
+
+
+class DailyTotals:
+    """Running per-account totals of today's DEPOSIT and WITHDRAW amounts.
+
+    - add() is called for every logged transaction, so a daily-limit check
+      is a dict lookup instead of a scan of user_transactions.log.
+    - rebuild() seeds the counters from today's log lines at startup.
+    - The counters reset themselves when the date changes (midnight rollover).
+    - Safe to share between threads; a limit check and the add() that follows
+      it still need the account's lock (see AccountLocks).
+    """
+
+    OPERATIONS = ("DEPOSIT", "WITHDRAW")
+
+    def __init__(self) -> None:
+        self.day: Optional[str] = None
+        self._totals: Dict[Tuple[int, str], float] = {}
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def _today() -> str:
+        return datetime.now().strftime("%Y-%m-%d")
+
+    @staticmethod
+    def _amount(amount) -> float:
+        try:
+            return float(amount) if amount not in (None, "None") else 0.0
+        except (TypeError, ValueError):
+            return 0.0
+
+    def _roll(self, day: str) -> None:
+        if day != self.day:
+            self.day = day
+            self._totals = {}
+
+    def add(self, account_number, operation: str, amount, day: Optional[str] = None) -> None:
+        if operation not in DailyTotals.OPERATIONS:
+            return
+        day = day or self._today()
+        key = (int(account_number), operation)
+        amount = self._amount(amount)
+        with self._lock:
+            if day < (self.day or ""):
+                # late record for a day we already rolled past
+                return
+            self._roll(day)
+            self._totals[key] = self._totals.get(key, 0.0) + amount
+
+    def get(self, account_number, operation: str) -> float:
+        with self._lock:
+            self._roll(self._today())
+            return self._totals.get((int(account_number), operation), 0.0)
+
+    def load(self, totals_by_op: Dict[str, Dict[int, float]]) -> None:
+        """Reset to precomputed totals for today, e.g. from the binary log."""
+        with self._lock:
+            self.day = None
+            self._roll(self._today())
+            for operation, totals in totals_by_op.items():
+                for acc_no, total in totals.items():
+                    self._totals[(int(acc_no), operation)] = float(total)
+
+    def rebuild(self, lines: Iterable[str]) -> None:
+        """Reset and re-count from log lines; only today's lines are used."""
+        today = self._today()
+        with self._lock:
+            self.day = None
+            self._roll(today)
+        for line in lines:
+            if not line.startswith(today):
+                continue
+            parts = [p.strip() for p in line.split("|")]
+            if len(parts) < 5:
+                continue
+            try:
+                acc_no = int(parts[1])
+            except ValueError:
+                continue
+            self.add(acc_no, parts[2], parts[3], today)
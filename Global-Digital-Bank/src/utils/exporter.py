@@ -0,0 +1,222 @@
+import csv
+import gzip
+import io
+import os
+from typing import Dict, Iterator, List, Optional, Sequence
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # CSV exports keep working without pyarrow
+    pa = None
+    pq = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+from src.models.account_table import AccountTable
+from src.models.lazy_account_table import LazyAccountTable
+
+# column order of CSV exports; "time" is the account's timestamp
+COLUMNS = ("account_number", "name", "age", "balance", "account_type", "status", "time", "pin")
+# PINs are only written when asked for explicitly
+DEFAULT_COLUMNS = tuple(c for c in COLUMNS if c != "pin")
+CHUNK_ROWS = 50_000
+
+# file extension -> format
+FORMATS = {
+    ".csv": "csv",
+    ".csv.gz": "csv.gz",
+    ".csv.zst": "csv.zst",
+    ".parquet": "parquet",
+    ".arrow": "arrow",
+    ".feather": "arrow",
+}
+
+
+def format_for(path: str) -> str:
+    for ext in sorted(FORMATS, key=len, reverse=True):
+        if path.endswith(ext):
+            return FORMATS[ext]
+    raise ValueError(f"Unknown export format for {path}. Use one of {sorted(FORMATS)}")
+
+
+def iter_chunks(
+    table: AccountTable,
+    columns: Sequence[str] = DEFAULT_COLUMNS,
+    status: Optional[str] = None,
+    account_type: Optional[str] = None,
+    chunk_rows: int = CHUNK_ROWS,
+    cold=None,
+) -> Iterator[Dict[str, list]]:
+    """{column: values} for up to chunk_rows matching accounts at a time.
+
+    The accounts of `table` come first, then those of the ColdStore `cold`
+    (closed and dormant accounts) when one is given.
+    """
+    unknown = [c for c in columns if c not in COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown export columns {unknown}. Choose from {list(COLUMNS)}")
+    if isinstance(table, LazyAccountTable):
+        # lazy loading: export the streamed accounts one table-sized piece at a time
+        for part in table.chunks(chunk_rows):
+            yield from iter_chunks(part, columns, status, account_type, chunk_rows)
+    else:
+        yield from _table_chunks(table, columns, status, account_type, chunk_rows)
+    if cold is not None:
+        yield from _cold_chunks(cold, table, columns, status, account_type, chunk_rows)
+
+
+# column -> its value on an Account (cold accounts come back as stand-alone Accounts)
+ACCOUNT_GETTERS = {
+    "account_number": lambda acc: acc.account_number,
+    "name": lambda acc: acc.name,
+    "age": lambda acc: acc.age,
+    "balance": lambda acc: acc.balance,
+    "account_type": lambda acc: acc.account_type,
+    "status": lambda acc: acc.status,
+    "time": lambda acc: acc.timestamp or "",
+    "pin": lambda acc: acc.pin or "",
+}
+
+
+def _cold_chunks(cold, table, columns, status, account_type, chunk_rows) -> Iterator[Dict[str, list]]:
+    # keyset pages in account number order, so only chunk_rows cold rows are read at a time
+    after = None
+    while True:
+        page = cold.page("account_number", after, chunk_rows, status=status, account_type=account_type)
+        # a copy left in both tiers by an interrupted archive is exported once, from the hot table
+        accounts = [acc for _, acc in page if acc.account_number not in table]
+        if accounts:
+            yield {c: [ACCOUNT_GETTERS[c](acc) for acc in accounts] for c in columns}
+        if len(page) < chunk_rows:
+            return
+        after = page[-1][0]
+
+
+def _table_chunks(table, columns, status, account_type, chunk_rows) -> Iterator[Dict[str, list]]:
+    s = None if status is None else (table.status_values.index(status) if status in table.status_values else -1)
+    account_type = account_type.title() if account_type else None
+    t = None if account_type is None else (table.type_values.index(account_type) if account_type in table.type_values else -1)
+    getters = {
+        "account_number": lambda rows: [table.account_number[r] for r in rows],
+        "name": lambda rows: [table.name[r] for r in rows],
+        "age": lambda rows: [table.age[r] for r in rows],
+        "balance": lambda rows: [table.balance[r] for r in rows],
+        "account_type": lambda rows: [table.type_values[table.type_code[r]] for r in rows],
+        "status": lambda rows: [table.status_values[table.status_code[r]] for r in rows],
+        "time": lambda rows: [table.timestamp[r] or "" for r in rows],
+        "pin": lambda rows: [table.pin[r] or "" for r in rows],
+    }
+    # Rows are appended and never reused or moved, so the scan walks row positions and
+    # can let go of the table between chunks. Each chunk is picked and read under the
+    # table lock: writers (creates, imports, operations) wait at most one chunk, and no
+    # exported row mixes values from before and after a write.
+    start = 0
+    while True:
+        with table.lock:
+            end = len(table.alive)
+            rows: List[int] = []
+            while start < end and len(rows) < chunk_rows:
+                if (
+                    table.alive[start]
+                    and (s is None or table.status_code[start] == s)
+                    and (t is None or table.type_code[start] == t)
+                ):
+                    rows.append(start)
+                start += 1
+            chunk = {c: getters[c](rows) for c in columns} if rows else None
+        if chunk is not None:
+            yield chunk
+        if start >= end:
+            return
+
+
+def _open_text(path: str, fmt: str):
+    if fmt == "csv.gz":
+        return gzip.open(path, "wt", newline="")
+    if fmt == "csv.zst":
+        if zstandard is None:
+            raise ImportError("zstandard is required for .csv.zst exports (pip install zstandard)")
+        raw = open(path, "wb")
+        return io.TextIOWrapper(zstandard.ZstdCompressor().stream_writer(raw), newline="")
+    return open(path, "w", newline="")
+
+
+def _arrow_schema(columns: Sequence[str]):
+    types = {
+        "account_number": pa.int64(),
+        "name": pa.string(),
+        "age": pa.int32(),
+        "balance": pa.float64(),
+        "account_type": pa.dictionary(pa.int8(), pa.string()),
+        "status": pa.dictionary(pa.int8(), pa.string()),
+        "time": pa.string(),
+        "pin": pa.string(),
+    }
+    return pa.schema([(c, types[c]) for c in columns])
+
+
+def export_accounts(
+    table: AccountTable,
+    path: str,
+    columns: Optional[Sequence[str]] = None,
+    status: Optional[str] = None,
+    account_type: Optional[str] = None,
+    include_pin: bool = False,
+    chunk_rows: int = CHUNK_ROWS,
+    cold=None,
+) -> int:
+    """Stream accounts to a file; the format follows the extension.
+
+    - .csv, .csv.gz, .csv.zst (needs zstandard): the CSV schema that
+      import_accounts reads.
+    - .parquet / .arrow / .feather (needs pyarrow): columnar, typed, with
+      status and account type dictionary-encoded; pandas.read_parquet /
+      read_feather load them directly.
+    - Only chunk_rows accounts are materialized at a time.
+    - columns selects and orders the output; the PIN column is left out
+      unless include_pin is set (or "pin" is listed in columns).
+    - The accounts of the ColdStore `cold` are written after those of
+      `table`, with the same filters.
+    - The file is written under a temporary name and renamed when complete.
+
+    Returns the number of accounts written.
+    """
+    fmt = format_for(path)
+    if columns is None:
+        columns = COLUMNS if include_pin else DEFAULT_COLUMNS
+    columns = list(columns)
+    if not columns:
+        raise ValueError("Select at least one column to export")
+    if fmt in ("parquet", "arrow") and pa is None:
+        raise ImportError(f"pyarrow is required for .{fmt} exports (pip install pyarrow)")
+    tmp = path + ".tmp"
+    written = 0
+    chunks = iter_chunks(table, columns, status, account_type, chunk_rows, cold)
+    try:
+        if fmt in ("parquet", "arrow"):
+            schema = _arrow_schema(columns)
+            if fmt == "parquet":
+                writer = pq.ParquetWriter(tmp, schema, compression="zstd")
+            else:
+                writer = pa.ipc.new_file(tmp, schema, options=pa.ipc.IpcWriteOptions(compression="zstd"))
+            with writer:
+                for chunk in chunks:
+                    writer.write_table(pa.Table.from_pydict(chunk, schema=schema))
+                    written += len(chunk[columns[0]])
+        else:
+            with _open_text(tmp, fmt) as f:
+                writer = csv.writer(f)
+                writer.writerow(columns)
+                for chunk in chunks:
+                    writer.writerows(zip(*(chunk[c] for c in columns)))
+                    written += len(chunk[columns[0]])
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    return written
@@ -1,15 +1,38 @@
 import csv
+import os
+import threading
 from src.models.account import Account
+from src.models.account_table import AccountTable
 from datetime import datetime
+from src.utils.log_writer import get_log_writer
+from src.utils.segmented_log import SegmentedLog, read_backward, read_forward
+from src.utils import binary_log
+from src.utils import exporter
+from src.utils import snapshot
 
 ACCOUNT_FILE = "/Users/harshahs/Desktop/global_digital_bank/Global-Digital_Bank/Global-Digital-Bank/Global-Digital-Bank/data/accounts.csv"
 # Preserve existing transactions.log usage, but add split logs for role-based logging
 USER_TRANSACTIONS_FILE = "/Users/harshahs/Desktop/global_digital_bank/Global-Digital_Bank/Global-Digital-Bank/Global-Digital-Bank/data/user_transactions.log"
 ADMIN_ACTIONS_FILE = "/Users/harshahs/Desktop/global_digital_bank/Global-Digital_Bank/Global-Digital-Bank/Global-Digital-Bank/data/admin_actions.log"
 TRANSACTIONS_FILE = "/Users/harshahs/Desktop/global_digital_bank/Global-Digital_Bank/Global-Digital-Bank/Global-Digital-Bank/data/transactions.log"
+# Both transaction logs are stored as segments under data/<log name>/ (see SegmentedLog)
+LOG_SEGMENT_PERIOD = "month"
+LOG_ARCHIVE_AFTER_DAYS = 90
+# Also write each user transaction as a fixed-width binary record next to its
+# text segment (2025-09.log -> 2025-09.bin), for vectorized readers. Run
+# convert_user_log_to_binary() once before turning this on for an existing log.
+BINARY_LOG_ENABLED = False
+# Keep a binary, checksummed copy of accounts.csv next to it (accounts.snap, see
+# snapshot); load_accounts() reads that instead of parsing the CSV while it is
+# current. It is written at checkpoints, on shutdown and when a load finds it
+# stale, not on every save.
+ACCOUNT_SNAPSHOT_ENABLED = True
 
-def save_accounts(accounts):
-    with open(ACCOUNT_FILE, "w", newline="") as f:
+def save_accounts(accounts, path=ACCOUNT_FILE, with_snapshot=False):
+    # written under a temporary name and renamed, so a process loading the file
+    # at the same time sees either the old or the new version, never half of one
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", newline="") as f:
         writer = csv.writer(f)
         writer.writerow(["account_number", "name", "age", "balance", "account_type", "status", "time","pin"])
         for acc in accounts.values():
@@ -25,15 +48,39 @@ def save_accounts(accounts):
                     d['timestamp'],
                     d["pin"]
                     ])
+    os.replace(tmp_path, path)
+    if with_snapshot and ACCOUNT_SNAPSHOT_ENABLED and isinstance(accounts, AccountTable):
+        save_account_snapshot(accounts, path)
 
 
-def load_accounts():
-    accounts = {}
+def save_account_snapshot(accounts, path=ACCOUNT_FILE):
+    # binary copy of the accounts just written to `path`; a snapshot that cannot be
+    # written only costs the next start a CSV parse
     try:
-        with open(ACCOUNT_FILE, "r") as f:
+        snapshot.write(
+            snapshot.snapshot_path(path),
+            "accounts",
+            accounts.columns(),
+            meta={"status_values": accounts.status_values, "type_values": accounts.type_values},
+            source=path,
+        )
+    except OSError:
+        pass
+
+
+def load_accounts(path=ACCOUNT_FILE):
+    if ACCOUNT_SNAPSHOT_ENABLED:
+        loaded = snapshot.read(snapshot.snapshot_path(path), "accounts", source=path)
+        if loaded is not None:
+            columns, meta = loaded
+            return AccountTable.from_columns(columns, meta["status_values"], meta["type_values"])
+    accounts = AccountTable()
+    try:
+        with open(path, "r") as f:
             reader = csv.DictReader(f)
             for row in reader:
-                acc = Account(
+                # rows go straight into the columns, no Account object per row
+                accounts.append_row(*Account.normalize(
                     account_number=row["account_number"],
                     name= row["name"],
                     age=row["age"],
@@ -42,39 +89,150 @@ def load_accounts():
                     status=row["status"],
                     timestamp=row["time"] if row["time"] else None,
                     pin=row["pin"] if row["pin"] else None
-                )
-                accounts[acc.account_number] = acc
+                ))
     except FileNotFoundError:
-        pass
+        return accounts
+    if ACCOUNT_SNAPSHOT_ENABLED:
+        # missing or stale snapshot: the next start reads this one
+        save_account_snapshot(accounts, path)
     return accounts
 
 
+_segmented_logs = {}
+_segmented_logs_lock = threading.Lock()
+
+
+def get_segmented_log(path):
+    # SegmentedLog for one of the transaction log paths, created on first use
+    # (locked so concurrent first writers share one instance and one index listener)
+    with _segmented_logs_lock:
+        log = _segmented_logs.get(path)
+        if log is None:
+            log = SegmentedLog(path, period=LOG_SEGMENT_PERIOD, archive_after_days=LOG_ARCHIVE_AFTER_DAYS)
+            if path == USER_TRANSACTIONS_FILE:
+                # keep the per-segment account offset indexes current as the writer appends
+                writer = get_log_writer()
+                log.on_new_path = lambda p: writer.add_listener(p, log.on_append(p))
+            _segmented_logs[path] = log
+        return log
+
+
 def log_transaction(account_number, operation, amount, balance_after):
+    # Records are queued to the background LogWriter; call flush_logs() to wait for them
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    line = f"{timestamp} | {account_number} | {operation} | {amount} | {balance_after}\n"
+    writer = get_log_writer()
     # Keep original combined log for backwards-compatibility
-    with open(TRANSACTIONS_FILE, "a") as f:
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        f.write(f"{timestamp} | {account_number} | {operation} | {amount} | {balance_after}\n")
+    writer.write(get_segmented_log(TRANSACTIONS_FILE).append_path(timestamp), line)
     # Also write to user-only log
-    with open(USER_TRANSACTIONS_FILE, "a") as f:
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        f.write(f"{timestamp} | {account_number} | {operation} | {amount} | {balance_after}\n")
+    user_path = get_segmented_log(USER_TRANSACTIONS_FILE).append_path(timestamp)
+    writer.write(user_path, line)
+    if BINARY_LOG_ENABLED:
+        record = binary_log.encode_record(timestamp, account_number, operation, amount, balance_after)
+        writer.write(binary_log.binary_path(user_path), record)
+
+
+def log_transactions(records):
+    # many (account_number, operation, amount, balance_after) records as one write per log file,
+    # all stamped with the same time (used by BankingService.apply_batch)
+    if not records:
+        return
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    text = "".join(
+        f"{timestamp} | {account_number} | {operation} | {amount} | {balance_after}\n"
+        for account_number, operation, amount, balance_after in records
+    )
+    writer = get_log_writer()
+    writer.write(get_segmented_log(TRANSACTIONS_FILE).append_path(timestamp), text)
+    user_path = get_segmented_log(USER_TRANSACTIONS_FILE).append_path(timestamp)
+    writer.write(user_path, text)
+    if BINARY_LOG_ENABLED:
+        writer.write(
+            binary_log.binary_path(user_path),
+            b"".join(binary_log.encode_record(timestamp, *record) for record in records),
+        )
 
 
 def log_admin_action(action_description):
-    with open(ADMIN_ACTIONS_FILE, "a") as f:
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        f.write(f"{timestamp} | {action_description}\n")
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    get_log_writer().write(ADMIN_ACTIONS_FILE, f"{timestamp} | {action_description}\n")
+
+
+# longest flush_logs() waits for the writer thread, in seconds
+FLUSH_TIMEOUT = 30.0
+
+
+def flush_logs(timeout=FLUSH_TIMEOUT):
+    # barrier: returns once every record logged so far is written (and fsynced);
+    # False if that takes longer than `timeout`, LogWriteError if one of our records failed
+    return get_log_writer().flush(timeout)
+
 
+def read_account_transactions(account_number, newest_first=False, offset=0, limit=None):
+    # one account's user log lines via the per-segment offset indexes; offset/limit paginate
+    flush_logs()
+    return get_segmented_log(USER_TRANSACTIONS_FILE).account_lines(account_number, newest_first, offset, limit)
 
-def read_user_transactions():
+
+def iter_user_transactions(start=None, end=None):
+    # user log lines dated within [start, end] ("YYYY-MM-DD"); only those segments are opened
+    flush_logs()
+    return get_segmented_log(USER_TRANSACTIONS_FILE).iter_lines(start, end)
+
+
+def read_user_transactions(start=None, end=None):
+    return "".join(iter_user_transactions(start, end))
+
+
+def load_user_transactions_array(start=None, end=None):
+    # NumPy structured array of the user log segments overlapping [start, end],
+    # or None when binary logging is off, numpy is missing or a segment has no sidecar
+    if not BINARY_LOG_ENABLED or binary_log.np is None:
+        return None
+    flush_logs()
+    log = get_segmented_log(USER_TRANSACTIONS_FILE)
+    paths = [binary_log.binary_path(os.path.join(log.dir, key + ".log")) for key in log.keys(start, end)]
+    if not all(os.path.exists(p) for p in paths):
+        return None
+    return binary_log.select(binary_log.concat_records(paths), start=start, end=end)
+
+
+def convert_user_log_to_binary():
+    # one-shot converter: writes a .bin sidecar for every user log segment
+    flush_logs()
+    log = get_segmented_log(USER_TRANSACTIONS_FILE)
+    total = 0
+    for key in log.keys():
+        seg = log._segments[key]
+        total += binary_log.convert_text_log(
+            os.path.join(log.dir, seg["file"]), binary_log.binary_path(os.path.join(log.dir, key + ".log"))
+        )
+    return f"Converted {total} transactions to binary format"
+
+
+def user_transactions_page(cursor=None, page_size=100, newest_first=True):
+    # one page of the user transaction log: (lines, next_cursor); next_cursor is None at the end
+    flush_logs()
+    return get_segmented_log(USER_TRANSACTIONS_FILE).page(cursor, int(page_size), newest_first)
+
+
+def admin_actions_page(cursor=None, page_size=100, newest_first=True):
+    # same for admin_actions.log; the cursor is a byte offset into the file
+    flush_logs()
     try:
-        with open(USER_TRANSACTIONS_FILE, "r") as f:
-            return f.read()
+        with open(ADMIN_ACTIONS_FILE, "rb") as f:
+            if newest_first:
+                end = cursor if cursor is not None else f.seek(0, os.SEEK_END)
+                lines, pos = read_backward(f, end, int(page_size))
+                return lines, (pos if pos > 0 and len(lines) == int(page_size) else None)
+            lines, pos = read_forward(f, cursor or 0, int(page_size))
+            return lines, (pos if len(lines) == int(page_size) else None)
     except FileNotFoundError:
-        return ""
+        return [], None
 
 
 def read_admin_actions():
+    flush_logs()
     try:
         with open(ADMIN_ACTIONS_FILE, "r") as f:
             return f.read()
@@ -82,31 +240,20 @@ def read_admin_actions():
         return ""
 
 
-def export_accounts(accounts, export_path):
-    # Use the deep project's CSV schema including time column
-    with open(export_path, "w", newline="") as f:
-        writer = csv.writer(f)
-        writer.writerow(["account_number", "name", "age", "balance", "account_type", "status", "time", "pin"])
-        for acc in accounts.values():
-            d = acc.to_dict()
-            writer.writerow([
-                d["account_number"],
-                d["name"],
-                d["age"],
-                d["balance"],
-                d["account_type"],
-                d["status"],
-                d.get("timestamp"),
-                d["pin"],
-            ])
+def export_accounts(accounts, export_path, **options):
+    # streamed in chunks; the format follows the extension (.csv, .csv.gz, .csv.zst,
+    # .parquet, .arrow). PINs are left out unless include_pin=True; see exporter.export_accounts
+    if not isinstance(accounts, AccountTable):
+        accounts = AccountTable.from_accounts(accounts.values())
+    return exporter.export_accounts(accounts, export_path, **options)
 
 
 def import_accounts(import_path):
-    accounts = {}
+    accounts = AccountTable()
     with open(import_path, "r") as f:
         reader = csv.DictReader(f)
         for row in reader:
-            acc = Account(
+            accounts.append_row(*Account.normalize(
                 account_number=row["account_number"],
                 name=row["name"],
                 age=row["age"],
@@ -115,6 +262,5 @@ def import_accounts(import_path):
                 status=row.get("status"),
                 timestamp=row.get("time") if row.get("time") else None,
                 pin=row.get("pin") if row.get("pin") else None,
-            )
-            accounts[acc.account_number] = acc
+            ))
     return accounts
\ No newline at end of file
@@ -0,0 +1,57 @@
+import time
+
+
+class FlushPolicy:
+    """Decides when BankingService writes its dirty accounts to storage.
+
+    Modes and what a crash (power loss, kill -9) can lose:
+
+    - "always":   flush after every operation (the original behaviour).
+                  Nothing that was acknowledged to the caller is lost.
+    - "group":    group commit. Flush once `every_n` operations are pending
+                  or `every_ms` milliseconds after the first pending one,
+                  whichever comes first. A crash loses at most the last
+                  `every_n - 1` operations / `every_ms` ms of operations.
+    - "shutdown": flush only on BankingService.close() or interpreter exit
+                  (and explicit save_to_disk calls). A crash loses every
+                  operation since the last of those.
+
+    Transaction logs are written independently, so operations lost from
+    accounts storage can still be found in user_transactions.log.
+    """
+
+    ALWAYS = "always"
+    GROUP = "group"
+    SHUTDOWN = "shutdown"
+    MODES = (ALWAYS, GROUP, SHUTDOWN)
+
+    def __init__(self, mode: str = ALWAYS, every_n: int = 100, every_ms: int = 500) -> None:
+        if mode not in FlushPolicy.MODES:
+            raise ValueError(f"Invalid flush mode: {mode}. Choose from {list(FlushPolicy.MODES)}")
+        if int(every_n) < 1 or int(every_ms) < 1:
+            raise ValueError("every_n and every_ms must be positive")
+        self.mode = mode
+        self.every_n = int(every_n)
+        self.every_ms = int(every_ms)
+        self.pending = 0
+        self.first_pending_at = None
+
+    def record(self) -> bool:
+        """Count one more unflushed operation; True means flush now."""
+        if self.mode == FlushPolicy.ALWAYS:
+            return True
+        if self.pending == 0:
+            self.first_pending_at = time.monotonic()
+        self.pending += 1
+        if self.mode == FlushPolicy.SHUTDOWN:
+            return False
+        return self.pending >= self.every_n or self.overdue()
+
+    def overdue(self) -> bool:
+        if self.mode != FlushPolicy.GROUP or not self.pending:
+            return False
+        return (time.monotonic() - self.first_pending_at) * 1000 >= self.every_ms
+
+    def flushed(self) -> None:
+        self.pending = 0
+        self.first_pending_at = None
@@ -0,0 +1,119 @@
+import json
+import os
+from typing import Dict, Iterable, Tuple
+
+from src.models.account import Account
+from src.models.account_table import AccountTable
+from src.models.lazy_account_table import LazyAccountTable
+from src.utils.file_manager import ACCOUNT_FILE, load_accounts, save_accounts
+
+JOURNAL_FILE = os.path.join(os.path.dirname(ACCOUNT_FILE), "accounts.journal")
+
+
+class AccountJournal:
+    """Append-only write-ahead journal in front of accounts.csv.
+
+    - Every save appends one JSON line per changed account ("put") or
+      removed account ("del") instead of rewriting the whole CSV. The
+      caller says which accounts changed (BankingService's dirty set).
+    - After `checkpoint_every` records the CSV snapshot is rewritten
+      (atomically, via a temp file) and the journal is truncated.
+    - On startup the snapshot is loaded and only the journal tail, i.e.
+      everything written since the latest checkpoint, is replayed.
+    """
+
+    def __init__(
+        self,
+        snapshot_path: str = ACCOUNT_FILE,
+        journal_path: str = JOURNAL_FILE,
+        checkpoint_every: int = 1000,
+        fsync: bool = False,
+    ) -> None:
+        self.snapshot_path = snapshot_path
+        self.journal_path = journal_path
+        self.checkpoint_every = int(checkpoint_every)
+        self.fsync = fsync
+        self.records_since_checkpoint = 0
+
+    def paths(self) -> Tuple[str, ...]:
+        """Files load() reads; another process writing them means our copy is stale."""
+        return (self.snapshot_path, self.journal_path)
+
+    def load(self) -> AccountTable:
+        accounts = load_accounts(self.snapshot_path)
+        self.records_since_checkpoint = self._replay(accounts)
+        return accounts
+
+    def load_lazy(self, capacity: int = LazyAccountTable.DEFAULT_CAPACITY) -> LazyAccountTable:
+        """Index the snapshot and journal; accounts are read when first used."""
+        accounts = LazyAccountTable(self.snapshot_path, self.journal_path, capacity)
+        self.records_since_checkpoint = accounts.journal_records
+        return accounts
+
+    def _replay(self, accounts: Dict[int, Account]) -> int:
+        replayed = 0
+        try:
+            with open(self.journal_path, "r") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # torn write at the tail after a crash; nothing valid follows it
+                        break
+                    if record.get("op") == "put":
+                        row = record["row"]
+                        accounts.append_row(*Account.normalize(
+                            account_number=row["account_number"],
+                            name=row["name"],
+                            age=row["age"],
+                            account_type=row["account_type"],
+                            balance=row["balance"],
+                            status=row["status"],
+                            timestamp=row["timestamp"] or None,
+                            pin=row["pin"] or None,
+                        ))
+                    elif record.get("op") == "del":
+                        accounts.pop(int(record["account_number"]), None)
+                    replayed += 1
+        except FileNotFoundError:
+            pass
+        return replayed
+
+    def save(self, accounts: Dict[int, Account], changed: Iterable[int], removed: Iterable[int] = ()) -> int:
+        """Append records for the given changed and removed account numbers.
+
+        Returns the number of journal records written.
+        """
+        lines = []
+        for acc_no in changed:
+            acc = accounts.get(acc_no)
+            if acc is not None:
+                lines.append(json.dumps({"op": "put", "row": acc.to_dict()}))
+        for acc_no in removed:
+            lines.append(json.dumps({"op": "del", "account_number": acc_no}))
+        if not lines:
+            return 0
+        self._append(lines)
+        self.records_since_checkpoint += len(lines)
+        if self.records_since_checkpoint >= self.checkpoint_every:
+            self.checkpoint(accounts)
+        return len(lines)
+
+    def _append(self, lines) -> None:
+        with open(self.journal_path, "a") as f:
+            f.write("\n".join(lines) + "\n")
+            if self.fsync:
+                f.flush()
+                os.fsync(f.fileno())
+
+    def checkpoint(self, accounts: Dict[int, Account]) -> None:
+        """Write a full snapshot and start a fresh journal.
+
+        The snapshot replaces the CSV atomically before the journal is
+        truncated, so a crash in between only means some records are
+        replayed twice on the next start, which is harmless.
+        """
+        # save_accounts writes a temporary file and renames it over the snapshot
+        save_accounts(accounts, self.snapshot_path, with_snapshot=True)
+        open(self.journal_path, "w").close()
+        self.records_since_checkpoint = 0
@@ -0,0 +1,44 @@
+from typing import Callable, Generic, Optional, TypeVar
+
+from src.models.account_table import AccountTable
+
+Index = TypeVar("Index")
+
+
+class LazyIndex(Generic[Index]):
+    """A secondary index that is built the first time it is queried.
+
+    - Stands in for an OrderIndex, NameIndex or StatusPartitions: attribute
+      lookups are forwarded to the real index, built by `factory(table)` on
+      first use. Startup then only pays for loading the accounts; building
+      every index up front took several times as long as the load itself.
+    - Until then no listener is registered, so writes cost nothing extra;
+      the build runs under the table lock (writes and their listener
+      callbacks run under it too), so it sees every write before it and
+      none are missed after.
+    """
+
+    def __init__(self, table: AccountTable, factory: Callable[[AccountTable], Index]) -> None:
+        self._table = table
+        self._factory = factory
+        self._index: Optional[Index] = None
+
+    @property
+    def built(self) -> bool:
+        return self._index is not None
+
+    def get(self) -> Index:
+        index = self._index
+        if index is None:
+            with self._table.lock:
+                if self._index is None:
+                    self._index = self._factory(self._table)
+                index = self._index
+        return index
+
+    def __getattr__(self, name: str):
+        # only called for names LazyIndex itself does not have
+        return getattr(self.get(), name)
+
+    def __len__(self) -> int:
+        return len(self.get())
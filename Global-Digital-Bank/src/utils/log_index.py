@@ -0,0 +1,219 @@
+import os
+import struct
+import threading
+from array import array
+from bisect import bisect_left
+from typing import Dict, List, Optional
+
+# one index entry: account number, byte offset of the log line
+ENTRY = struct.Struct("<qQ")
+
+
+class LogOffsetIndex:
+    """Persistent side index: account number -> byte offsets of its log lines.
+
+    - Entries are appended to `<log>.idx` as fixed-width records, and kept in
+      memory as one array of offsets per account.
+    - on_append() is registered as a LogWriter listener so the index follows
+      every write made by this process.
+    - catch_up() scans only the part of the log past the last indexed line,
+      which covers a missing index file, a crash, or lines appended by other
+      processes.
+    - Several processes may append to the same index file. Before indexing,
+      each one reads the entries the others appended since it last looked,
+      so a line is normally indexed once; entries that still end up twice
+      (two processes indexing the same line at the same time) or out of
+      order are merged into sorted, duplicate-free offsets in memory.
+    - lines() seeks straight to an account's records, newest first if asked,
+      with offset/limit pagination.
+    """
+
+    def __init__(self, log_path: str, index_path: Optional[str] = None) -> None:
+        self.log_path = log_path
+        self.index_path = index_path or log_path + ".idx"
+        self._offsets: Dict[int, array] = {}
+        self._lock = threading.RLock()
+        # byte position in the log up to which every line is indexed
+        self.covered = 0
+        # bytes of the index file merged into memory so far
+        self._index_read = 0
+        self._idx_file = None
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            size = os.path.getsize(self.index_path)
+        except FileNotFoundError:
+            size = 0
+        if size % ENTRY.size:
+            # drop a torn trailing entry
+            with open(self.index_path, "r+b") as f:
+                f.truncate(size - size % ENTRY.size)
+        try:
+            self._read_index()
+        except FileNotFoundError:
+            # log is gone; the index is meaningless
+            self._reset()
+        self.catch_up()
+
+    def _insert(self, acc_no: int, offset: int) -> bool:
+        # keeps every account's offsets sorted and unique; False if already there
+        offsets = self._offsets.setdefault(acc_no, array("Q"))
+        if not offsets or offset > offsets[-1]:
+            offsets.append(offset)
+            return True
+        i = bisect_left(offsets, offset)
+        if offsets[i] == offset:
+            return False
+        offsets.insert(i, offset)
+        return True
+
+    def _read_index(self) -> None:
+        """Merge entries appended to the index file since the last read (ours or other processes')."""
+        try:
+            size = os.path.getsize(self.index_path)
+        except FileNotFoundError:
+            size = 0
+        if size < self._index_read:
+            # another process started the index over; merge it again from the top
+            self._index_read = 0
+        end = size - size % ENTRY.size
+        if end <= self._index_read:
+            return
+        with open(self.index_path, "rb") as f:
+            f.seek(self._index_read)
+            data = f.read(end - self._index_read)
+        data = data[:len(data) - len(data) % ENTRY.size]
+        top = None
+        for acc_no, offset in ENTRY.iter_unpack(data):
+            self._insert(acc_no, offset)
+            if top is None or offset > top:
+                top = offset
+        self._index_read += len(data)
+        if top is not None and top >= self.covered:
+            # lines up to the highest indexed one are covered, by us or another process
+            with open(self.log_path, "rb") as log:
+                log.seek(top)
+                self.covered = top + len(log.readline())
+
+    def _reset(self) -> None:
+        self._offsets = {}
+        self.covered = 0
+        self._index_read = 0
+        if self._idx_file:
+            self._idx_file.close()
+            self._idx_file = None
+        open(self.index_path, "wb").close()
+
+    @staticmethod
+    def _account_of(line: bytes) -> Optional[int]:
+        parts = line.split(b"|")
+        if len(parts) < 5:
+            return None
+        try:
+            return int(parts[1].strip())
+        except ValueError:
+            return None
+
+    def _add(self, acc_no: int, offset: int) -> None:
+        if not self._insert(acc_no, offset):
+            return
+        if self._idx_file is None:
+            self._idx_file = open(self.index_path, "ab")
+        self._idx_file.write(ENTRY.pack(acc_no, offset))
+
+    def catch_up(self) -> int:
+        """Index every complete line past `covered`. Returns lines added."""
+        added = 0
+        with self._lock:
+            try:
+                size = os.path.getsize(self.log_path)
+            except OSError:
+                return 0
+            if size < self.covered:
+                # log was truncated or replaced: start over
+                self._reset()
+            self._read_index()
+            if size <= self.covered:
+                return 0
+            with open(self.log_path, "rb") as log:
+                log.seek(self.covered)
+                offset = self.covered
+                for line in log:
+                    if not line.endswith(b"\n"):
+                        # partial line still being written
+                        break
+                    acc_no = self._account_of(line)
+                    if acc_no is not None:
+                        self._add(acc_no, offset)
+                        added += 1
+                    offset += len(line)
+                self.covered = offset
+            if self._idx_file:
+                self._idx_file.flush()
+        return added
+
+    def on_append(self, offset: int, data: bytes) -> None:
+        with self._lock:
+            try:
+                self._read_index()
+            except FileNotFoundError:
+                pass
+            if offset != self.covered:
+                # someone else wrote in between; re-read from where we stopped
+                self.catch_up()
+                return
+            # a write may carry several lines (batched records)
+            pos = offset
+            for line in data.splitlines(keepends=True):
+                acc_no = self._account_of(line)
+                if acc_no is not None:
+                    self._add(acc_no, pos)
+                pos += len(line)
+            self.covered = offset + len(data)
+            if self._idx_file:
+                # visible to the other processes before they index the same lines
+                self._idx_file.flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._idx_file:
+                self._idx_file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._idx_file:
+                self._idx_file.close()
+                self._idx_file = None
+
+    def count(self, account_number) -> int:
+        self.catch_up()
+        return len(self._offsets.get(int(account_number), ()))
+
+    def lines(
+        self, account_number, newest_first: bool = False, offset: int = 0, limit: Optional[int] = None, _retry: bool = True
+    ) -> List[str]:
+        acc_no = int(account_number)
+        self.catch_up()
+        with self._lock:
+            positions = list(self._offsets.get(acc_no, ()))
+        if newest_first:
+            positions.reverse()
+        end = None if limit is None else offset + int(limit)
+        positions = positions[offset:end]
+        out = []
+        if not positions:
+            return out
+        with open(self.log_path, "rb") as log:
+            for pos in positions:
+                log.seek(pos)
+                line = log.readline()
+                if self._account_of(line) != acc_no:
+                    if not _retry:
+                        raise ValueError(f"Log index for {self.log_path} is inconsistent")
+                    # index and log disagree; rebuild once and retry
+                    with self._lock:
+                        self._reset()
+                    return self.lines(account_number, newest_first, offset, limit, _retry=False)
+                out.append(line.decode("utf-8").rstrip("\n"))
+        return out
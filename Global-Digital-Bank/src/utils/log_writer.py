@@ -0,0 +1,211 @@
+import atexit
+import os
+import queue
+import threading
+from typing import Callable, Dict, List, Optional
+
+
+class LogWriteError(OSError):
+    """A record (or fsync, or log listener) failed on the writer thread; raised by flush()."""
+
+
+class LogWriter:
+    """Buffered, background writer for the append-only log files.
+
+    - Callers enqueue (path, line) records; a daemon thread drains the queue
+      in batches and writes them to files it keeps open.
+    - The queue is bounded (`max_buffer`), so a stalled disk slows callers
+      down instead of growing memory without limit.
+    - fsync policy:
+        "never"   -> data reaches the OS page cache only
+        "batch"   -> fsync every file touched by a batch
+        "barrier" -> fsync only when someone waits on flush()
+    - flush() is a barrier: it returns once every record enqueued before the
+      call has been written (and fsynced unless the policy is "never").
+    - add_listener(path, fn) calls fn(offset, data) on the writer thread
+      after each record appended to `path` (offset = byte position of the
+      record), which lets side indexes follow the log as it grows.
+    - Errors never stop the writer thread. A failed write or listener call
+      is kept for the thread that enqueued the record, a failed fsync for
+      every caller waiting on that barrier; their next flush() raises
+      LogWriteError instead of returning.
+    """
+
+    FSYNC_POLICIES = ("never", "batch", "barrier")
+
+    def __init__(
+        self, max_buffer: int = 10000, batch_size: int = 512, fsync: str = "barrier", max_open_files: int = 16
+    ) -> None:
+        if fsync not in LogWriter.FSYNC_POLICIES:
+            raise ValueError(f"Invalid fsync policy: {fsync}. Choose from {list(LogWriter.FSYNC_POLICIES)}")
+        self.batch_size = int(batch_size)
+        self.fsync = fsync
+        self.max_open_files = int(max_open_files)
+        self._queue: "queue.Queue" = queue.Queue(maxsize=int(max_buffer))
+        self._files: Dict[str, object] = {}
+        self._listeners: Dict[str, List[Callable[[int, bytes], None]]] = {}
+        self._closed = False
+        # thread ident -> first error of a record that thread enqueued, until its next flush()
+        self._failures: Dict[int, BaseException] = {}
+        # flush or fsync error between barriers, reported to the next barrier
+        self._sync_error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+
+    def add_listener(self, path: str, fn: Callable[[int, bytes], None]) -> None:
+        self._listeners.setdefault(path, []).append(fn)
+
+    def write(self, path: str, line) -> None:
+        # line: str (written as UTF-8) or already-encoded bytes
+        if self._closed:
+            raise RuntimeError("LogWriter is closed")
+        self._queue.put(("write", path, line, threading.get_ident()))
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until everything written so far is on disk. False on timeout.
+
+        Raises LogWriteError when one of this thread's records could not be
+        written, or the fsync of this barrier failed.
+        """
+        if self._closed:
+            return True
+        done = threading.Event()
+        outcome: List[BaseException] = []
+        self._queue.put(("barrier", done, outcome, threading.get_ident()))
+        if not done.wait(timeout):
+            return False
+        if outcome:
+            raise LogWriteError(f"Log write failed: {outcome[0]}") from outcome[0]
+        return True
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        done = threading.Event()
+        self._queue.put(("stop", done, None, None))
+        self._closed = True
+        done.wait()
+
+    def _open(self, path: str, touched, unsynced):
+        f = self._files.get(path)
+        if f is None:
+            if len(self._files) >= self.max_open_files:
+                # segmented logs keep creating files; close the least recently opened one
+                oldest = next(iter(self._files))
+                old = self._files.pop(oldest)
+                old.flush()
+                if self.fsync != "never" and old in unsynced:
+                    os.fsync(old.fileno())
+                touched.discard(old)
+                unsynced.discard(old)
+                old.close()
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            # binary append so listeners get byte offsets
+            f = open(path, "ab")
+            self._files[path] = f
+        return f
+
+    def _sync(self, touched, unsynced, durable: bool) -> Optional[BaseException]:
+        # touched: written since the last flush(); unsynced: written since the last fsync.
+        # Returns the first error; the remaining files are still synced.
+        error = None
+        for f in touched:
+            try:
+                f.flush()
+            except Exception as exc:
+                error = error or exc
+        unsynced.update(touched)
+        touched.clear()
+        if durable and self.fsync != "never":
+            for f in unsynced:
+                try:
+                    os.fsync(f.fileno())
+                except Exception as exc:
+                    error = error or exc
+            unsynced.clear()
+        return error
+
+    def _fail(self, ident: int, error: BaseException) -> None:
+        self._failures.setdefault(ident, error)
+
+    def _drop(self, path: str, touched, unsynced) -> None:
+        # forget a file whose write failed; the next record for it reopens the path
+        f = self._files.pop(path, None)
+        if f is None:
+            return
+        touched.discard(f)
+        unsynced.discard(f)
+        try:
+            f.close()
+        except Exception:
+            pass
+
+    def _append(self, path: str, line, ident: int, touched, unsynced) -> None:
+        try:
+            f = self._open(path, touched, unsynced)
+            data = line if isinstance(line, bytes) else line.encode("utf-8")
+            f.write(data)
+            touched.add(f)
+            listeners = self._listeners.get(path)
+            if listeners:
+                f.flush()
+                # the file size, not tell(), so appends by other processes are accounted for
+                offset = os.fstat(f.fileno()).st_size - len(data)
+        except Exception as exc:
+            self._fail(ident, exc)
+            self._drop(path, touched, unsynced)
+            return
+        for fn in listeners or ():
+            # one broken side index must not stop the log or the other listeners
+            try:
+                fn(offset, data)
+            except Exception as exc:
+                self._fail(ident, exc)
+
+    def _run(self) -> None:
+        touched = set()
+        unsynced = set()
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            for kind, a, b, ident in batch:
+                if kind == "write":
+                    self._append(a, b, ident, touched, unsynced)
+                elif kind == "barrier":
+                    error = self._sync(touched, unsynced, durable=True) or self._sync_error
+                    self._sync_error = None
+                    error = self._failures.pop(ident, None) or error
+                    if error is not None:
+                        b.append(error)
+                    a.set()
+                elif kind == "stop":
+                    self._sync(touched, unsynced, durable=True)
+                    for f in self._files.values():
+                        try:
+                            f.close()
+                        except Exception:
+                            pass
+                    self._files.clear()
+                    a.set()
+                    return
+            error = self._sync(touched, unsynced, durable=self.fsync == "batch")
+            if error is not None and self._sync_error is None:
+                self._sync_error = error
+
+
+_writer: Optional[LogWriter] = None
+_writer_lock = threading.Lock()
+
+
+def get_log_writer() -> LogWriter:
+    """Process-wide writer shared by all log_* helpers, started on first use."""
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = LogWriter()
+            atexit.register(_writer.close)
+        return _writer
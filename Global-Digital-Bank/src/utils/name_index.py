@@ -0,0 +1,205 @@
+from bisect import bisect_left, insort
+from typing import Dict, List, Optional, Set
+
+from src.models.account_table import AccountTable
+
+
+def normalize(name: str) -> str:
+    """Lowercase and collapse whitespace: "  Ravi  KUMAR " -> "ravi kumar"."""
+    return " ".join(str(name).lower().split())
+
+
+def trigrams(token: str) -> Set[str]:
+    padded = f"  {token} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Edit distance counting a swap of neighbouring letters as one edit
+    ("rvai" -> "ravi" is 1), or limit + 1 once it is known to exceed limit.
+
+    Only the band of cells within `limit` of the diagonal is computed.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    over = limit + 1
+    prev2 = None
+    prev = [j if j <= limit else over for j in range(len(b) + 1)]
+    for i in range(1, len(a) + 1):
+        cur = [over] * (len(b) + 1)
+        if i <= limit:
+            cur[0] = i
+        lo, hi = max(1, i - limit), min(len(b), i + limit)
+        for j in range(lo, hi + 1):
+            d = prev[j - 1] + (a[i - 1] != b[j - 1])
+            if prev[j] + 1 < d:
+                d = prev[j] + 1
+            if cur[j - 1] + 1 < d:
+                d = cur[j - 1] + 1
+            if prev2 is not None and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1] and prev2[j - 2] + 1 < d:
+                d = prev2[j - 2] + 1
+            cur[j] = d if d < over else over
+        if min(cur[lo - 1:hi + 1]) >= over:
+            return over
+        prev2, prev = prev, cur
+    return prev[-1]
+
+
+class NameIndex:
+    """In-memory index of account holder names for admin search.
+
+    - exact(): full-name lookup, case and whitespace insensitive.
+    - prefix(): every query word must match a name word; the last one may be
+      a prefix ("ravi ku" finds "Ravi Kumar"). Words are kept sorted, so a
+      prefix is a bisect plus a short scan.
+    - fuzzy(): typo tolerant ("rvai kumr"); candidate words come from shared
+      trigrams and are confirmed by edit distance.
+    - The index listens to its AccountTable, so create_account, renames and
+      imports keep it current without a rebuild.
+    """
+
+    def __init__(self, table: AccountTable) -> None:
+        self.table = table
+        self._full: Dict[str, Set[int]] = {}
+        self._tokens: Dict[str, Set[int]] = {}
+        self._sorted_tokens: List[str] = []
+        self._trigrams: Dict[str, Set[str]] = {}
+        # words by length, for words too short for trigram filtering
+        self._by_length: Dict[int, Set[str]] = {}
+        for row in table._index.values():
+            self._add(row, table.name[row])
+        table.add_listener(self)
+
+    # -------- Updates --------
+    def _add(self, row: int, name: str) -> None:
+        key = normalize(name)
+        self._full.setdefault(key, set()).add(row)
+        for token in set(key.split()):
+            rows = self._tokens.get(token)
+            if rows is None:
+                rows = self._tokens[token] = set()
+                insort(self._sorted_tokens, token)
+                self._by_length.setdefault(len(token), set()).add(token)
+                for gram in trigrams(token):
+                    self._trigrams.setdefault(gram, set()).add(token)
+            rows.add(row)
+
+    def _remove(self, row: int, name: str) -> None:
+        key = normalize(name)
+        rows = self._full.get(key)
+        if rows is not None:
+            rows.discard(row)
+            if not rows:
+                del self._full[key]
+        for token in set(key.split()):
+            rows = self._tokens.get(token)
+            if rows is None:
+                continue
+            rows.discard(row)
+            if not rows:
+                # last holder of this word: drop it from the sorted list and trigrams
+                del self._tokens[token]
+                del self._sorted_tokens[bisect_left(self._sorted_tokens, token)]
+                self._by_length[len(token)].discard(token)
+                for gram in trigrams(token):
+                    words = self._trigrams.get(gram)
+                    if words is not None:
+                        words.discard(token)
+                        if not words:
+                            del self._trigrams[gram]
+
+    def on_add(self, row: int) -> None:
+        self._add(row, self.table.name[row])
+
+    def on_change(self, row: int, field: str, old) -> None:
+        if field == "name":
+            self._remove(row, old)
+            self._add(row, self.table.name[row])
+
+    def on_remove(self, row: int) -> None:
+        self._remove(row, self.table.name[row])
+
+    # -------- Lookups (all return sorted rows) --------
+    def exact(self, name: str) -> List[int]:
+        return sorted(self._full.get(normalize(name), ()))
+
+    def _prefix_tokens(self, prefix: str) -> List[str]:
+        out = []
+        i = bisect_left(self._sorted_tokens, prefix)
+        while i < len(self._sorted_tokens) and self._sorted_tokens[i].startswith(prefix):
+            out.append(self._sorted_tokens[i])
+            i += 1
+        return out
+
+    def prefix(self, text: str, limit: Optional[int] = None) -> List[int]:
+        words = normalize(text).split()
+        if not words:
+            return []
+        rows: Optional[Set[int]] = None
+        for word in words[:-1]:
+            rows = self._intersect(rows, self._tokens.get(word, set()))
+        last: Set[int] = set()
+        for token in self._prefix_tokens(words[-1]):
+            last |= self._tokens[token]
+        rows = self._intersect(rows, last)
+        return sorted(rows)[:limit]
+
+    def _similar_tokens(self, word: str, max_edits: int) -> Dict[str, int]:
+        """Indexed words within max_edits of word, with their distance."""
+        grams = trigrams(word)
+        # an edit (or a swap of two letters) touches at most 4 trigrams
+        needed = len(grams) - 4 * max_edits
+        if needed <= 0:
+            # short word: no trigram has to survive, compare against words of similar length
+            candidates = set()
+            for length in range(len(word) - max_edits, len(word) + max_edits + 1):
+                candidates |= self._by_length.get(length, set())
+        else:
+            shared: Dict[str, int] = {}
+            for gram in grams:
+                for token in self._trigrams.get(gram, ()):
+                    shared[token] = shared.get(token, 0) + 1
+            candidates = {token for token, count in shared.items() if count >= needed}
+        out = {}
+        for token in candidates:
+            distance = edit_distance(word, token, max_edits)
+            if distance <= max_edits:
+                out[token] = distance
+        return out
+
+    def fuzzy(self, text: str, max_edits: Optional[int] = None, limit: Optional[int] = None) -> List[int]:
+        """Rows whose name has a close match for every query word, closest first."""
+        words = normalize(text).split()
+        if not words:
+            return []
+        rows: Optional[Set[int]] = None
+        cost: Dict[int, int] = {}
+        for word in words:
+            edits = max_edits if max_edits is not None else (1 if len(word) <= 4 else 2)
+            matched: Dict[int, int] = {}
+            for token, distance in self._similar_tokens(word, edits).items():
+                for row in self._tokens[token]:
+                    if distance < matched.get(row, edits + 1):
+                        matched[row] = distance
+            rows = self._intersect(rows, set(matched))
+            for row in rows:
+                cost[row] = cost.get(row, 0) + matched[row]
+        return sorted(rows, key=lambda r: (cost[r], r))[:limit]
+
+    def search(self, text: str, limit: Optional[int] = None) -> List[int]:
+        """Exact matches, then prefix matches, then (if still short) fuzzy matches, without repeats."""
+        out: List[int] = []
+        seen: Set[int] = set()
+        for lookup in (self.exact, self.prefix, self.fuzzy):
+            if lookup == self.fuzzy and out and (limit is None or len(out) >= limit):
+                # typo tolerance is the fallback, only needed when the rest came up short
+                break
+            for row in lookup(text):
+                if row not in seen:
+                    seen.add(row)
+                    out.append(row)
+        return out[:limit]
+
+    @staticmethod
+    def _intersect(rows: Optional[Set[int]], other: Set[int]) -> Set[int]:
+        return set(other) if rows is None else rows & other
@@ -0,0 +1,218 @@
+from bisect import bisect_left, bisect_right, insort
+from typing import List, Optional, Tuple
+
+from src.models.account_table import AccountTable
+
+
+class _Fenwick:
+    """Prefix sums over bucket sizes, so a bucket's starting position is O(log B)."""
+
+    def __init__(self, sizes: List[int]) -> None:
+        self.tree = [0] * (len(sizes) + 1)
+        for i, size in enumerate(sizes):
+            self.add(i, size)
+
+    def add(self, i: int, delta: int) -> None:
+        i += 1
+        while i < len(self.tree):
+            self.tree[i] += delta
+            i += i & -i
+
+    def prefix(self, i: int) -> int:
+        """Sum of sizes of buckets [0, i)."""
+        total = 0
+        while i > 0:
+            total += self.tree[i]
+            i -= i & -i
+        return total
+
+
+class OrderIndex:
+    """Accounts kept sorted by one numeric column ("balance", "age" or
+    "account_number").
+
+    - Keys are (value, row) pairs in sorted buckets of a few hundred entries;
+      a Fenwick tree over the bucket sizes turns a position inside a bucket
+      into a global rank.
+    - The index listens to its AccountTable, so every balance change made by
+      deposit, withdraw, transfers, loan credits or closing an account moves
+      one key (O(log N + bucket size)) instead of re-sorting everything.
+    - smallest(k) / largest(k) walk k keys from either end: O(log N + k).
+      Equal values come out in table order, as sorted() over the dict did.
+    - rank(value) and percentile(value) count keys with bisect + Fenwick.
+    - page(after) continues a listing from the last key of the previous
+      page (a cursor), so paging never re-walks earlier pages.
+    """
+
+    LOAD = 512
+
+    def __init__(self, table: AccountTable, column: str) -> None:
+        if column not in ("balance", "age", "account_number"):
+            raise ValueError(f"Cannot index column {column}")
+        self.table = table
+        self.column = column
+        self._col = getattr(table, column)
+        self.rebuild()
+        table.add_listener(self)
+
+    # -------- Building --------
+    def rebuild(self) -> None:
+        col = self._col
+        keys = sorted((col[row], row) for row in self.table._index.values())
+        self._buckets: List[List[Tuple]] = [keys[i:i + OrderIndex.LOAD] for i in range(0, len(keys), OrderIndex.LOAD)]
+        self._reindex()
+        self._len = len(keys)
+
+    def _reindex(self) -> None:
+        self._maxes = [bucket[-1] for bucket in self._buckets]
+        self._fenwick = _Fenwick([len(bucket) for bucket in self._buckets])
+
+    def __len__(self) -> int:
+        return self._len
+
+    # -------- Updates --------
+    def _insert(self, key: Tuple) -> None:
+        self._len += 1
+        if not self._buckets:
+            self._buckets.append([key])
+            self._reindex()
+            return
+        i = bisect_left(self._maxes, key)
+        if i == len(self._buckets):
+            i -= 1
+        bucket = self._buckets[i]
+        insort(bucket, key)
+        self._maxes[i] = bucket[-1]
+        if len(bucket) > 2 * OrderIndex.LOAD:
+            self._buckets[i:i + 1] = [bucket[:OrderIndex.LOAD], bucket[OrderIndex.LOAD:]]
+            self._reindex()
+        else:
+            self._fenwick.add(i, 1)
+
+    def _delete(self, key: Tuple) -> None:
+        i = bisect_left(self._maxes, key)
+        if i == len(self._buckets):
+            return
+        bucket = self._buckets[i]
+        j = bisect_left(bucket, key)
+        if j == len(bucket) or bucket[j] != key:
+            return
+        del bucket[j]
+        self._len -= 1
+        if not bucket:
+            del self._buckets[i]
+            self._reindex()
+        else:
+            self._maxes[i] = bucket[-1]
+            self._fenwick.add(i, -1)
+
+    def on_add(self, row: int) -> None:
+        self._insert((self._col[row], row))
+
+    def on_change(self, row: int, field: str, old) -> None:
+        if field == self.column:
+            self._delete((old, row))
+            self._insert((self._col[row], row))
+
+    def on_remove(self, row: int) -> None:
+        self._delete((self._col[row], row))
+
+    # -------- Queries --------
+    def smallest(self, k: int) -> List[int]:
+        """Rows of the k smallest values."""
+        out: List[int] = []
+        for bucket in self._buckets:
+            for _, row in bucket:
+                if len(out) >= k:
+                    return out
+                out.append(row)
+        return out
+
+    def largest(self, k: int) -> List[int]:
+        """Rows of the k largest values; ties in table order."""
+        out: List[int] = []
+        group: List[int] = []
+        group_value = None
+        for bucket in reversed(self._buckets):
+            for value, row in reversed(bucket):
+                if value != group_value:
+                    # a run of equal values arrives highest row first
+                    out.extend(reversed(group))
+                    if len(out) >= k:
+                        return out[:k]
+                    group, group_value = [], value
+                group.append(row)
+        out.extend(reversed(group))
+        return out[:k]
+
+    def count_below(self, value) -> int:
+        """Number of accounts with a value strictly below `value`."""
+        return self._position((value, -1))
+
+    def count_at_most(self, value) -> int:
+        return self._position((value, float("inf")))
+
+    def _position(self, key: Tuple) -> int:
+        i = bisect_left(self._maxes, key)
+        if i == len(self._buckets):
+            return self._len
+        return self._fenwick.prefix(i) + bisect_left(self._buckets[i], key)
+
+    def rank(self, value) -> int:
+        """1-based rank from the top (1 = highest); equal values share a rank."""
+        return self._len - self.count_at_most(value) + 1
+
+    def percentile(self, value) -> Optional[float]:
+        """Share of accounts with a value at or below `value`, in percent."""
+        if not self._len:
+            return None
+        return round(100.0 * self.count_at_most(value) / self._len, 2)
+
+    def between(self, low, high, limit: Optional[int] = None) -> List[int]:
+        """Rows with low <= value <= high, in ascending order."""
+        out: List[int] = []
+        key = (low, -1)
+        i = bisect_left(self._maxes, key)
+        if i == len(self._buckets):
+            return out
+        j = bisect_left(self._buckets[i], key)
+        for bucket in self._buckets[i:]:
+            for value, row in bucket[j:]:
+                if value > high or (limit is not None and len(out) >= limit):
+                    return out
+                out.append(row)
+            j = 0
+        return out
+
+    def page(self, after: Optional[Tuple] = None, limit: int = 50, descending: bool = False) -> List[Tuple]:
+        """Up to `limit` (value, row) keys following the key `after` in the given order."""
+        out: List[Tuple] = []
+        if not self._buckets or limit <= 0:
+            return out
+        if not descending:
+            i = 0 if after is None else bisect_right(self._maxes, after)
+            j = 0 if after is None or i == len(self._buckets) else bisect_right(self._buckets[i], after)
+            while i < len(self._buckets):
+                bucket = self._buckets[i]
+                take = bucket[j:j + limit - len(out)]
+                out.extend(take)
+                if len(out) >= limit:
+                    break
+                i, j = i + 1, 0
+            return out
+        if after is None:
+            i = len(self._buckets) - 1
+            j = len(self._buckets[i])
+        else:
+            i = min(bisect_left(self._maxes, after), len(self._buckets) - 1)
+            j = bisect_left(self._buckets[i], after)
+        while i >= 0:
+            bucket = self._buckets[i]
+            take = bucket[max(0, j - (limit - len(out))):j]
+            out.extend(reversed(take))
+            if len(out) >= limit:
+                break
+            i -= 1
+            if i >= 0:
+                j = len(self._buckets[i])
+        return out
@@ -0,0 +1,171 @@
+import calendar
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+
+from src.utils.file_manager import ACCOUNT_FILE
+
+ROLLUP_DB = os.path.join(os.path.dirname(ACCOUNT_FILE), "rollups.db")
+
+# how each operation shows up on the Monthly Analytics chart
+INFLOW_OPS = ("DEPOSIT", "TRANSFER_IN", "LOAN_CREDIT")
+OUTFLOW_OPS = ("WITHDRAW", "WITHDRAW_FULL", "TRANSFER_OUT")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS daily_rollups (
+    account INTEGER NOT NULL,
+    day TEXT NOT NULL,
+    op TEXT NOT NULL,
+    amount REAL NOT NULL DEFAULT 0,
+    count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (account, day, op)
+) WITHOUT ROWID;
+"""
+
+UPSERT = (
+    "INSERT INTO daily_rollups (account, day, op, amount, count) VALUES (?, ?, ?, ?, ?) "
+    "ON CONFLICT(account, day, op) DO UPDATE SET amount = amount + excluded.amount, count = count + excluded.count"
+)
+
+
+class DailyRollups:
+    """Per-(account, day, operation) totals and counts, kept in SQLite.
+
+    - add() is called for every logged transaction. It only adds to totals
+      buffered in memory; flush() commits them in one transaction, which
+      BankingService does with every account save. The queries below flush
+      first, so they always see every transaction added so far and the
+      dashboard never has to read the transaction log.
+    - month() returns per-day inflow/outflow for one account; its cost
+      depends on the days in the month, not on how long the log is.
+    - A fresh database is back-filled from the existing log once.
+    """
+
+    # buffered (account, day, op) totals that force a flush from add()
+    MAX_PENDING = 10000
+
+    def __init__(self, db_path: str = ROLLUP_DB) -> None:
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+        # (account, day, op) -> [amount, count] not committed yet
+        self._pending: Dict[tuple, list] = {}
+        self._pending_lock = threading.Lock()
+
+    @staticmethod
+    def _amount(amount) -> float:
+        try:
+            return float(amount) if amount not in (None, "None") else 0.0
+        except (TypeError, ValueError):
+            return 0.0
+
+    def is_empty(self) -> bool:
+        self.flush()
+        return self.conn.execute("SELECT 1 FROM daily_rollups LIMIT 1").fetchone() is None
+
+    def add(self, account_number, operation: str, amount, day: Optional[str] = None) -> None:
+        self.add_many(((account_number, operation, amount),), day)
+
+    def add_many(self, records: Iterable[tuple], day: Optional[str] = None) -> None:
+        """add() for many (account_number, operation, amount) records."""
+        day = day or datetime.now().strftime("%Y-%m-%d")
+        with self._pending_lock:
+            for acc, op, amount in records:
+                entry = self._pending.setdefault((int(acc), day, op), [0.0, 0])
+                entry[0] += self._amount(amount)
+                entry[1] += 1
+            full = len(self._pending) >= self.MAX_PENDING
+        if full:
+            # nobody has saved in a long while (deferred flush policy)
+            self.flush()
+
+    def flush(self) -> int:
+        """Commit the buffered totals in one transaction. Returns rows written."""
+        with self._lock:
+            with self._pending_lock:
+                pending, self._pending = self._pending, {}
+            if not pending:
+                return 0
+            rows = [(acc, day, op, amt, cnt) for (acc, day, op), (amt, cnt) in pending.items()]
+            try:
+                with self.conn:
+                    self.conn.executemany(UPSERT, rows)
+            except sqlite3.Error:
+                # keep them for the next flush
+                with self._pending_lock:
+                    for key, (amt, cnt) in pending.items():
+                        entry = self._pending.setdefault(key, [0.0, 0])
+                        entry[0] += amt
+                        entry[1] += cnt
+                raise
+        return len(rows)
+
+    def rebuild(self, lines: Iterable[str]) -> int:
+        """Replace the table with totals computed from log lines. Returns lines used."""
+        totals: Dict[tuple, list] = {}
+        used = 0
+        for line in lines:
+            parts = [p.strip() for p in line.split("|")]
+            if len(parts) < 5:
+                continue
+            try:
+                key = (int(parts[1]), parts[0][:10], parts[2])
+            except ValueError:
+                continue
+            entry = totals.setdefault(key, [0.0, 0])
+            entry[0] += self._amount(parts[3])
+            entry[1] += 1
+            used += 1
+        with self._lock, self.conn:
+            with self._pending_lock:
+                # the log has every transaction they were added for
+                self._pending.clear()
+            self.conn.execute("DELETE FROM daily_rollups")
+            self.conn.executemany(
+                "INSERT INTO daily_rollups (account, day, op, amount, count) VALUES (?, ?, ?, ?, ?)",
+                [(acc, day, op, amt, cnt) for (acc, day, op), (amt, cnt) in totals.items()],
+            )
+        return used
+
+    def month(self, account_number, year: int, month: int) -> Dict[int, Dict[str, float]]:
+        """{day_of_month: {"inflow": .., "outflow": ..}} for every day of the month."""
+        days_in_month = calendar.monthrange(int(year), int(month))[1]
+        out = {day: {"inflow": 0.0, "outflow": 0.0} for day in range(1, days_in_month + 1)}
+        start = f"{int(year):04d}-{int(month):02d}-01"
+        end = f"{int(year):04d}-{int(month):02d}-{days_in_month:02d}"
+        self.flush()
+        cur = self.conn.execute(
+            "SELECT day, op, amount FROM daily_rollups WHERE account = ? AND day BETWEEN ? AND ?",
+            (int(account_number), start, end),
+        )
+        for day, op, amount in cur:
+            if op in INFLOW_OPS:
+                out[int(day[8:10])]["inflow"] += amount
+            elif op in OUTFLOW_OPS:
+                out[int(day[8:10])]["outflow"] += amount
+        return out
+
+    def counts(self, account_number, start: str, end: str) -> Dict[str, int]:
+        """Number of transactions per operation for an account between two days."""
+        self.flush()
+        cur = self.conn.execute(
+            "SELECT op, SUM(count) FROM daily_rollups WHERE account = ? AND day BETWEEN ? AND ? GROUP BY op",
+            (int(account_number), start, end),
+        )
+        return {op: int(n) for op, n in cur}
+
+    def last_active(self) -> Dict[int, str]:
+        """{account: day of its latest transaction}, for dormancy checks."""
+        self.flush()
+        cur = self.conn.execute("SELECT account, MAX(day) FROM daily_rollups GROUP BY account")
+        return {int(acc): day for acc, day in cur}
+
+    def close(self) -> None:
+        self.flush()
+        self.conn.close()
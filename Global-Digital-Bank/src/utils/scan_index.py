@@ -0,0 +1,141 @@
+import heapq
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from src.models.account_table import AccountTable
+from src.models.lazy_account_table import LazyAccountTable
+from src.utils.aggregates import lazy_totals
+from src.utils.name_index import NameIndex, edit_distance, normalize
+
+# Stand-ins for OrderIndex, NameIndex and StatusPartitions when the bank runs
+# with lazy loading and never holds every account in memory. Same queries,
+# answered by streaming the accounts (LazyAccountTable.scan) each time, so
+# they cost a full pass instead of a lookup; counts are the exception (see
+# LazyAccountTable.totals). Rows are account numbers here;
+# LazyAccountTable.view() turns them into accounts.
+
+FIELD = {field: i for i, field in enumerate(AccountTable.FIELDS)}
+
+
+class ScanOrderIndex:
+    """OrderIndex queries over (value, account number) keys."""
+
+    def __init__(self, table: LazyAccountTable, column: str) -> None:
+        if column not in ("balance", "age", "account_number"):
+            raise ValueError(f"Cannot index column {column}")
+        self.table = table
+        self.column = column
+        self._field = FIELD[column]
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+    def _keys(self) -> Iterator[Tuple]:
+        i, n = self._field, FIELD["account_number"]
+        return ((fields[i], fields[n]) for fields in self.table.scan())
+
+    def smallest(self, k: int) -> List[int]:
+        return [no for _, no in heapq.nsmallest(k, self._keys())]
+
+    def largest(self, k: int) -> List[int]:
+        # equal values in account number order, like the in-memory index
+        return [no for _, no in heapq.nsmallest(k, ((-value, no) for value, no in self._keys()))]
+
+    def count_at_most(self, value) -> int:
+        return sum(1 for v, _ in self._keys() if v <= value)
+
+    def rank(self, value) -> int:
+        """1-based rank from the top (1 = highest); equal values share a rank."""
+        return sum(1 for v, _ in self._keys() if v > value) + 1
+
+    def percentile(self, value) -> Optional[float]:
+        total = len(self)
+        if not total:
+            return None
+        return round(100.0 * self.count_at_most(value) / total, 2)
+
+    def between(self, low, high, limit: Optional[int] = None) -> List[int]:
+        keys = sorted(key for key in self._keys() if low <= key[0] <= high)
+        return [no for _, no in keys[:limit]]
+
+    def page(self, after: Optional[Tuple] = None, limit: int = 50, descending: bool = False) -> List[Tuple]:
+        keys = self._keys()
+        if descending:
+            if after is not None:
+                keys = (key for key in keys if key < after)
+            return heapq.nlargest(limit, keys)
+        if after is not None:
+            keys = (key for key in keys if key > after)
+        return heapq.nsmallest(limit, keys)
+
+
+class ScanNameIndex:
+    """NameIndex lookups (exact, prefix, fuzzy, search) by scanning the names."""
+
+    def __init__(self, table: LazyAccountTable) -> None:
+        self.table = table
+
+    def _names(self) -> Iterator[Tuple[int, str]]:
+        n, name = FIELD["account_number"], FIELD["name"]
+        return ((fields[n], normalize(fields[name])) for fields in self.table.scan())
+
+    def exact(self, name: str) -> List[int]:
+        wanted = normalize(name)
+        return sorted(no for no, full in self._names() if full == wanted)
+
+    def prefix(self, text: str, limit: Optional[int] = None) -> List[int]:
+        words = normalize(text).split()
+        if not words:
+            return []
+        found = []
+        for no, full in self._names():
+            tokens = full.split()
+            if all(w in tokens for w in words[:-1]) and any(t.startswith(words[-1]) for t in tokens):
+                found.append(no)
+        return sorted(found)[:limit]
+
+    def fuzzy(self, text: str, max_edits: Optional[int] = None, limit: Optional[int] = None) -> List[int]:
+        words = normalize(text).split()
+        if not words:
+            return []
+        edits = [max_edits if max_edits is not None else (1 if len(w) <= 4 else 2) for w in words]
+        # names repeat, so each distinct word is compared once per query word
+        distances: List[Dict[str, int]] = [{} for _ in words]
+        cost: Dict[int, int] = {}
+        for no, full in self._names():
+            tokens = set(full.split())
+            total = 0
+            for word, limit_edits, seen in zip(words, edits, distances):
+                best = limit_edits + 1
+                for token in tokens:
+                    d = seen.get(token)
+                    if d is None:
+                        d = seen[token] = edit_distance(word, token, limit_edits)
+                    best = min(best, d)
+                if best > limit_edits:
+                    break
+                total += best
+            else:
+                cost[no] = total
+        return sorted(cost, key=lambda no: (cost[no], no))[:limit]
+
+    # exact, then prefix, then fuzzy matches, as NameIndex.search
+    search = NameIndex.search
+
+
+class ScanStatusPartitions:
+    """StatusPartitions counts (from the table's running totals) and listings (by scanning)."""
+
+    def __init__(self, table: LazyAccountTable) -> None:
+        self.table = table
+
+    def count(self, status: Optional[str] = None, account_type: Optional[str] = None, exclude: Optional[str] = None) -> int:
+        if status is None and account_type is None and exclude is None:
+            return len(self.table)
+        return lazy_totals(self.table, status, account_type, exclude)[0]
+
+    def rows(self, status: Optional[str] = None, exclude: Optional[str] = None) -> List[int]:
+        s, n = FIELD["status"], FIELD["account_number"]
+        return sorted(
+            fields[n] for fields in self.table.scan()
+            if (status is None or fields[s] == status) and (exclude is None or fields[s] != exclude)
+        )
@@ -0,0 +1,382 @@
+import gzip
+import json
+import os
+import shutil
+import threading
+from datetime import datetime, timedelta
+from typing import BinaryIO, Callable, Dict, Iterator, List, Optional, Tuple
+
+from src.utils.log_index import LogOffsetIndex
+
+
+def read_forward(f: BinaryIO, offset: int, limit: int) -> Tuple[List[str], int]:
+    """Up to `limit` complete lines starting at byte `offset`.
+
+    Returns the lines and the offset just past the last one.
+    """
+    f.seek(offset)
+    lines: List[str] = []
+    while len(lines) < limit:
+        line = f.readline()
+        if not line.endswith(b"\n"):
+            # end of file, or a line still being written
+            break
+        offset += len(line)
+        if line.strip():
+            lines.append(line.decode("utf-8").rstrip("\n"))
+    return lines, offset
+
+
+def read_backward(f: BinaryIO, end: int, limit: int, block: int = 1 << 16) -> Tuple[List[str], int]:
+    """Up to `limit` complete lines ending at or before byte `end`, newest first.
+
+    Reads the file backwards in blocks. Returns the lines and the offset
+    where the oldest of them starts.
+    """
+    lines: List[str] = []
+    pos = end
+    data = b""
+    trimmed = False
+    while len(lines) < limit:
+        if not trimmed:
+            # drop a torn last line (no newline yet)
+            nl = data.rfind(b"\n")
+            if nl != -1 or pos == 0:
+                data = data[:nl + 1]
+                trimmed = True
+        cut = data.rfind(b"\n", 0, len(data) - 1) if trimmed else -1
+        if cut == -1 and pos > 0:
+            step = min(block, pos)
+            pos -= step
+            f.seek(pos)
+            data = f.read(step) + data
+            continue
+        if not data:
+            break
+        line = data[cut + 1:]
+        data = data[:cut + 1]
+        if line.strip():
+            lines.append(line.decode("utf-8").rstrip("\n"))
+    return lines, pos + len(data)
+
+
+class SegmentedLog:
+    """A transaction log split into daily or monthly segment files.
+
+    - `data/user_transactions.log` becomes `data/user_transactions/2025-09.log`
+      (period "month") or `.../2025-09-04.log` (period "day"), listed in
+      `data/user_transactions/manifest.json`.
+    - Readers pass a date range and only the segments overlapping it are opened.
+    - Segments older than `archive_after_days` are gzipped; readers open them
+      transparently. A rollover starts that on a background thread, so
+      writers never wait for the compression. Live segments get a
+      LogOffsetIndex for account lookups.
+    - An existing single-file log is split into segments once, on first use,
+      and kept next to them as `<name>.log.migrated`.
+    """
+
+    # length of the "YYYY-MM-DD HH:MM:SS" prefix that names a segment
+    PERIODS = {"day": 10, "month": 7}
+
+    def __init__(self, base_path: str, period: str = "month", archive_after_days: int = 90) -> None:
+        if period not in SegmentedLog.PERIODS:
+            raise ValueError(f"Invalid period: {period}. Choose from {list(SegmentedLog.PERIODS)}")
+        self.base_path = base_path
+        self.dir = os.path.splitext(base_path)[0]
+        self.manifest_path = os.path.join(self.dir, "manifest.json")
+        self.period = period
+        self.archive_after_days = int(archive_after_days)
+        # called with a segment path the first time this process writes to it
+        self.on_new_path: Optional[Callable[[str], None]] = None
+        self._segments: Dict[str, Dict] = {}
+        self._indexes: Dict[str, LogOffsetIndex] = {}
+        self._seen_paths = set()
+        self._current_key: Optional[str] = None
+        self._archiver: Optional[threading.Thread] = None
+        self._lock = threading.RLock()
+        os.makedirs(self.dir, exist_ok=True)
+        self._load_manifest()
+        self._migrate_legacy()
+
+    # -------- Manifest --------
+    def _load_manifest(self) -> None:
+        try:
+            with open(self.manifest_path, "r") as f:
+                manifest = json.load(f)
+            # the period of existing segments wins over the constructor argument
+            self.period = manifest.get("period", self.period)
+            self._segments = manifest.get("segments", {})
+        except (FileNotFoundError, ValueError):
+            self._segments = {}
+        # pick up segments created by other processes or missing from a stale manifest
+        names = set(os.listdir(self.dir))
+        for fname in sorted(names):
+            key = fname.split(".")[0]
+            if fname.endswith(".log"):
+                self._segments[key] = {"file": fname, "archived": False}
+                if fname + ".gz" in names:
+                    # left by an archive run that did not finish; the live file is complete
+                    self._remove(os.path.join(self.dir, fname + ".gz"))
+            elif fname.endswith(".log.gz"):
+                if fname[:-3] not in names:
+                    self._segments[key] = {"file": fname, "archived": True}
+            elif ".log.gz." in fname and fname.endswith(".tmp"):
+                live = fname.split(".gz.")[0]
+                if live in names:
+                    # still being compressed, or abandoned before the live file was removed
+                    continue
+                if live + ".gz" in names:
+                    self._remove(os.path.join(self.dir, fname))
+                else:
+                    # the live file was removed right after this was written: it is complete
+                    os.replace(os.path.join(self.dir, fname), os.path.join(self.dir, live + ".gz"))
+                    self._segments[key] = {"file": live + ".gz", "archived": True}
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def _write_manifest(self) -> None:
+        tmp = self.manifest_path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({"period": self.period, "segments": self._segments}, f, indent=1, sort_keys=True)
+        os.replace(tmp, self.manifest_path)
+
+    def _migrate_legacy(self) -> None:
+        if not os.path.exists(self.base_path):
+            return
+        n = SegmentedLog.PERIODS[self.period]
+        out = {}
+        with open(self.base_path, "r") as legacy:
+            for line in legacy:
+                if not line.strip():
+                    continue
+                key = line[:n]
+                if key not in out:
+                    out[key] = open(self.path_for(key), "a")
+                out[key].write(line if line.endswith("\n") else line + "\n")
+        for f in out.values():
+            f.close()
+        os.replace(self.base_path, self.base_path + ".migrated")
+        if os.path.exists(self.base_path + ".idx"):
+            os.remove(self.base_path + ".idx")
+
+    # -------- Segments --------
+    def key_for(self, timestamp: str) -> str:
+        return timestamp[: SegmentedLog.PERIODS[self.period]]
+
+    def path_for(self, key: str) -> str:
+        """Live file for a segment key, registering the segment if it is new."""
+        with self._lock:
+            seg = self._segments.get(key)
+            if seg is None or seg["archived"]:
+                seg = {"file": f"{key}.log", "archived": False}
+                self._segments[key] = seg
+                self._write_manifest()
+            path = os.path.join(self.dir, seg["file"])
+            if path not in self._seen_paths:
+                self._seen_paths.add(path)
+                if self.on_new_path:
+                    self.on_new_path(path)
+            return path
+
+    def append_path(self, timestamp: str) -> str:
+        """Segment file a record with this timestamp goes to.
+
+        Moving on to a new segment (day/month rollover) also starts archiving
+        old ones in the background.
+        """
+        key = self.key_for(timestamp)
+        with self._lock:
+            if key != self._current_key:
+                self._current_key = key
+                self._archive_in_background()
+            return self.path_for(key)
+
+    def _archive_in_background(self) -> None:
+        with self._lock:
+            if self._archiver is not None and self._archiver.is_alive():
+                return
+            self._archiver = threading.Thread(target=self._archive_quietly, name="log-archiver", daemon=True)
+            self._archiver.start()
+
+    def _archive_quietly(self) -> None:
+        try:
+            self.archive()
+        except OSError:
+            # the segments stay live and are tried again at the next rollover
+            pass
+
+    def keys(self, start: Optional[str] = None, end: Optional[str] = None) -> List[str]:
+        """Segment keys overlapping the date range [start, end] ("YYYY-MM-DD")."""
+        n = SegmentedLog.PERIODS[self.period]
+        with self._lock:
+            keys = sorted(self._segments)
+        return [k for k in keys if (start is None or k >= start[:n]) and (end is None or k <= end[:n])]
+
+    def _open(self, key: str, mode: str = "r"):
+        seg = self._segments[key]
+        path = os.path.join(self.dir, seg["file"])
+        if seg["archived"]:
+            return gzip.open(path, mode if "b" in mode else "rt")
+        return open(path, mode)
+
+    def iter_lines(self, start: Optional[str] = None, end: Optional[str] = None) -> Iterator[str]:
+        """Lines whose date is within [start, end], opening only the needed segments."""
+        for key in self.keys(start, end):
+            try:
+                with self._open(key) as f:
+                    for line in f:
+                        day = line[:10]
+                        if (start is None or day >= start) and (end is None or day <= end):
+                            yield line
+            except FileNotFoundError:
+                continue
+
+    def page(
+        self, cursor: Optional[Tuple[str, int]] = None, limit: int = 100, newest_first: bool = True
+    ) -> Tuple[List[str], Optional[Tuple[str, int]]]:
+        """One page of lines across segments, newest or oldest first.
+
+        `cursor` is the (segment key, byte offset) returned with the previous
+        page; the next cursor is None once the log is exhausted.
+        """
+        keys = self.keys()
+        if newest_first:
+            keys.reverse()
+        offset = None
+        if cursor is not None:
+            key, offset = cursor
+            keys = keys[keys.index(key):] if key in keys else []
+        out: List[str] = []
+        for key in keys:
+            try:
+                with self._open(key, "rb") as f:
+                    if newest_first:
+                        end = offset if offset is not None else f.seek(0, os.SEEK_END)
+                        lines, pos = read_backward(f, end, limit - len(out))
+                    else:
+                        lines, pos = read_forward(f, offset or 0, limit - len(out))
+            except FileNotFoundError:
+                lines, pos = [], 0
+            out.extend(lines)
+            if len(out) >= limit:
+                return out, (key, pos)
+            offset = None
+        return out, None
+
+    def read(self, start: Optional[str] = None, end: Optional[str] = None) -> str:
+        return "".join(self.iter_lines(start, end))
+
+    def index(self, key: str) -> LogOffsetIndex:
+        with self._lock:
+            idx = self._indexes.get(key)
+            if idx is None:
+                idx = LogOffsetIndex(os.path.join(self.dir, self._segments[key]["file"]))
+                self._indexes[key] = idx
+            return idx
+
+    def on_append(self, path: str) -> Callable[[int, bytes], None]:
+        """LogWriter listener that keeps the segment's offset index current."""
+        key = os.path.basename(path).split(".")[0]
+        return lambda offset, data: self.index(key).on_append(offset, data)
+
+    def account_lines(
+        self, account_number, newest_first: bool = False, offset: int = 0, limit: Optional[int] = None
+    ) -> List[str]:
+        acc_no = int(account_number)
+        keys = self.keys()
+        if newest_first:
+            keys.reverse()
+        out: List[str] = []
+        skip = int(offset)
+        for key in keys:
+            remaining = None if limit is None else int(limit) - len(out)
+            if remaining is not None and remaining <= 0:
+                break
+            if self._segments[key]["archived"]:
+                with self._open(key) as f:
+                    lines = [l.rstrip("\n") for l in f if LogOffsetIndex._account_of(l.encode("utf-8")) == acc_no]
+                if newest_first:
+                    lines.reverse()
+                if skip >= len(lines):
+                    skip -= len(lines)
+                    continue
+                lines = lines[skip:]
+                skip = 0
+            else:
+                idx = self.index(key)
+                count = idx.count(acc_no)
+                if skip >= count:
+                    skip -= count
+                    continue
+                lines = idx.lines(acc_no, newest_first, skip, remaining)
+                skip = 0
+            out.extend(lines if remaining is None else lines[:remaining])
+        return out
+
+    def archive(self, today: Optional[datetime] = None) -> int:
+        """Gzip segments older than archive_after_days. Returns segments archived.
+
+        Each segment is compressed to a temporary file without the log lock
+        held; only the swap (remove the live file, rename the .gz into place)
+        takes it.
+        """
+        today = today or datetime.now()
+        cutoff = self.key_for((today - timedelta(days=self.archive_after_days)).strftime("%Y-%m-%d"))
+        current = self.key_for(today.strftime("%Y-%m-%d"))
+        with self._lock:
+            due = [
+                key for key in self.keys()
+                if not self._segments[key]["archived"] and key < cutoff and key < current
+            ]
+        archived = sum(1 for key in due if self._archive_segment(key))
+        if archived:
+            with self._lock:
+                self._write_manifest()
+        return archived
+
+    def _archive_segment(self, key: str) -> bool:
+        path = os.path.join(self.dir, f"{key}.log")
+        tmp = f"{path}.gz.{os.getpid()}.tmp"
+        try:
+            size = os.path.getsize(path)
+            with open(path, "rb") as src, gzip.open(tmp, "wb") as dst:
+                shutil.copyfileobj(src, dst)
+        except FileNotFoundError:
+            # archived by another process meanwhile
+            self._remove(tmp)
+            self._archived(key, path)
+            return False
+        except BaseException:
+            self._remove(tmp)
+            raise
+        with self._lock:
+            try:
+                if os.path.getsize(path) != size:
+                    # written to while it was compressed; left for the next run
+                    self._remove(tmp)
+                    return False
+                os.remove(path)
+            except FileNotFoundError:
+                self._remove(tmp)
+                self._archived(key, path)
+                return False
+            os.replace(tmp, path + ".gz")
+            self._archived(key, path)
+        return True
+
+    def _archived(self, key: str, path: str) -> None:
+        # point the segment at its .gz and drop what belonged to the live file
+        with self._lock:
+            if not os.path.exists(path + ".gz"):
+                return
+            idx = self._indexes.pop(key, None)
+            if idx:
+                idx.close()
+            self._remove(path + ".idx")
+            self._segments[key] = {"file": os.path.basename(path) + ".gz", "archived": True}
+            self._seen_paths.discard(path)
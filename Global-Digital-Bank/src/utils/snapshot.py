@@ -0,0 +1,198 @@
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+import zlib
+from array import array
+from typing import Dict, Optional, Sequence, Tuple
+
+# File layout (all offsets relative to the start of the payload):
+#   prefix   8s magic, uint32 version, uint32 header length (little endian)
+#   header   JSON: kind, row count, column specs, meta, source stamp, crc32
+#            of the payload, byte order; padded so the payload is 8-aligned
+#   payload  one block per column, each 8-aligned:
+#              numbers  the raw bytes of an array.array (typecode in the spec)
+#              strings  UTF-8 values joined by NUL; None is stored as "\x01",
+#                       and a value containing NUL or "\x01" as "\x01" followed
+#                       by the value with those two escaped ("\x010", "\x011").
+#                       Columns with many repeats (names, PINs) are stored as
+#                       the distinct values plus an int32 code per row, so
+#                       loading them creates one str per distinct value only.
+MAGIC = b"GDBSNAP\x00"
+VERSION = 2
+PREFIX = struct.Struct("<8sII")
+ALIGN = 8
+SEPARATOR = "\x00"
+NONE = "\x01"
+ESCAPES = {"0": SEPARATOR, "1": NONE}
+ESCAPED = re.compile("\x01(.)", re.DOTALL)
+
+Columns = Dict[str, Tuple[str, Sequence]]
+
+
+def snapshot_path(source_path: str) -> str:
+    """Binary snapshot next to a CSV file: data/accounts.csv -> data/accounts.snap"""
+    return os.path.splitext(source_path)[0] + ".snap"
+
+
+def _stamp(path: Optional[str]):
+    if path is None:
+        return None
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+def _padded(data: bytes) -> list:
+    pad = -len(data) % ALIGN
+    return [data, b"\x00" * pad] if pad else [data]
+
+
+def write(path: str, kind: str, columns: Columns, meta: Optional[dict] = None, source: Optional[str] = None) -> None:
+    """Write columns {name: (typecode, values)} as a snapshot of `source`.
+
+    typecode is an array.array typecode, or "s" for str values (None allowed).
+    Call it after `source` has been written: the snapshot is only trusted
+    while the source file keeps the size and mtime it has now.
+    """
+    blocks, specs, offset, count = [], [], 0, None
+
+    def add(data: bytes) -> Tuple[int, int]:
+        nonlocal offset
+        start = offset
+        for part in _padded(data):
+            blocks.append(part)
+            offset += len(part)
+        return start, len(data)
+
+    for name, (typecode, values) in columns.items():
+        count = len(values) if count is None else count
+        spec = {"name": name, "type": typecode}
+        if typecode == "s":
+            distinct = {}
+            for v in values:
+                distinct.setdefault(v, len(distinct))
+            if len(distinct) <= len(values) // 2:
+                spec["distinct_offset"], spec["distinct_length"] = add(_joined(distinct))
+                data = array("i", map(distinct.__getitem__, values)).tobytes()
+            else:
+                data = _joined(values)
+        elif isinstance(values, array) and values.typecode == typecode:
+            data = values.tobytes()
+        else:
+            data = array(typecode, values).tobytes()
+        spec["offset"], spec["length"] = add(data)
+        specs.append(spec)
+    crc = 0
+    for block in blocks:
+        crc = zlib.crc32(block, crc)
+    header = json.dumps({
+        "kind": kind,
+        "count": count or 0,
+        "columns": specs,
+        "meta": meta or {},
+        "source": _stamp(source),
+        "crc32": crc,
+        "byteorder": sys.byteorder,
+    }).encode("utf-8")
+    header += b" " * (-(PREFIX.size + len(header)) % ALIGN)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(PREFIX.pack(MAGIC, VERSION, len(header)))
+        f.write(header)
+        for block in blocks:
+            f.write(block)
+    os.replace(tmp_path, path)
+
+
+def read(path: str, kind: str, source: Optional[str] = None) -> Optional[Tuple[Dict[str, Sequence], dict]]:
+    """(columns, meta) of a snapshot written by write(), or None when it cannot be used.
+
+    None means: missing, another format version or byte order, not a `kind`
+    snapshot, older than `source`, or a checksum mismatch. Callers then fall
+    back to parsing the source and write a fresh snapshot.
+    """
+    try:
+        f = open(path, "rb")
+    except OSError:
+        return None
+    with f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        with mm:
+            return _decode(mm, kind, source)
+
+
+def _decode(mm, kind: str, source: Optional[str]):
+    if len(mm) < PREFIX.size:
+        return None
+    magic, version, header_len = PREFIX.unpack_from(mm, 0)
+    if magic != MAGIC or version != VERSION:
+        return None
+    start = PREFIX.size + header_len
+    try:
+        header = json.loads(mm[PREFIX.size:start])
+    except ValueError:
+        return None
+    if header.get("kind") != kind or header.get("byteorder") != sys.byteorder:
+        return None
+    if source is not None and header.get("source") != _stamp(source):
+        return None
+    with memoryview(mm) as view:
+        payload = view[start:]
+        try:
+            if zlib.crc32(payload) != header.get("crc32"):
+                return None
+            columns = {}
+            for spec in header["columns"]:
+                block = payload[spec["offset"]:spec["offset"] + spec["length"]]
+                if spec["type"] == "s" and "distinct_offset" in spec:
+                    start, length = spec["distinct_offset"], spec["distinct_length"]
+                    distinct = _strings(bytes(payload[start:start + length]).decode("utf-8"))
+                    codes = array("i")
+                    codes.frombytes(block)
+                    columns[spec["name"]] = list(map(distinct.__getitem__, codes))
+                elif spec["type"] == "s":
+                    columns[spec["name"]] = _strings(bytes(block).decode("utf-8")) if header["count"] else []
+                else:
+                    values = array(spec["type"])
+                    values.frombytes(block)
+                    columns[spec["name"]] = values
+                block.release()
+        finally:
+            payload.release()
+    if any(len(values) != header["count"] for values in columns.values()):
+        return None
+    return columns, header.get("meta") or {}
+
+
+def _escaped(value: Optional[str]) -> str:
+    if value is None:
+        return NONE
+    if SEPARATOR in value or NONE in value:
+        return NONE + value.replace(NONE, NONE + "1").replace(SEPARATOR, NONE + "0")
+    return value
+
+
+def _unescaped(value: str) -> Optional[str]:
+    if value == NONE:
+        return None
+    return ESCAPED.sub(lambda m: ESCAPES[m.group(1)], value[1:])
+
+
+def _joined(values) -> bytes:
+    return SEPARATOR.join(map(_escaped, values)).encode("utf-8")
+
+
+def _strings(text: str) -> list:
+    values = text.split(SEPARATOR)
+    if NONE in text:
+        # only None and escaped values start with "\x01"
+        values = [_unescaped(v) if v.startswith(NONE) else v for v in values]
+    return values
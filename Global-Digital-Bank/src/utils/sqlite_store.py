@@ -0,0 +1,226 @@
+import os
+import sqlite3
+from typing import Dict, Iterable, Tuple
+
+from src.models.account import Account
+from src.models.account_table import AccountTable
+from src.utils.file_manager import ACCOUNT_FILE, load_accounts
+
+DB_FILE = os.path.join(os.path.dirname(ACCOUNT_FILE), "bank.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS accounts (
+    account_number INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    age INTEGER NOT NULL,
+    balance REAL NOT NULL,
+    account_type TEXT NOT NULL,
+    status TEXT NOT NULL,
+    time TEXT,
+    pin TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_accounts_status ON accounts(status);
+CREATE INDEX IF NOT EXISTS idx_accounts_name ON accounts(name);
+CREATE INDEX IF NOT EXISTS idx_accounts_balance ON accounts(balance);
+
+CREATE TABLE IF NOT EXISTS loans (
+    account_number INTEGER PRIMARY KEY,
+    name TEXT,
+    principal REAL,
+    pending REAL,
+    years INTEGER,
+    rate REAL,
+    status TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_loans_status ON loans(status);
+
+CREATE TABLE IF NOT EXISTS loan_applications (
+    account_number INTEGER PRIMARY KEY,
+    name TEXT,
+    principal REAL,
+    years INTEGER,
+    requested_at TEXT
+);
+"""
+
+UPSERT_ACCOUNT = (
+    "INSERT OR REPLACE INTO accounts (account_number, name, age, balance, account_type, status, time, pin) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+)
+UPSERT_LOAN = (
+    "INSERT OR REPLACE INTO loans (account_number, name, principal, pending, years, rate, status) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+UPSERT_APPLICATION = (
+    "INSERT OR REPLACE INTO loan_applications (account_number, name, principal, years, requested_at) "
+    "VALUES (?, ?, ?, ?, ?)"
+)
+
+
+class SQLiteStore:
+    """Embedded SQLite storage for accounts, loans and loan applications.
+
+    Same load/save/checkpoint interface as AccountJournal, so BankingService
+    can use either. A save only touches the rows the caller reports as
+    changed or removed, so its cost does not depend on the size of the bank.
+    """
+
+    def __init__(self, db_path: str = DB_FILE) -> None:
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        # Streamlit reruns scripts on different threads, so allow sharing the connection
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def paths(self) -> Tuple[str, ...]:
+        """Files load() reads (WAL mode commits land in the -wal file first)."""
+        return (self.db_path, self.db_path + "-wal")
+
+    # -------- Accounts --------
+    @staticmethod
+    def _account_row(acc: Account) -> Tuple:
+        d = acc.to_dict()
+        return (
+            d["account_number"],
+            d["name"],
+            d["age"],
+            d["balance"],
+            d["account_type"],
+            d["status"],
+            d["timestamp"],
+            d["pin"],
+        )
+
+    def load(self) -> AccountTable:
+        accounts = AccountTable()
+        cur = self.conn.execute(
+            "SELECT account_number, name, age, balance, account_type, status, time, pin FROM accounts"
+        )
+        for acc_no, name, age, balance, account_type, status, ts, pin in cur:
+            accounts.append_row(*Account.normalize(
+                account_number=acc_no,
+                name=name,
+                age=age,
+                account_type=account_type,
+                balance=balance,
+                status=status,
+                timestamp=ts or None,
+                pin=pin or None,
+            ))
+        return accounts
+
+    def save(self, accounts: Dict[int, Account], changed: Iterable[int], removed: Iterable[int] = ()) -> int:
+        """Upsert changed accounts and delete removed ones. Returns rows written."""
+        rows = [self._account_row(accounts[no]) for no in changed if no in accounts]
+        gone = [(int(no),) for no in removed]
+        if not rows and not gone:
+            return 0
+        with self.conn:
+            self.conn.executemany(UPSERT_ACCOUNT, rows)
+            self.conn.executemany("DELETE FROM accounts WHERE account_number = ?", gone)
+        return len(rows) + len(gone)
+
+    def save_all(self, accounts: Dict[int, Account]) -> int:
+        with self.conn:
+            self.conn.execute("DELETE FROM accounts")
+        return self.save(accounts, list(accounts.keys()))
+
+    def checkpoint(self, accounts: Dict[int, Account]) -> None:
+        self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    # -------- Loans --------
+    def load_loans(self) -> Dict[int, Dict]:
+        loans: Dict[int, Dict] = {}
+        cur = self.conn.execute(
+            "SELECT account_number, name, principal, pending, years, rate, status FROM loans"
+        )
+        for acc_no, name, principal, pending, years, rate, status in cur:
+            loans[acc_no] = {
+                "account_number": acc_no,
+                "name": (name or "").strip(),
+                "principal": float(principal or 0.0),
+                "pending": float(pending or 0.0),
+                "years": int(years or 0),
+                "rate": float(rate or 0.0),
+                "status": status or "None",
+            }
+        return loans
+
+    def save_loans(self, loans: Iterable[Dict]) -> None:
+        rows = [
+            (
+                loan["account_number"],
+                loan.get("name", ""),
+                loan.get("principal", 0.0),
+                loan.get("pending", 0.0),
+                loan.get("years", 0),
+                loan.get("rate", 0.0),
+                loan.get("status", "None"),
+            )
+            for loan in loans
+        ]
+        with self.conn:
+            self.conn.executemany(UPSERT_LOAN, rows)
+
+    def load_applications(self) -> Dict[int, Dict]:
+        apps: Dict[int, Dict] = {}
+        cur = self.conn.execute(
+            "SELECT account_number, name, principal, years, requested_at FROM loan_applications"
+        )
+        for acc_no, name, principal, years, requested_at in cur:
+            apps[acc_no] = {
+                "account_number": acc_no,
+                "name": (name or "").strip(),
+                "principal": float(principal or 0.0),
+                "years": int(years or 0),
+                "requested_at": requested_at or "",
+            }
+        return apps
+
+    def save_applications(self, apps: Iterable[Dict]) -> None:
+        rows = [
+            (
+                app["account_number"],
+                app.get("name", ""),
+                app.get("principal", 0.0),
+                app.get("years", 0),
+                app.get("requested_at", ""),
+            )
+            for app in apps
+        ]
+        with self.conn:
+            self.conn.executemany(UPSERT_APPLICATION, rows)
+
+    def delete_application(self, account_number: int) -> None:
+        with self.conn:
+            self.conn.execute("DELETE FROM loan_applications WHERE account_number = ?", (int(account_number),))
+
+
+def migrate_from_csv(db_path: str = DB_FILE) -> str:
+    """One-shot copy of accounts.csv, loans.csv and loan_applications.csv into SQLite."""
+    # imported here: loan_services is a service module and only the migration needs it
+    from src.services.loan_services import LoanService
+
+    store = SQLiteStore(db_path)
+    accounts = load_accounts()
+    loans = LoanService()
+    with store.conn:
+        store.conn.execute("DELETE FROM loans")
+        store.conn.execute("DELETE FROM loan_applications")
+    store.save_all(accounts)
+    store.save_loans(loans.loans.values())
+    store.save_applications(loans.applications.values())
+    store.close()
+    return (
+        f"Migrated {len(accounts)} accounts, {len(loans.loans)} loans and "
+        f"{len(loans.applications)} loan applications to {db_path}"
+    )
+
+
+if __name__ == "__main__":
+    print(migrate_from_csv())
@@ -0,0 +1,80 @@
+from typing import Dict, List, Optional, Tuple
+
+from src.models.account_table import AccountTable
+
+
+class StatusPartitions:
+    """Accounts partitioned by status, with counts per (status, account type).
+
+    - Each status ("Active", "Inactive", ...) has its own member set, so a
+      listing only touches the accounts in that partition.
+    - count() is a dict lookup, for any combination of status and type.
+    - The partitions listen to their AccountTable, so every status change
+      (terminate, close, reopen, reactivate, force close) and every import
+      or new account moves one row.
+    """
+
+    def __init__(self, table: AccountTable) -> None:
+        self.table = table
+        # rows per status code; dicts keep insertion order and O(1) removal
+        self._members: Dict[int, Dict[int, None]] = {}
+        self._counts: Dict[Tuple[int, int], int] = {}
+        for row in table._index.values():
+            self._add(row, table.status_code[row], table.type_code[row])
+        table.add_listener(self)
+
+    def _add(self, row: int, status: int, account_type: int) -> None:
+        self._members.setdefault(status, {})[row] = None
+        key = (status, account_type)
+        self._counts[key] = self._counts.get(key, 0) + 1
+
+    def _remove(self, row: int, status: int, account_type: int) -> None:
+        self._members.get(status, {}).pop(row, None)
+        key = (status, account_type)
+        self._counts[key] = self._counts.get(key, 0) - 1
+
+    def on_add(self, row: int) -> None:
+        self._add(row, self.table.status_code[row], self.table.type_code[row])
+
+    def on_change(self, row: int, field: str, old) -> None:
+        table = self.table
+        if field == "status":
+            self._remove(row, table.status_code_of(old), table.type_code[row])
+            self._add(row, table.status_code[row], table.type_code[row])
+        elif field == "account_type":
+            self._remove(row, table.status_code[row], table.type_code_of(old))
+            self._add(row, table.status_code[row], table.type_code[row])
+
+    def on_remove(self, row: int) -> None:
+        self._remove(row, self.table.status_code[row], self.table.type_code[row])
+
+    # -------- Queries --------
+    def _status_codes(self, status: Optional[str], exclude: Optional[str]) -> List[int]:
+        values = self.table.status_values
+        if status is not None:
+            return [values.index(status)] if status in values else []
+        return [code for code, value in enumerate(values) if value != exclude]
+
+    def count(self, status: Optional[str] = None, account_type: Optional[str] = None, exclude: Optional[str] = None) -> int:
+        """Accounts with this status (or any status but `exclude`) and type."""
+        if status is None and account_type is None and exclude is None:
+            return len(self.table)
+        types = self.table.type_values
+        if account_type is not None:
+            account_type = account_type.title()
+            if account_type not in types:
+                return 0
+            type_codes = [types.index(account_type)]
+        else:
+            type_codes = range(len(types))
+        return sum(
+            self._counts.get((s, t), 0) for s in self._status_codes(status, exclude) for t in type_codes
+        )
+
+    def rows(self, status: Optional[str] = None, exclude: Optional[str] = None) -> List[int]:
+        """Rows with this status (or any status but `exclude`), in table order."""
+        out: List[int] = []
+        for code in self._status_codes(status, exclude):
+            out.extend(self._members.get(code, ()))
+        out.sort()
+        return out
@@ -0,0 +1,37 @@
+import os
+import shutil
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import src.services.loan_services as loan_services
+import src.utils.file_manager as file_manager
+from src.utils import cold_store, journal, rollups, sqlite_store
+
+# the sample book shipped in data/ (55 accounts)
+SAMPLE_ACCOUNTS = os.path.join(ROOT, "data", "accounts.csv")
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    """A copy of the sample accounts in a temp dir, with every data file pointed at it."""
+    shutil.copy(SAMPLE_ACCOUNTS, tmp_path / "accounts.csv")
+    account_file = str(tmp_path / "accounts.csv")
+    monkeypatch.setattr(file_manager, "ACCOUNT_FILE", account_file)
+    monkeypatch.setattr(file_manager, "USER_TRANSACTIONS_FILE", str(tmp_path / "user_transactions.log"))
+    monkeypatch.setattr(file_manager, "ADMIN_ACTIONS_FILE", str(tmp_path / "admin_actions.log"))
+    monkeypatch.setattr(file_manager, "TRANSACTIONS_FILE", str(tmp_path / "transactions.log"))
+    monkeypatch.setattr(file_manager.load_accounts, "__defaults__", (account_file,))
+    monkeypatch.setattr(file_manager.save_accounts, "__defaults__", (account_file, False))
+    monkeypatch.setattr(journal.AccountJournal.__init__, "__defaults__",
+                        (account_file, str(tmp_path / "accounts.journal"), 1000, False))
+    monkeypatch.setattr(sqlite_store.SQLiteStore.__init__, "__defaults__", (str(tmp_path / "bank.db"),))
+    monkeypatch.setattr(cold_store.ColdStore.__init__, "__defaults__", (str(tmp_path / "cold_accounts.db"),))
+    monkeypatch.setattr(rollups.DailyRollups.__init__, "__defaults__", (str(tmp_path / "rollups.db"),))
+    monkeypatch.setattr(loan_services, "LOANS_FILE", str(tmp_path / "loans.csv"))
+    monkeypatch.setattr(loan_services, "APPLICATIONS_FILE", str(tmp_path / "loan_applications.csv"))
+    yield tmp_path
+    file_manager.flush_logs()
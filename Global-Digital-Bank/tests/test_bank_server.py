@@ -0,0 +1,98 @@
+import asyncio
+import os
+import shutil
+import stat
+import tempfile
+import threading
+
+import pytest
+
+from src.services import bank_server, rpc
+from src.services.bank_client import AdminClient, BankClient, Connection
+from src.services.banking_service import BankingService
+from src.services.loan_services import LoanService
+
+
+@pytest.fixture
+def address(data_dir, monkeypatch):
+    monkeypatch.setattr(bank_server, "BASE_DATA_DIR", str(data_dir))
+    server = bank_server.BankServer(BankingService(), LoanService(), workers=2)
+    # a short directory: Unix socket paths are limited to about 100 bytes
+    sock_dir = tempfile.mkdtemp(prefix="gdb-")
+    where = os.path.join(sock_dir, "bank.sock")
+    loop = asyncio.new_event_loop()
+    ready = threading.Event()
+
+    def run():
+        asyncio.set_event_loop(loop)
+        loop.run_until_complete(server.start(where))
+        ready.set()
+        loop.run_forever()
+
+    async def stop():
+        server._server.close()
+        await server._server.wait_closed()
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    assert ready.wait(5)
+    yield where
+    asyncio.run_coroutine_threadsafe(stop(), loop).result(5)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(5)
+    loop.close()
+    server.close()
+    shutil.rmtree(sock_dir, ignore_errors=True)
+
+
+@pytest.fixture
+def connect(address):
+    connections = []
+
+    def open_connection():
+        connections.append(Connection(address))
+        return connections[-1]
+
+    yield open_connection
+    for connection in connections:
+        connection.close()
+
+
+def test_admin_methods_need_the_admin_key(connect):
+    connection = connect()
+    with pytest.raises(PermissionError):
+        connection.call("admin.delete_all_accounts")
+    for _ in range(rpc.MAX_AUTH_FAILURES):
+        with pytest.raises(PermissionError):
+            AdminClient(connection, "wrong")
+    # the connection stops answering auth, even with the right key
+    with pytest.raises(PermissionError):
+        AdminClient(connection, rpc.ADMIN_KEY)
+    admin = AdminClient(connect(), rpc.ADMIN_KEY)
+    assert admin.count_active_accounts() > 0
+
+
+def test_files_stay_inside_the_data_directory(connect, data_dir):
+    admin = AdminClient(connect(), rpc.ADMIN_KEY)
+    with pytest.raises(PermissionError):
+        admin.export_accounts_to_file("../outside.csv")
+    with pytest.raises(PermissionError):
+        admin.import_accounts_from_file("/etc/passwd")
+    admin.export_accounts_to_file("export.csv")
+    assert (data_dir / "export.csv").exists()
+
+
+def test_wrong_pins_lock_the_account(connect):
+    bank = BankClient(connect())
+    for _ in range(rpc.MAX_PIN_FAILURES):
+        assert bank.verify_pin(1002, "0000") is False
+    with pytest.raises(PermissionError):
+        bank.verify_pin(1002, "1002")
+    # other accounts are not affected
+    assert bank.verify_pin(1055, "1055") is True
+
+
+def test_socket_is_private_and_pins_are_not_sent(address, connect):
+    assert stat.S_IMODE(os.stat(address).st_mode) == 0o600
+    acc = BankClient(connect()).get_account(1002)
+    assert acc.balance > 0 and not hasattr(acc, "pin")
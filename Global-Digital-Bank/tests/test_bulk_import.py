@@ -0,0 +1,63 @@
+import csv
+
+from src.services.admin_services import AdminService
+from src.services.banking_service import BankingService
+from src.utils.bulk_import import parse_accounts_file
+
+
+def _write(path, rows):
+    with open(path, "w", newline="") as f:
+        csv.writer(f).writerows(rows)
+
+
+def test_merge_import_keeps_columns_missing_from_the_file(data_dir):
+    bank = BankingService()
+    admin = AdminService(bank)
+    closed = next(acc.account_number for acc in bank.accounts.values() if acc.status != "Active")
+    pins = {no: acc.pin for no, acc in bank.accounts.items()}
+    assert bank.verify_pin(1002, "1002")
+
+    export = str(data_dir / "export.csv")
+    admin.export_accounts_to_file(export)  # no PIN column by default
+    admin.import_accounts_from_file(export, mode="merge")
+
+    assert bank.verify_pin(1002, "1002")
+    assert {no: acc.pin for no, acc in bank.accounts.items()} == pins
+    assert bank.get_account(closed).status != "Active"
+    reloaded = BankingService()
+    assert reloaded.verify_pin(1002, "1002")
+    assert reloaded.get_account(closed).status != "Active"
+
+
+def test_merge_import_updates_only_the_file_columns(data_dir):
+    bank = BankingService()
+    admin = AdminService(bank)
+    before = bank.get_account(1002)
+    pin, status, timestamp = before.pin, before.status, before.timestamp
+    path = str(data_dir / "partial.csv")
+    _write(path, [
+        ["account_number", "name", "age", "account_type", "balance"],
+        [1002, "Renamed", 40, "Savings", 1234.5],
+        [9001, "New Person", 30, "Savings", 600.0],
+    ])
+    admin.import_accounts_from_file(path, mode="merge")
+    acc = bank.get_account(1002)
+    assert (acc.name, acc.balance) == ("Renamed", 1234.5)
+    assert (acc.pin, acc.status, acc.timestamp) == (pin, status, timestamp)
+    # new rows get the defaults
+    new = bank.get_account(9001)
+    assert (new.status, new.pin, new.timestamp) == ("Active", None, None)
+
+
+def test_quoted_line_breaks_survive_chunking(tmp_path):
+    path = str(tmp_path / "accounts.csv")
+    rows = [["account_number", "name", "age", "account_type", "balance"]]
+    rows += [[1000 + i, f"Line\nBreak {i}" if i % 50 == 3 else f"Name {i}", 30, "Savings", 600.0] for i in range(500)]
+    rows.append(["bad", "x", 30, "Savings", 1])
+    _write(path, rows)
+    table, errors, fields = parse_accounts_file(path, workers=1, chunk_bytes=256)
+    assert len(table) == 500
+    assert table[1003].name == "Line\nBreak 3"
+    # physical line of the bad row: header + 500 rows + 10 embedded line breaks
+    assert [line for line, _ in errors] == [512]
+    assert "pin" not in fields and "status" not in fields
@@ -0,0 +1,28 @@
+import csv
+
+from src.services.admin_services import AdminService
+from src.services.banking_service import BankingService
+from src.utils.exporter import iter_chunks
+
+
+def test_export_survives_accounts_created_between_chunks(data_dir):
+    bank = BankingService()
+    total = len(bank.accounts)
+    chunks = iter_chunks(bank.accounts, columns=("account_number", "balance"), chunk_rows=10)
+    seen = list(next(chunks)["account_number"])
+    created = [bank.create_account(f"New {i}", 30, "Savings", 1000)[0].account_number for i in range(3)]
+    for chunk in chunks:
+        seen.extend(chunk["account_number"])
+    assert len(seen) == len(set(seen)) == total + 3
+    assert set(created) <= set(seen)
+
+
+def test_export_filters_and_columns(data_dir):
+    bank = BankingService()
+    path = str(data_dir / "active.csv")
+    AdminService(bank).export_accounts_to_file(path, status="Active", account_type="savings")
+    with open(path, newline="") as f:
+        rows = list(csv.DictReader(f))
+    expected = [acc for acc in bank.accounts.values() if acc.status == "Active" and acc.account_type == "Savings"]
+    assert sorted(int(r["account_number"]) for r in rows) == sorted(acc.account_number for acc in expected)
+    assert "pin" not in rows[0]
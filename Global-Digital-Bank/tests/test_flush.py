@@ -0,0 +1,59 @@
+import threading
+import time
+
+from src.services.banking_service import BankingService
+from src.utils import file_manager
+from src.utils.flush_policy import FlushPolicy
+
+
+def _saved_balance(account_number):
+    return file_manager.load_accounts()[account_number].balance
+
+
+def test_save_waits_for_whole_bank_operations(data_dir):
+    bank = BankingService(flush_policy=FlushPolicy(FlushPolicy.SHUTDOWN))
+    before = _saved_balance(1002)
+    bank.deposit(1002, 100)
+    saver = threading.Thread(target=bank.save_to_disk)
+    with bank.locks.exclusive():
+        # stands in for apply_batch: a save from another thread must not land inside it
+        saver.start()
+        saver.join(0.2)
+        assert saver.is_alive()
+        assert _saved_balance(1002) == before
+    saver.join(5)
+    assert not saver.is_alive()
+    assert _saved_balance(1002) == before + 100
+
+
+def test_group_timer_flush_and_close(data_dir):
+    bank = BankingService(flush_policy=FlushPolicy(FlushPolicy.GROUP, every_n=1000, every_ms=50))
+    before = _saved_balance(1002)
+    bank.deposit(1002, 100)
+    deadline = time.monotonic() + 5
+    while _saved_balance(1002) != before + 100 and time.monotonic() < deadline:
+        time.sleep(0.02)
+    assert _saved_balance(1002) == before + 100
+    bank.withdraw(1002, 50)
+    bank.close()
+    assert _saved_balance(1002) == before + 50
+
+
+def test_concurrent_transfers_persist_consistently(data_dir):
+    bank = BankingService(flush_policy=FlushPolicy(FlushPolicy.GROUP, every_n=5, every_ms=10))
+    numbers = [1002, 1054, 1055]
+    total = sum(bank.get_account(no).balance for no in numbers)
+
+    def shuffle(seed):
+        for i in range(60):
+            src, dst = numbers[(seed + i) % 3], numbers[(seed + i + 1) % 3]
+            bank.transfer_funds(src, dst, 10)
+
+    threads = [threading.Thread(target=shuffle, args=(seed,)) for seed in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    bank.close()
+    saved = file_manager.load_accounts()
+    assert sum(saved[no].balance for no in numbers) == total
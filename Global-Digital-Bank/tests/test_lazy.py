@@ -0,0 +1,52 @@
+from src.services.admin_services import AdminService
+from src.services.banking_service import BankingService
+from src.utils import aggregates
+
+
+def _scanned(bank, status=None, account_type=None):
+    # what the totals stand in for: a full pass over the accounts
+    return aggregates.summary(bank.accounts, status, account_type)
+
+
+def _check(bank):
+    for status in (None, "Active", "Inactive"):
+        for account_type in (None, "Savings", "Current"):
+            expected = _scanned(bank, status, account_type)
+            assert bank.count_accounts(status, account_type) == expected["count"]
+            assert bank.average_balance(status, account_type) == expected["average_balance"]
+            quick = bank.account_summary(status, account_type, extremes=False)
+            assert quick["average_age"] == expected["average_age"]
+            assert quick["total_balance"] == expected["total_balance"]
+
+
+def test_running_totals_follow_every_write(data_dir):
+    bank = BankingService(storage="journal", lazy=True, cache_size=5)
+    admin = AdminService(bank)
+    _check(bank)
+    bank.deposit(1002, 500)
+    bank.withdraw(1054, 200)
+    bank.transfer_funds(1055, 1002, 300)
+    bank.close_account(1053)
+    acc, _ = bank.create_account("Totals Newcomer", 40, "Current", 2500)
+    admin.reactivate_account(1053)
+    bank.terminate_account(1054)
+    bank.apply_batch([("deposit", 1002, 10), ("withdraw", acc.account_number, 20)])
+    _check(bank)
+    # evicting accounts from the cache is not a change
+    bank.accounts.trim()
+    bank.checkpoint()
+    _check(bank)
+    assert bank.count_accounts("Inactive") >= 1
+
+
+def test_totals_scan_only_once(data_dir, monkeypatch):
+    bank = BankingService(storage="journal", lazy=True)
+    bank.count_accounts("Active")
+    scans = []
+    original = bank.accounts.scan
+    monkeypatch.setattr(bank.accounts, "scan", lambda: scans.append(1) or original())
+    bank.deposit(1002, 100)
+    bank.count_accounts("Active")
+    bank.average_balance()
+    bank.account_summary(by_type=True, extremes=False)
+    assert scans == []
@@ -0,0 +1,48 @@
+import os
+
+from src.utils.log_index import ENTRY, LogOffsetIndex
+
+
+def _append(path, *records):
+    # returns the offset of the first record, as a LogWriter listener gets it
+    offset = os.path.getsize(path) if os.path.exists(path) else 0
+    data = "".join(f"2025-09-10 10:00:00 | {acc} | DEPOSIT | {amount} | 100.0\n" for acc, amount in records).encode()
+    with open(path, "ab") as f:
+        f.write(data)
+    return offset, data
+
+
+def _entries(index_path):
+    with open(index_path, "rb") as f:
+        return list(ENTRY.iter_unpack(f.read()))
+
+
+def test_processes_sharing_a_segment_index_each_line_once(tmp_path):
+    log = str(tmp_path / "user_transactions.log")
+    _append(log, (1001, 1), (1002, 2))
+    # two processes (two indexes over the same files), each following its own writes
+    first = LogOffsetIndex(log)
+    second = LogOffsetIndex(log)
+    first.on_append(*_append(log, (1001, 3)))
+    second.on_append(*_append(log, (1002, 4), (1001, 5)))
+    first.on_append(*_append(log, (1001, 6)))
+    for index in (first, second):
+        assert [line.split(" | ")[3] for line in index.lines(1001)] == ["1", "3", "5", "6"]
+        assert index.count(1002) == 2
+    entries = _entries(first.index_path)
+    assert len(entries) == len(set(entries)) == 6
+
+
+def test_duplicate_entries_on_disk_are_merged(tmp_path):
+    log = str(tmp_path / "user_transactions.log")
+    _append(log, (1001, 1), (1001, 2))
+    LogOffsetIndex(log).close()
+    # the same lines indexed again, out of order, as by two processes racing
+    entries = _entries(log + ".idx")
+    with open(log + ".idx", "ab") as f:
+        for entry in reversed(entries):
+            f.write(ENTRY.pack(*entry))
+    index = LogOffsetIndex(log)
+    assert [line.split(" | ")[3] for line in index.lines(1001, newest_first=True)] == ["2", "1"]
+    _append(log, (1001, 3))
+    assert index.count(1001) == 3
@@ -0,0 +1,65 @@
+import threading
+
+import pytest
+
+from src.utils.log_writer import LogWriter, LogWriteError
+
+
+@pytest.fixture
+def writer():
+    w = LogWriter(fsync="never")
+    yield w
+    w.close()
+
+
+def test_failed_write_is_reported_and_the_writer_keeps_going(writer, tmp_path):
+    good = tmp_path / "good.log"
+    # a directory cannot be opened for appending
+    bad = tmp_path / "dir.log"
+    bad.mkdir()
+    writer.write(str(bad), "lost\n")
+    writer.write(str(good), "first\n")
+    with pytest.raises(LogWriteError):
+        writer.flush(5)
+    # reported once; the thread is still alive and writing
+    writer.write(str(good), "second\n")
+    assert writer.flush(5) is True
+    assert good.read_text() == "first\nsecond\n"
+
+
+def test_errors_go_to_the_thread_that_wrote_the_record(writer, tmp_path):
+    bad = tmp_path / "dir.log"
+    bad.mkdir()
+    other = threading.Thread(target=writer.write, args=(str(bad), "lost\n"))
+    other.start()
+    other.join()
+    writer.write(str(tmp_path / "mine.log"), "ok\n")
+    assert writer.flush(5) is True
+
+
+def test_broken_listener_does_not_stop_the_others(writer, tmp_path):
+    path = str(tmp_path / "watched.log")
+    seen = []
+
+    def broken(offset, data):
+        raise ValueError("index is broken")
+
+    writer.add_listener(path, broken)
+    writer.add_listener(path, lambda offset, data: seen.append((offset, data)))
+    writer.write(path, "a\n")
+    writer.write(path, "bb\n")
+    with pytest.raises(LogWriteError):
+        writer.flush(5)
+    assert seen == [(0, b"a\n"), (2, b"bb\n")]
+
+
+def test_flush_times_out_instead_of_hanging(tmp_path):
+    w = LogWriter(fsync="never")
+    gate = threading.Event()
+    path = str(tmp_path / "slow.log")
+    w.add_listener(path, lambda offset, data: gate.wait(5))
+    w.write(path, "x\n")
+    assert w.flush(0.05) is False
+    gate.set()
+    assert w.flush(5) is True
+    w.close()
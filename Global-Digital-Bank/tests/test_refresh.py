@@ -0,0 +1,41 @@
+from src.services.banking_service import BankingService
+from src.utils.flush_policy import FlushPolicy
+
+
+def test_reload_merges_concurrent_changes_to_one_account(data_dir):
+    # two processes sharing the files; ours defers its saves
+    ours = BankingService(flush_policy=FlushPolicy(FlushPolicy.SHUTDOWN))
+    theirs = BankingService()
+    start = ours.get_account(1002).balance
+    ours.deposit(1002, 100)
+    ours.account_rename(1002, "Ours Renamed")
+    theirs.deposit(1002, 40)
+    theirs.set_pin(1002, "9999")
+    ours.save_to_disk()
+    assert ours.refresh_stats["reloads"] == 1
+    acc = BankingService().get_account(1002)
+    # both balance deltas apply; each side's other field is kept
+    assert acc.balance == start + 140
+    assert acc.name == "Ours Renamed"
+    assert BankingService().verify_pin(1002, "9999")
+
+
+def test_field_changed_on_both_sides_keeps_the_saved_value(data_dir):
+    ours = BankingService(flush_policy=FlushPolicy(FlushPolicy.SHUTDOWN))
+    theirs = BankingService()
+    ours.account_rename(1054, "Ours")
+    theirs.account_rename(1054, "Theirs")
+    ours.save_to_disk()
+    assert ours.refresh_stats["conflicting_fields"] == 1
+    assert BankingService().get_account(1054).name == "Theirs"
+
+
+def test_unrelated_accounts_are_untouched(data_dir):
+    ours = BankingService(flush_policy=FlushPolicy(FlushPolicy.SHUTDOWN))
+    theirs = BankingService()
+    a, b = ours.get_account(1002).balance, ours.get_account(1054).balance
+    ours.deposit(1002, 5)
+    theirs.deposit(1054, 7)
+    ours.save_to_disk()
+    fresh = BankingService()
+    assert (fresh.get_account(1002).balance, fresh.get_account(1054).balance) == (a + 5, b + 7)
@@ -0,0 +1,60 @@
+import gzip
+import os
+from datetime import datetime
+
+from src.utils.segmented_log import SegmentedLog
+
+
+def _log(tmp_path):
+    # nothing is old enough for the archiving a rollover starts; the tests archive explicitly
+    return SegmentedLog(str(tmp_path / "user_transactions.log"), period="month", archive_after_days=36500)
+
+
+def _write(log, timestamp, account, amount):
+    with open(log.append_path(timestamp), "a") as f:
+        f.write(f"{timestamp} | {account} | DEPOSIT | {amount} | 100.0\n")
+
+
+def _fill(log):
+    _write(log, "2025-01-05 10:00:00", 1001, 1)
+    _write(log, "2025-01-06 10:00:00", 1002, 2)
+    _write(log, "2025-03-01 10:00:00", 1001, 3)
+    if log._archiver is not None:
+        log._archiver.join()
+
+
+def test_archive_keeps_every_line_readable(tmp_path):
+    log = _log(tmp_path)
+    _fill(log)
+    log.archive_after_days = 30
+    assert log.archive(today=datetime(2025, 3, 15)) == 1
+    assert sorted(os.listdir(log.dir)) == ["2025-01.log.gz", "2025-03.log", "manifest.json"]
+    assert [l.split(" | ")[3] for l in log.account_lines(1001)] == ["1", "3"]
+    again = _log(tmp_path)
+    assert len(list(again.iter_lines())) == 3
+
+
+def test_partial_gz_next_to_the_live_segment_is_dropped(tmp_path):
+    log = _log(tmp_path)
+    _fill(log)
+    # an archive run that died after writing the .gz, before removing the live file
+    with gzip.open(os.path.join(log.dir, "2025-01.log.gz"), "wb") as f:
+        f.write(b"2025-01-05 10:00:00 | 10")
+    again = _log(tmp_path)
+    assert not os.path.exists(os.path.join(log.dir, "2025-01.log.gz"))
+    assert [l.split(" | ")[1] for l in again.iter_lines("2025-01-01", "2025-01-31")] == ["1001", "1002"]
+
+
+def test_leftover_temporary_files(tmp_path):
+    log = _log(tmp_path)
+    _fill(log)
+    live = os.path.join(log.dir, "2025-01.log")
+    # compressed, but the live file was never removed: the temporary file is ignored
+    with open(live, "rb") as src, gzip.open(live + ".gz.999.tmp", "wb") as dst:
+        dst.write(src.read())
+    assert len(list(_log(tmp_path).iter_lines())) == 3
+    # live file removed, rename not done: the temporary file becomes the archive
+    os.remove(live)
+    again = _log(tmp_path)
+    assert os.path.exists(live + ".gz") and not os.path.exists(live + ".gz.999.tmp")
+    assert [l.split(" | ")[3] for l in again.account_lines(1001)] == ["1", "3"]
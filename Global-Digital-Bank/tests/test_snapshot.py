@@ -0,0 +1,61 @@
+import os
+
+from src.services.banking_service import BankingService
+from src.utils import file_manager, snapshot
+from src.utils.lazy_index import LazyIndex
+
+
+def test_strings_round_trip(tmp_path):
+    path = str(tmp_path / "x.snap")
+    values = ["a\x00b", "\x01", None, "", "\x01x", "x\x01\x00\x01", "plain", "é\x000"]
+    snapshot.write(path, "test", {"s": ("s", values), "n": ("i", list(range(len(values))))})
+    columns, _ = snapshot.read(path, "test")
+    assert columns["s"] == values and list(columns["n"]) == list(range(len(values)))
+    # repeated values take the distinct-values encoding
+    snapshot.write(path, "test", {"s": ("s", values * 10)})
+    assert snapshot.read(path, "test")[0]["s"] == values * 10
+
+
+def test_stale_or_corrupt_snapshot_is_ignored(data_dir):
+    accounts = file_manager.load_accounts()
+    snap = snapshot.snapshot_path(file_manager.ACCOUNT_FILE)
+    assert snapshot.read(snap, "accounts", source=file_manager.ACCOUNT_FILE) is not None
+    data = bytearray(open(snap, "rb").read())
+    data[-3] ^= 0xFF
+    open(snap, "wb").write(data)
+    assert snapshot.read(snap, "accounts", source=file_manager.ACCOUNT_FILE) is None
+    assert sorted(file_manager.load_accounts()) == sorted(accounts)
+    with open(file_manager.ACCOUNT_FILE, "a") as f:
+        f.write("9999,Hand Edit,30,5000.0,Savings,Active,,\n")
+    assert 9999 in file_manager.load_accounts()
+
+
+def test_saves_leave_the_snapshot_to_checkpoints(data_dir):
+    bank = BankingService()
+    snap = snapshot.snapshot_path(file_manager.ACCOUNT_FILE)
+    written = os.path.getmtime(snap)
+    bank.deposit(1002, 10)
+    assert os.path.getmtime(snap) == written
+    assert snapshot.read(snap, "accounts", source=file_manager.ACCOUNT_FILE) is None
+    bank.account_rename(1002, "Nul\x00Name")
+    bank.checkpoint()
+    assert snapshot.read(snap, "accounts", source=file_manager.ACCOUNT_FILE) is not None
+    again = BankingService()
+    assert again.get_account(1002).name == "Nul\x00Name"
+    assert again.get_account(1002).balance == bank.get_account(1002).balance
+
+
+def test_indexes_are_built_on_first_use_and_follow_earlier_writes(data_dir):
+    bank = BankingService()
+    indexes = [bank.name_index, bank.status_index, *bank.order_indexes.values()]
+    assert all(isinstance(index, LazyIndex) and not index.built for index in indexes)
+    active = bank.count_accounts("Active")
+    bank.credit_loan_disbursal(1002, 10**7)
+    acc, _ = bank.create_account("Zed Newcomer", 30, "Savings", 1000)
+    assert not bank.order_indexes["balance"].built
+    assert bank.top_n_accounts_by_balance(1)[0].account_number == 1002
+    assert bank.count_accounts("Active") == active + 1
+    assert [a.account_number for a in bank.find_accounts_by_name("zed newcomer")] == [acc.account_number]
+    # built now: later writes reach them through the table listeners
+    bank.account_rename(acc.account_number, "Zed Renamed")
+    assert [a.account_number for a in bank.find_accounts_by_name("zed renamed")] == [acc.account_number]
@@ -0,0 +1,49 @@
+import pytest
+
+from src.services.admin_services import AdminService
+from src.services.banking_service import BankingService
+from src.utils.sqlite_store import migrate_from_csv
+
+MODES = [("csv", False), ("journal", False), ("journal", True), ("sqlite", False)]
+
+
+def _bank(data_dir, storage, lazy):
+    if storage == "sqlite" and not (data_dir / "bank.db").exists():
+        migrate_from_csv(str(data_dir / "bank.db"))
+    return BankingService(storage=storage, lazy=lazy)
+
+
+@pytest.mark.parametrize("storage,lazy", MODES)
+def test_changes_survive_a_restart(data_dir, storage, lazy):
+    bank = _bank(data_dir, storage, lazy)
+    before = bank.get_account(1002).balance
+    bank.deposit(1002, 250)
+    bank.set_pin(1054, "4321")
+    bank.close_account(1053)
+    acc, _ = bank.create_account("Stored Newcomer", 33, "Savings", 1500)
+    count = bank.count_accounts()
+
+    again = _bank(data_dir, storage, lazy)
+    assert again.get_account(1002).balance == before + 250
+    assert again.verify_pin(1054, "4321")
+    assert again.get_account(1053).status != "Active"
+    assert again.get_account(acc.account_number).name == "Stored Newcomer"
+    assert again.count_accounts() == count
+
+
+@pytest.mark.parametrize("storage,lazy", [m for m in MODES if m[0] != "csv"])
+def test_only_changed_rows_are_written(data_dir, storage, lazy):
+    bank = _bank(data_dir, storage, lazy)
+    bank.deposit(1002, 10)
+    assert bank.flush_stats["last_flush_rows"] == 1
+    bank.transfer_funds(1054, 1055, 10)
+    assert bank.flush_stats["last_flush_rows"] == 2
+    # nothing changed, nothing written
+    assert bank.save_to_disk() == 0
+
+
+@pytest.mark.parametrize("storage,lazy", MODES)
+def test_deletes_survive_a_restart(data_dir, storage, lazy):
+    bank = _bank(data_dir, storage, lazy)
+    AdminService(bank).delete_all_accounts()
+    assert _bank(data_dir, storage, lazy).count_accounts() == 0
@@ -0,0 +1,152 @@
+import csv
+
+import pytest
+
+from src.services.admin_services import AdminService
+from src.services.banking_service import BankingService
+
+MODES = [("csv", False), ("journal", False), ("journal", True)]
+
+
+def _bank(storage, lazy):
+    return BankingService(storage=storage, lazy=lazy, tiering=True)
+
+
+def _all_pages(bank, **kwargs):
+    seen, cursor = [], None
+    while True:
+        page, cursor = bank.accounts_page(cursor, page_size=7, **kwargs)
+        seen.extend(acc.account_number for acc in page)
+        if cursor is None:
+            return seen
+
+
+@pytest.mark.parametrize("storage,lazy", MODES)
+def test_closed_account_moves_to_cold_and_back(data_dir, storage, lazy):
+    bank = _bank(storage, lazy)
+    admin = AdminService(bank)
+    total = bank.count_accounts()
+    bank.close_account(1002)
+    bank.save_to_disk()
+    assert 1002 in bank.cold and 1002 not in bank.accounts
+    assert bank.count_accounts() == total
+
+    # a lookup rehydrates it, counted once
+    admin.search_account(1002)
+    assert 1002 in bank.accounts and 1002 not in bank.cold
+    assert bank.count_accounts() == total
+    # still closed: back to the cold tier at the next checkpoint
+    bank.checkpoint()
+    assert 1002 in bank.cold and 1002 not in bank.accounts
+
+    admin.reactivate_account(1002)
+    bank.checkpoint()
+    assert 1002 in bank.accounts and 1002 not in bank.cold
+    assert _bank(storage, lazy).count_accounts() == total
+
+
+@pytest.mark.parametrize("storage,lazy", MODES)
+def test_listings_cover_both_tiers_once(data_dir, storage, lazy):
+    bank = _bank(storage, lazy)
+    total = bank.count_accounts()
+    for no in (1003, 1010, 1020):
+        bank.close_account(no)
+    bank.save_to_disk()
+    assert len(bank.cold) >= 3
+    numbers = _all_pages(bank)
+    assert numbers == sorted(set(numbers)) and len(numbers) == total
+    balances = [acc.balance for acc in bank.accounts_with_status()]
+    assert len(balances) == total
+
+
+@pytest.mark.parametrize("storage,lazy", MODES)
+def test_merge_import_rehydrates_cold_accounts(data_dir, storage, lazy):
+    bank = _bank(storage, lazy)
+    admin = AdminService(bank)
+    total = bank.count_accounts()
+    bank.close_account(1002)
+    bank.save_to_disk()
+    pin = bank.cold.get(1002).pin
+    path = str(data_dir / "merge.csv")
+    with open(path, "w", newline="") as f:
+        csv.writer(f).writerows([
+            ["account_number", "name", "age", "account_type", "balance"],
+            [1002, "Merged Name", 40, "Savings", 999.0],
+        ])
+    admin.import_accounts_from_file(path, mode="merge")
+
+    assert 1002 not in bank.cold
+    assert bank.count_accounts() == total
+    assert bank.account_summary()["count"] == total
+    assert len(_all_pages(bank)) == total
+    merged = bank.get_account(1002)
+    assert (merged.name, merged.pin) == ("Merged Name", pin)
+    assert merged.status != "Active"
+    again = _bank(storage, lazy)
+    assert again.count_accounts() == total
+    assert again.get_account(1002).name == "Merged Name"
+
+
+@pytest.mark.parametrize("storage,lazy", MODES)
+def test_replace_import_clears_the_cold_tier(data_dir, storage, lazy):
+    bank = _bank(storage, lazy)
+    admin = AdminService(bank)
+    bank.close_account(1002)
+    bank.save_to_disk()
+    assert len(bank.cold) > 0
+    path = str(data_dir / "replace.csv")
+    with open(path, "w", newline="") as f:
+        csv.writer(f).writerows([
+            ["account_number", "name", "age", "account_type", "balance"],
+            [5001, "Only One", 40, "Savings", 999.0],
+        ])
+    admin.import_accounts_from_file(path, mode="replace")
+    assert len(bank.cold) == 0
+    assert bank.count_accounts() == 1
+    assert _bank(storage, lazy).count_accounts() == 1
+
+
+@pytest.mark.parametrize("storage,lazy", MODES)
+def test_export_includes_cold_accounts(data_dir, storage, lazy):
+    bank = _bank(storage, lazy)
+    admin = AdminService(bank)
+    total = bank.count_accounts()
+    for no in (1002, 1003):
+        bank.close_account(no)
+    bank.save_to_disk()
+    path = str(data_dir / "export.csv")
+
+    admin.export_accounts_to_file(path)
+    with open(path, newline="") as f:
+        numbers = [int(row["account_number"]) for row in csv.DictReader(f)]
+    assert sorted(numbers) == sorted(set(numbers)) and len(numbers) == total
+    assert {1002, 1003} <= set(numbers)
+
+    admin.export_accounts_to_file(path, status="Active")
+    with open(path, newline="") as f:
+        active = [int(row["account_number"]) for row in csv.DictReader(f)]
+    assert len(active) == bank.count_accounts(status="Active") and 1002 not in active
+
+    admin.export_accounts_to_file(path, include_cold=False)
+    with open(path, newline="") as f:
+        hot = [int(row["account_number"]) for row in csv.DictReader(f)]
+    assert len(hot) == len(bank.accounts) and 1002 not in hot
+
+
+@pytest.mark.parametrize("storage,lazy", MODES)
+def test_interrupted_archive_is_counted_once(data_dir, storage, lazy):
+    bank = _bank(storage, lazy)
+    total = bank.count_accounts()
+    bank.close_account(1002)
+    # the cold write committed, the process died before the hot save dropped the row
+    bank.cold.put([bank.get_account(1002)])
+    assert 1002 in bank.cold and 1002 in bank.accounts
+
+    again = _bank(storage, lazy)
+    assert 1002 not in again.cold and 1002 in again.accounts
+    assert again.count_accounts() == total
+    assert sorted(_all_pages(again)) == sorted(set(_all_pages(again)))
+    # the archive is finished at the next flush
+    again.save_to_disk()
+    assert 1002 in again.cold and 1002 not in again.accounts
+    assert again.count_accounts() == total